@@ -2,12 +2,32 @@
 """
 Dependency checker and installer for Lumina
 Checks for required packages and offers to install them
+
+Availability is checked with importlib.util.find_spec, so optional packages
+are never imported just to see whether they exist. Converters use
+is_available() at startup and lazy_import() when a file actually needs the
+package.
 """
 
+import importlib
+import importlib.util
 import sys
-import subprocess
 from pathlib import Path
 
+
+def is_available(import_name):
+    """Check if a Python package is installed without importing it"""
+    try:
+        return importlib.util.find_spec(import_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def lazy_import(import_name):
+    """Import an optional package on first use (cached in sys.modules afterwards)"""
+    return importlib.import_module(import_name)
+
+
 class DependencyChecker:
     """Check and manage Lumina dependencies"""
 
@@ -42,11 +62,7 @@ class DependencyChecker:
 
     def _check_dependency(self, import_name):
         """Check if a Python package is installed"""
-        try:
-            __import__(import_name)
-            return True
-        except ImportError:
-            return False
+        return is_available(import_name)
 
     def get_status(self):
         """Get human-readable status report"""
@@ -108,6 +124,8 @@ class DependencyChecker:
 
     def _install_packages(self):
         """Install missing packages"""
+        import subprocess
+
         print()
         print("Installing packages...")
         print()
@@ -127,7 +145,8 @@ class DependencyChecker:
                 print(f"✓ Installed {info['package']}")
                 print()
 
-        # Re-check dependencies
+        # Re-check dependencies (pip added new directories to sys.path entries)
+        importlib.invalidate_caches()
         self.missing.clear()
         self.available.clear()
         self.check_all()
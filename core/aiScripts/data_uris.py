@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Move base64 data: URI images out of HTML before Markdown conversion
+
+Apple Notes exports and many HTML emails embed images inline as
+data:image/...;base64,... URIs. Passed through html2text, each one ends up
+as megabytes of base64 in the Markdown that every later prompt reads.
+
+externalize_data_uris() decodes each image in bounded chunks straight to
+a file named by its SHA-256, and replaces the URI with a short relative
+link. Identical images (signatures, logos) are stored once.
+
+Usage:
+    from data_uris import externalize_data_uris
+    html, images = externalize_data_uris(html, ai_dir / 'inline-images', ai_dir)
+"""
+
+import base64
+import binascii
+import hashlib
+import mimetypes
+import os
+import re
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Base64 characters decoded per chunk (multiple of 4)
+DECODE_CHUNK = 256 * 1024
+
+# data:image/<type>[;param=value]*;base64,<payload>
+# The payload may be folded over lines; quotes, ')' and '>' end it.
+_DATA_URI = re.compile(
+    r'data:(image/[\w.+-]+)(?:;[\w.+-]+=[^;,"\'\s>]*)*;base64,([A-Za-z0-9+/=\r\n]+)',
+    re.IGNORECASE
+)
+_LINE_BREAKS = re.compile(r'[\r\n]+')
+
+_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/svg+xml': '.svg',
+}
+
+
+def _extension(content_type: str) -> str:
+    content_type = content_type.lower()
+    return _EXTENSIONS.get(content_type) or mimetypes.guess_extension(content_type) or '.img'
+
+
+def _decode_to_file(text: str, start: int, end: int, tmp_path: Path) -> Tuple[str, int]:
+    """
+    Decode text[start:end] as base64 into tmp_path in bounded chunks
+
+    Returns:
+        (sha256 hex digest, decoded size)
+    """
+    digest = hashlib.sha256()
+    size = 0
+    carry = ''
+    with open(tmp_path, 'wb') as f:
+        for position in range(start, end, DECODE_CHUNK):
+            chunk = carry + _LINE_BREAKS.sub('', text[position:min(position + DECODE_CHUNK, end)])
+            usable = len(chunk) - len(chunk) % 4
+            carry = chunk[usable:]
+            data = base64.b64decode(chunk[:usable], validate=True)
+            digest.update(data)
+            f.write(data)
+            size += len(data)
+        if carry.rstrip('='):
+            raise binascii.Error('Truncated base64 payload')
+    return digest.hexdigest(), size
+
+
+def externalize_data_uris(html: str, image_dir: Path, link_base: Optional[Path] = None,
+                          metrics=None) -> Tuple[str, List[Path]]:
+    """
+    Replace base64 data: URI images with links to content-addressed files
+
+    Args:
+        html: HTML document
+        image_dir: Directory for the image files (created when needed)
+        link_base: Directory the links should be relative to (typically the
+                   Markdown output directory); absolute paths if None
+        metrics: Optional RunMetrics; counts 'inline_images' and 'inline_image_bytes'
+
+    Returns:
+        (html with data: URIs replaced, image files referenced)
+    """
+    if 'data:' not in html:
+        return html, []
+
+    image_dir = Path(image_dir)
+    images: List[Path] = []
+
+    def replace(match: re.Match) -> str:
+        image_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = image_dir / f".inline-{os.getpid()}.tmp"
+        try:
+            digest, size = _decode_to_file(html, match.start(2), match.end(2), tmp_path)
+        except (binascii.Error, ValueError):
+            # Not valid base64; leave the URI for html2text as before
+            tmp_path.unlink(missing_ok=True)
+            return match.group(0)
+
+        image_path = image_dir / f"{digest[:32]}{_extension(match.group(1))}"
+        if image_path.exists():
+            tmp_path.unlink()
+        else:
+            os.replace(tmp_path, image_path)
+        images.append(image_path)
+
+        if metrics is not None:
+            metrics.count('inline_images')
+            metrics.count('inline_image_bytes', size)
+
+        link = os.path.relpath(image_path, link_base) if link_base is not None else str(image_path)
+        return Path(link).as_posix()
+
+    return _DATA_URI.sub(replace, html), images
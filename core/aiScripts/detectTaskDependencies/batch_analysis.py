@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Multi-Project Dependency Analysis
+Analyzes many TASKS.md files in a process pool and aggregates the results.
+
+Each project's report and graph are written next to its TASKS.md, as in
+single-file mode. A small cache file beside each TASKS.md records the content
+hash and summary of the last run, so unchanged projects are skipped.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    from ..logger import get_logger
+    logger = get_logger('task_dependency_detector')
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from logger import get_logger
+    logger = get_logger('task_dependency_detector')
+
+# Bump when the summary format or analysis changes to invalidate caches
+CACHE_VERSION = 1
+
+CACHE_FILENAME = '.task_dependency_cache.json'
+
+# Graph format -> TASK_DEPENDENCY_GRAPH file extension
+GRAPH_EXTENSIONS = {'mermaid': 'md', 'dot': 'dot', 'json': 'json'}
+
+
+def expand_task_files(patterns: Iterable[str]) -> List[Path]:
+    """
+    Expand paths and glob patterns into a sorted list of unique TASKS.md files
+
+    Args:
+        patterns: File paths or glob patterns (``**`` is supported)
+
+    Returns:
+        Resolved paths of existing files
+    """
+    found = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = glob.glob(pattern, recursive=True)
+        else:
+            matches = [pattern]
+        for match in matches:
+            path = Path(match)
+            if path.is_file():
+                found.add(path.resolve())
+            else:
+                logger.warning(f"Skipping {match}: not a file")
+    return sorted(found)
+
+
+def _output_files(tasks_file: Path, graph_options: Dict[str, Any]) -> List[Path]:
+    """Report and graph files a project's analysis writes next to its TASKS.md"""
+    output_dir = tasks_file.parent
+    formats = graph_options.get('formats', ['mermaid'])
+    return [output_dir / "TASK_DEPENDENCY_REPORT.md"] + [
+        output_dir / f"TASK_DEPENDENCY_GRAPH.{GRAPH_EXTENSIONS[fmt]}" for fmt in formats
+    ]
+
+
+def _hash_file(path: Path, graph_options: Dict[str, Any]) -> str:
+    """Hash file content together with the options that shape the outputs"""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([CACHE_VERSION, graph_options], sort_keys=True).encode('utf-8'))
+    digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _read_cache(tasks_file: Path) -> Optional[Dict[str, Any]]:
+    """Read cached summary for a project, or None if missing or malformed"""
+    cache_file = tasks_file.parent / CACHE_FILENAME
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _write_cache(tasks_file: Path, content_hash: str, summary: Dict[str, Any]) -> None:
+    """Store summary and content hash next to the project's TASKS.md"""
+    cache_file = tasks_file.parent / CACHE_FILENAME
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'hash': content_hash, 'summary': summary}, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not write cache {cache_file}: {e}")
+
+
+def analyze_project(tasks_file: str, graph_options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analyze a single project (runs in a worker process)
+
+    Args:
+        tasks_file: Path to the project's TASKS.md
+        graph_options: Keyword arguments for generate_dependency_graph plus
+                       'formats', the list of graph formats to write
+
+    Returns:
+        Summary dict with counts, cycles and blocked tasks
+    """
+    try:
+        from .detectTaskDependencies import TaskDependencyDetector
+    except ImportError:
+        from detectTaskDependencies import TaskDependencyDetector
+
+    path = Path(tasks_file)
+    detector = TaskDependencyDetector(path)
+    detector.load_tasks()
+
+    detections = detector.detect_dependencies()
+    cycles = detector.detect_circular_dependencies()
+    graph = detector.build_graph()
+    schedule = graph.schedule()
+
+    output_dir = path.parent
+    # The report reuses this run's detections, cycles and graph
+    detector.generate_report(output_dir / "TASK_DEPENDENCY_REPORT.md",
+                             detections=detections, cycles=cycles, graph=graph)
+
+    options = dict(graph_options)
+    formats = options.pop('formats', ['mermaid'])
+    for fmt in formats:
+        detector.generate_dependency_graph(
+            output_dir / f"TASK_DEPENDENCY_GRAPH.{GRAPH_EXTENSIONS[fmt]}", fmt=fmt, **options
+        )
+
+    # Blocked: explicitly marked, or waiting on an unfinished blocker
+    store = detector.tasks
+    waiting = set()
+    for task in store:
+        if task.status != 'Completed':
+            waiting.update(ref for ref in task.blocks if ref in store)
+    blocked = [
+        task.id for task in store
+        if task.status != 'Completed' and (task.status == 'Blocked' or task.id in waiting)
+    ]
+
+    status_counts: Dict[str, int] = {}
+    for status in store.statuses:
+        status_counts[status] = status_counts.get(status, 0) + 1
+
+    return {
+        'project': str(path),
+        'tasks': len(store),
+        'dependencies': len(detections),
+        'status_counts': status_counts,
+        'cycles': cycles,
+        'blocked': blocked,
+        'critical_path': schedule.critical_path,
+        'critical_length': schedule.critical_length,
+    }
+
+
+def run_batch(patterns: Iterable[str], graph_options: Optional[Dict[str, Any]] = None,
+              workers: Optional[int] = None, use_cache: bool = True) -> List[Dict[str, Any]]:
+    """
+    Analyze many projects in parallel, skipping unchanged ones
+
+    Args:
+        patterns: TASKS.md paths or glob patterns
+        graph_options: Options forwarded to analyze_project
+        workers: Process pool size (defaults to CPU count)
+        use_cache: Reuse cached summaries for unchanged projects
+
+    Returns:
+        One summary dict per project, sorted by project path. Each includes
+        'cached' (bool) and, on failure, 'error'.
+    """
+    graph_options = graph_options or {}
+    files = expand_task_files(patterns)
+    logger.info(f"Found {len(files)} TASKS.md file(s)")
+
+    results: List[Dict[str, Any]] = []
+    pending: Dict[Path, str] = {}
+
+    for path in files:
+        content_hash = _hash_file(path, graph_options)
+        cached = _read_cache(path) if use_cache else None
+        outputs_exist = all(output.exists() for output in _output_files(path, graph_options))
+        if cached and cached.get('hash') == content_hash and outputs_exist:
+            logger.debug(f"Unchanged, using cache: {path}")
+            results.append(dict(cached['summary'], cached=True))
+        else:
+            pending[path] = content_hash
+
+    logger.info(f"Analyzing {len(pending)} project(s), {len(results)} unchanged")
+
+    if pending:
+        max_workers = min(workers or os.cpu_count() or 1, len(pending))
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pool.submit(analyze_project, str(path), graph_options): path
+                for path in pending
+            }
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    logger.error(f"  ✗ {path}: {e}")
+                    results.append({'project': str(path), 'error': str(e), 'cached': False})
+                    continue
+                logger.info(f"  ✓ {path} ({summary['tasks']} tasks)")
+                _write_cache(path, pending[path], summary)
+                results.append(dict(summary, cached=False))
+
+    results.sort(key=lambda r: r['project'])
+    return results
+
+
+def generate_batch_report(results: List[Dict[str, Any]], output_file: Path) -> None:
+    """Write an aggregated cross-project Markdown report"""
+    analyzed = [r for r in results if 'error' not in r]
+    failed = [r for r in results if 'error' in r]
+
+    total_tasks = sum(r['tasks'] for r in analyzed)
+    total_cycles = sum(len(r['cycles']) for r in analyzed)
+    total_blocked = sum(len(r['blocked']) for r in analyzed)
+
+    lines = [
+        "# Cross-Project Dependency Report",
+        f"*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n",
+        "## Summary",
+        f"- Projects analyzed: {len(analyzed)} ({sum(1 for r in analyzed if r['cached'])} unchanged)",
+        f"- Projects failed: {len(failed)}",
+        f"- Total tasks: {total_tasks}",
+        f"- Circular dependencies: {total_cycles}",
+        f"- Blocked tasks: {total_blocked}\n",
+        "## Projects\n",
+        "| Project | Tasks | Dependencies | Cycles | Blocked | Critical Path (days) |",
+        "|---------|-------|--------------|--------|---------|----------------------|",
+    ]
+
+    for r in analyzed:
+        lines.append(
+            f"| {r['project']} | {r['tasks']} | {r['dependencies']} | "
+            f"{len(r['cycles'])} | {len(r['blocked'])} | {r['critical_length']:g} |"
+        )
+
+    with_cycles = [r for r in analyzed if r['cycles']]
+    if with_cycles:
+        lines.append("\n## ⚠️ Circular Dependencies\n")
+        for r in with_cycles:
+            lines.append(f"### {r['project']}")
+            for cycle in r['cycles']:
+                lines.append(f"- {' → '.join(cycle)}")
+            lines.append("")
+
+    with_blocked = [r for r in analyzed if r['blocked']]
+    if with_blocked:
+        lines.append("\n## Blocked Tasks\n")
+        for r in with_blocked:
+            lines.append(f"### {r['project']}")
+            lines.append(', '.join(r['blocked']))
+            lines.append("")
+
+    if failed:
+        lines.append("\n## ✗ Failed Projects\n")
+        for r in failed:
+            lines.append(f"- {r['project']}: {r['error']}")
+
+    output_file.write_text('\n'.join(lines), encoding='utf-8')
@@ -7,10 +7,9 @@ Analyzes task descriptions to automatically detect and suggest dependencies.
 import re
 import json
 import sys
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Set, Tuple, Optional
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from collections import defaultdict
 
 # Import logger
 try:
@@ -22,20 +21,35 @@ except ImportError:
     from logger import get_logger
     logger = get_logger('task_dependency_detector')
 
+try:
+    from ..metrics import get_metrics
+    from ..profiling import run_main
+except ImportError:
+    from metrics import get_metrics
+    from profiling import run_main
 
-@dataclass
-class Task:
-    """Represents a task with metadata"""
-    id: str
-    title: str
-    description: str
-    owner: str
-    status: str
-    blocks: List[str]
-    related: List[str]
-    source: str
-    context: str
-    deadline: Optional[str] = None
+metrics = get_metrics('task_dependency_detector')
+
+try:
+    from .task_store import Task, TaskStore
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from task_store import Task, TaskStore
+
+try:
+    from .task_graph import TaskGraph, ScheduleResult, parse_effort
+except ImportError:
+    from task_graph import TaskGraph, ScheduleResult, parse_effort
+
+try:
+    from .task_similarity import TaskSimilarityIndex
+except ImportError:
+    from task_similarity import TaskSimilarityIndex
+
+try:
+    from .graph_renderer import GraphRenderer, FORMATS, CLUSTER_FIELDS
+except ImportError:
+    from graph_renderer import GraphRenderer, FORMATS, CLUSTER_FIELDS
 
 
 @dataclass
@@ -82,11 +96,17 @@ class TaskDependencyDetector:
         'follow_up': ['cleanup', 'verify', 'test', 'review', 'document'],
     }
     
+    # Placeholder targets emitted when no TASK ID is named
+    PLACEHOLDERS = ('UNKNOWN', 'UPSTREAM', 'DOWNSTREAM')
+    
+    # Minimum TF-IDF cosine similarity to resolve a placeholder
+    SIMILARITY_THRESHOLD = 0.15
+    
     def __init__(self, tasks_file: Path):
         """Initialize detector with tasks file path"""
         self.tasks_file = tasks_file
-        self.tasks: List[Task] = []
-        self.task_map: Dict[str, Task] = {}
+        self.tasks: TaskStore = TaskStore()
+        self.task_map: TaskStore = self.tasks
         
     def load_tasks(self) -> None:
         """Load tasks from TASKS.md file"""
@@ -95,19 +115,20 @@ class TaskDependencyDetector:
         
         content = self.tasks_file.read_text()
         self.tasks = self._parse_tasks_from_markdown(content)
-        self.task_map = {task.id: task for task in self.tasks}
+        self.task_map = self.tasks
         
-    def _parse_tasks_from_markdown(self, content: str) -> List[Task]:
-        """Parse tasks from markdown content"""
-        tasks = []
-        current_task = None
+    def _parse_tasks_from_markdown(self, content: str) -> TaskStore:
+        """Parse tasks from markdown content into a compact task store"""
+        tasks = TaskStore(content)
         
         # Simple regex to find task entries (TASK-XXX format)
         task_pattern = r'#### (TASK-\d+):\s*(.+?)(?=####\s*TASK-|\Z)'
         
         for match in re.finditer(task_pattern, content, re.DOTALL):
             task_id = match.group(1)
-            task_content = match.group(2).strip()
+            raw_content = match.group(2)
+            task_content = raw_content.strip()
+            start = match.start(2) + len(raw_content) - len(raw_content.lstrip())
             
             # Extract fields
             title_match = re.search(r'\*\*([^*]+)\*\*', task_content)
@@ -134,20 +155,24 @@ class TaskDependencyDetector:
             deadline_match = re.search(r'Deadline:\s*([^\n]+)', task_content)
             deadline = deadline_match.group(1).strip() if deadline_match and deadline_match.group(1).strip() != 'None' else None
             
-            tasks.append(Task(
-                id=task_id,
+            effort_match = re.search(r'Effort:\s*([^\n]+)', task_content)
+            effort = parse_effort(effort_match.group(1)) if effort_match else None
+            
+            tasks.add(
+                task_id,
                 title=title,
-                description=task_content,
                 owner=owner,
                 status=status,
                 blocks=blocks,
                 related=related,
                 source=source,
                 context=context,
-                deadline=deadline
-            ))
+                deadline=deadline,
+                effort=effort,
+                span=(start, start + len(task_content))
+            )
         
-        return tasks
+        return tasks.freeze()
     
     def detect_dependencies(self) -> List[DependencyDetection]:
         """Detect all dependencies between tasks"""
@@ -169,6 +194,9 @@ class TaskDependencyDetector:
             contextual_deps = self._find_contextual_dependencies(task)
             detections.extend(contextual_deps)
         
+        # Resolve placeholders to concrete tasks by text similarity
+        detections = self._resolve_placeholders(detections)
+        
         # Deduplicate and sort by confidence
         detections = self._deduplicate_detections(detections)
         detections.sort(key=lambda x: x.confidence, reverse=True)
@@ -249,6 +277,56 @@ class TaskDependencyDetector:
         
         return detections
     
+    def _resolve_placeholders(self, detections: List[DependencyDetection]) -> List[DependencyDetection]:
+        """Replace UNKNOWN/UPSTREAM/DOWNSTREAM with the most similar task"""
+        resolved = []
+        pending = []
+        for det in detections:
+            if det.from_task in self.PLACEHOLDERS or det.to_task in self.PLACEHOLDERS:
+                pending.append(det)
+            else:
+                resolved.append(det)
+        
+        if not pending or len(self.tasks) < 2:
+            return detections
+        
+        index = TaskSimilarityIndex(
+            [task.id for task in self.tasks],
+            [f"{task.title} {task.context}" for task in self.tasks]
+        )
+        
+        # Keyword matches query with the matched phrase; contextual
+        # matches query with the whole task
+        queries = []
+        anchors = []
+        for det in pending:
+            anchor = det.to_task if det.from_task in self.PLACEHOLDERS else det.from_task
+            task = self.task_map[anchor]
+            if det.to_task == 'UNKNOWN':
+                queries.append(det.keywords_found[0])
+            else:
+                queries.append(f"{task.title} {task.context}")
+            anchors.append(anchor)
+        
+        matches = index.query(queries, exclude=anchors, min_score=self.SIMILARITY_THRESHOLD)
+        
+        for det, found in zip(pending, matches):
+            if not found:
+                resolved.append(det)
+                continue
+            
+            match_id, score = found[0]
+            resolved.append(DependencyDetection(
+                from_task=match_id if det.from_task in self.PLACEHOLDERS else det.from_task,
+                to_task=match_id if det.to_task in self.PLACEHOLDERS else det.to_task,
+                confidence=det.confidence,
+                reason=f"{det.reason} (resolved by similarity {score:.2f})",
+                keywords_found=det.keywords_found
+            ))
+        
+        logger.debug(f"Resolved {sum(1 for m in matches if m)}/{len(pending)} placeholder dependencies")
+        return resolved
+    
     def _deduplicate_detections(self, detections: List[DependencyDetection]) -> List[DependencyDetection]:
         """Remove duplicate detections, keeping highest confidence"""
         unique = {}
@@ -262,67 +340,116 @@ class TaskDependencyDetector:
     
     def detect_circular_dependencies(self) -> List[List[str]]:
         """Detect circular dependencies in task graph"""
-        # Build adjacency list
-        graph = defaultdict(set)
-        for task in self.tasks:
-            for blocked in task.blocks:
-                if blocked in self.task_map:
-                    graph[task.id].add(blocked)
+        # Walk the store's Blocks CSR rows directly by integer ID
+        store = self.tasks
+        n = len(store)
         
-        # Find cycles using DFS
+        # Find cycles using iterative DFS so long chains don't hit the
+        # recursion limit; ``path`` mirrors the DFS stack
         cycles = []
         visited = set()
         rec_stack = set()
         
-        def dfs(node: str, path: List[str]):
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
+        for root in range(n):
+            if root in visited:
+                continue
+            
+            visited.add(root)
+            rec_stack.add(root)
+            path = [root]
+            stack = [iter(store.block_targets(root))]
             
-            for neighbor in graph.get(node, []):
+            while stack:
+                neighbor = next(stack[-1], None)
+                if neighbor is None:
+                    stack.pop()
+                    rec_stack.discard(path.pop())
+                    continue
+                if not store.is_task(neighbor):
+                    continue
                 if neighbor not in visited:
-                    dfs(neighbor, path.copy())
+                    visited.add(neighbor)
+                    rec_stack.add(neighbor)
+                    path.append(neighbor)
+                    stack.append(iter(store.block_targets(neighbor)))
                 elif neighbor in rec_stack:
                     # Found a cycle
                     cycle_start = path.index(neighbor)
-                    cycles.append(path[cycle_start:] + [neighbor])
-            
-            rec_stack.remove(node)
-        
-        for task in self.tasks:
-            if task.id not in visited:
-                dfs(task.id, [])
+                    cycles.append([store.ids[i] for i in path[cycle_start:] + [neighbor]])
         
         return cycles
     
-    def generate_dependency_graph(self, output_file: Path) -> None:
-        """Generate Mermaid diagram of task dependencies"""
-        lines = ["```mermaid", "graph TD"]
-        
-        for task in self.tasks:
-            # Add task node
-            status_symbol = {
-                'Completed': '✓',
-                'In Progress': '⚙',
-                'Blocked': '⛔',
-                'Not Started': '○'
-            }.get(task.status, '○')
-            
-            lines.append(f'    {task.id}["{status_symbol} {task.id}: {task.title[:30]}"]')
-            
-            # Add dependency edges
-            for blocked in task.blocks:
-                if blocked in self.task_map:
-                    lines.append(f'    {task.id} --> {blocked}')
-        
-        lines.append("```")
-        
-        output_file.write_text('\n'.join(lines))
+    def build_graph(self) -> TaskGraph:
+        """Build CSR task graph from Blocks relationships"""
+        return TaskGraph.from_tasks(self.tasks)
+    
+    def schedule(self) -> ScheduleResult:
+        """Compute topological order, critical path and parallel waves"""
+        return self.build_graph().schedule()
     
-    def generate_report(self, output_file: Path) -> None:
-        """Generate comprehensive dependency analysis report"""
-        detections = self.detect_dependencies()
-        cycles = self.detect_circular_dependencies()
+    def ready_tasks(self, graph: Optional[TaskGraph] = None) -> List[str]:
+        """
+        Not Started tasks whose blockers are all Completed
+        
+        Blockers that are not defined in the file do not hold a task back.
+        
+        Args:
+            graph: Graph from build_graph() to reuse
+        
+        Returns:
+            Task IDs in file order
+        """
+        graph = graph or self.build_graph()
+        waiting = set()
+        for u, task_id in enumerate(graph.ids):
+            if self.task_map[task_id].status != 'Completed':
+                waiting.update(graph.successors(u))
+        return [
+            task_id for v, task_id in enumerate(graph.ids)
+            if v not in waiting and self.task_map[task_id].status == 'Not Started'
+        ]
+    
+    def generate_dependency_graph(self, output_file: Path, fmt: str = 'mermaid',
+                                  collapse_completed: bool = False,
+                                  cluster_by: Optional[str] = None,
+                                  reduce: bool = False) -> None:
+        """
+        Generate diagram of task dependencies
+
+        Args:
+            output_file: Path to write the graph to
+            fmt: Output format ('mermaid', 'dot' or 'json')
+            collapse_completed: Merge completed subtrees into one summary node
+            cluster_by: Group tasks into subgraphs by 'owner' or 'status'
+            reduce: Drop edges implied by longer dependency chains
+        """
+        renderer = GraphRenderer(
+            self.tasks,
+            collapse_completed=collapse_completed,
+            cluster_by=cluster_by,
+            reduce=reduce
+        )
+        renderer.write(output_file, fmt)
+    
+    def generate_report(self, output_file: Path,
+                        detections: Optional[List[DependencyDetection]] = None,
+                        cycles: Optional[List[List[str]]] = None,
+                        graph: Optional[TaskGraph] = None) -> None:
+        """
+        Generate comprehensive dependency analysis report
+        
+        Args:
+            output_file: Markdown report path
+            detections: Result of detect_dependencies() to reuse
+            cycles: Result of detect_circular_dependencies() to reuse
+            graph: Graph from build_graph() to reuse
+        """
+        if detections is None or cycles is None:
+            with metrics.stage('dependency_detection'):
+                if detections is None:
+                    detections = self.detect_dependencies()
+                if cycles is None:
+                    cycles = self.detect_circular_dependencies()
         
         report_lines = [
             "# Task Dependency Analysis Report",
@@ -370,49 +497,170 @@ class TaskDependencyDetector:
                 report_lines.append(" → ".join(cycle))
                 report_lines.append("")
         
-        # Critical path suggestion
+        # Critical path analysis
+        graph = graph or self.build_graph()
+        schedule = graph.schedule()
         report_lines.extend([
             "\n## Critical Path Analysis\n",
-            "Tasks with no dependencies (can start immediately):"
+            f"Critical path length: {schedule.critical_length:g} day(s) of remaining effort\n"
         ])
         
-        tasks_with_no_deps = [
-            task for task in self.tasks 
-            if not task.blocks and task.status == 'Not Started'
-        ]
+        if schedule.critical_path:
+            report_lines.append(" → ".join(schedule.critical_path))
+            report_lines.append("")
+        
+        report_lines.append("Tasks ready to start (all blockers completed):")
+        
+        for task_id in self.ready_tasks(graph):
+            report_lines.append(f"- {task_id}: {self.task_map[task_id].title}")
+        
+        if schedule.waves:
+            report_lines.append("\n### Parallel Waves\n")
+            for i, wave in enumerate(schedule.waves, 1):
+                entries = ', '.join(
+                    f"{task_id} (start: {schedule.earliest_start[task_id]:g})"
+                    for task_id in wave
+                )
+                report_lines.append(f"- Wave {i}: {entries}")
         
-        for task in tasks_with_no_deps:
-            report_lines.append(f"- {task.id}: {task.title}")
+        if schedule.unscheduled:
+            report_lines.append("\nTasks not scheduled (on or after a cycle):")
+            for task_id in schedule.unscheduled:
+                report_lines.append(f"- {task_id}")
         
         output_file.write_text('\n'.join(report_lines))
 
 
 def main():
     """Main entry point"""
-    import sys
+    import argparse
     
-    if len(sys.argv) < 2:
-        logger.error("Usage: python detectTaskDependencies.py <path_to_TASKS.md>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description='Analyze task dependencies in a TASKS.md file',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Report and Mermaid graph next to TASKS.md
+  python3 core/aiScripts/detectTaskDependencies/detectTaskDependencies.py aiDocs/TASKS.md
+
+  # Analyze several projects in parallel with a combined report
+  python3 core/aiScripts/detectTaskDependencies/detectTaskDependencies.py 'projects/*/aiDocs/TASKS.md' \\
+      --batch-report exports/DEPENDENCIES.md
+
+  # Simplified graph for a large backlog, plus DOT and JSON
+  python3 core/aiScripts/detectTaskDependencies/detectTaskDependencies.py aiDocs/TASKS.md \\
+      --collapse-completed --reduce --cluster-by owner --format mermaid dot json
+        """
+    )
+    parser.add_argument(
+        'tasks_files',
+        nargs='+',
+        help='Path to TASKS.md, or several paths/glob patterns for batch mode'
+    )
+    parser.add_argument(
+        '--format',
+        nargs='+',
+        choices=FORMATS,
+        default=['mermaid'],
+        help='Graph output format(s) (default: mermaid)'
+    )
+    parser.add_argument(
+        '--collapse-completed',
+        action='store_true',
+        help='Collapse completed subtrees into a single node'
+    )
+    parser.add_argument(
+        '--cluster-by',
+        choices=CLUSTER_FIELDS,
+        help='Group tasks into subgraphs by owner or status'
+    )
+    parser.add_argument(
+        '--reduce',
+        action='store_true',
+        help='Remove edges implied by longer dependency chains'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Batch mode: number of worker processes (default: CPU count)'
+    )
+    parser.add_argument(
+        '--batch-report',
+        default='TASK_DEPENDENCY_BATCH_REPORT.md',
+        help='Batch mode: path of the cross-project report'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Batch mode: re-analyze projects even if unchanged'
+    )
+    
+    args = parser.parse_args()
     
-    tasks_file = Path(sys.argv[1])
+    # Several files or a glob pattern switch to batch mode
+    import glob
+    if len(args.tasks_files) > 1 or glob.has_magic(args.tasks_files[0]):
+        try:
+            from .batch_analysis import run_batch, generate_batch_report
+        except ImportError:
+            from batch_analysis import run_batch, generate_batch_report
+        
+        results = run_batch(
+            args.tasks_files,
+            graph_options={
+                'formats': args.format,
+                'collapse_completed': args.collapse_completed,
+                'cluster_by': args.cluster_by,
+                'reduce': args.reduce,
+            },
+            workers=args.workers,
+            use_cache=not args.no_cache
+        )
+        report_file = Path(args.batch_report)
+        generate_batch_report(results, report_file)
+        logger.info(f"✓ Batch analysis complete: {report_file}")
+        return
+    
+    tasks_file = Path(args.tasks_files[0])
     logger.info(f"Analyzing tasks from: {tasks_file}")
     
+    metrics.reset()
     detector = TaskDependencyDetector(tasks_file)
-    detector.load_tasks()
+    with metrics.stage('parse'):
+        detector.load_tasks()
+    metrics.file_done(size=tasks_file.stat().st_size)
+    metrics.count('tasks', len(detector.tasks))
     logger.debug(f"Loaded {len(detector.tasks)} tasks")
     
     # Generate outputs
     output_dir = tasks_file.parent
     logger.info("Generating dependency report...")
-    detector.generate_report(output_dir / "TASK_DEPENDENCY_REPORT.md")
-    logger.info("Generating dependency graph...")
-    detector.generate_dependency_graph(output_dir / "TASK_DEPENDENCY_GRAPH.md")
+    with metrics.stage('report'):
+        detector.generate_report(output_dir / "TASK_DEPENDENCY_REPORT.md")
+    
+    graph_files = {
+        'mermaid': output_dir / "TASK_DEPENDENCY_GRAPH.md",
+        'dot': output_dir / "TASK_DEPENDENCY_GRAPH.dot",
+        'json': output_dir / "TASK_DEPENDENCY_GRAPH.json",
+    }
+    for fmt in args.format:
+        logger.info(f"Generating dependency graph ({fmt})...")
+        with metrics.stage('graph'):
+            detector.generate_dependency_graph(
+                graph_files[fmt],
+                fmt=fmt,
+                collapse_completed=args.collapse_completed,
+                cluster_by=args.cluster_by,
+                reduce=args.reduce
+            )
     
     logger.info(f"✓ Analysis complete!")
     logger.info(f"  - Report: {output_dir / 'TASK_DEPENDENCY_REPORT.md'}")
-    logger.info(f"  - Graph: {output_dir / 'TASK_DEPENDENCY_GRAPH.md'}")
+    for fmt in args.format:
+        logger.info(f"  - Graph: {graph_files[fmt]}")
+    metrics.log_summary(logger)
+    logger.info(f"  - Metrics: {metrics.write()}")
 
 
 if __name__ == "__main__":
-    main()
+    run_main(main, 'task_dependency_detector')
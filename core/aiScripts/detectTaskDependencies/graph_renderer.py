@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Dependency Graph Renderer
+Renders the task graph as Mermaid, Graphviz DOT or JSON.
+
+Large graphs can be simplified before rendering:
+- Transitive reduction drops edges implied by a longer path
+  (A -> B -> C makes A -> C redundant)
+- Completed subtrees (completed tasks whose upstream work is all completed)
+  collapse into a single summary node
+- Tasks can be clustered into subgraphs by owner or status
+
+Reduction uses reachability bitsets (Python ints) computed in reverse
+topological order over the CSR graph, so it stays fast on large backlogs.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .task_graph import TaskGraph
+    from .task_store import TaskStore
+except ImportError:
+    from task_graph import TaskGraph
+    from task_store import TaskStore
+
+STATUS_SYMBOLS = {
+    'Completed': '✓',
+    'In Progress': '⚙',
+    'Blocked': '⛔',
+    'Not Started': '○'
+}
+
+# Node ID used for the collapsed completed-work summary
+COLLAPSED_NODE = 'COMPLETED'
+
+FORMATS = ('mermaid', 'dot', 'json')
+
+CLUSTER_FIELDS = ('owner', 'status')
+
+# Mermaid entity codes for characters that end or alter a quoted label;
+# '#' goes first so the codes themselves are not escaped again
+_MERMAID_ESCAPES = (('#', '#35;'), ('"', '#quot;'), ('[', '#91;'), (']', '#93;'),
+                    ('<', '#lt;'), ('>', '#gt;'))
+
+
+def _mermaid_text(text: str) -> str:
+    """Escape text for a quoted Mermaid label"""
+    for char, code in _MERMAID_ESCAPES:
+        text = text.replace(char, code)
+    return ' '.join(text.splitlines())
+
+
+def _dot_text(text: str) -> str:
+    """Escape text for a quoted DOT string"""
+    text = text.replace('\\', '\\\\').replace('"', '\\"')
+    return '\\n'.join(text.splitlines())
+
+
+class GraphRenderer:
+    """Simplifies and renders a TaskStore's dependency graph"""
+
+    def __init__(self, store: TaskStore, collapse_completed: bool = False,
+                 cluster_by: Optional[str] = None, reduce: bool = False,
+                 title_length: int = 30):
+        """
+        Initialize renderer
+
+        Args:
+            store: Populated task store
+            collapse_completed: Merge completed subtrees into one summary node
+            cluster_by: Group nodes into subgraphs by 'owner' or 'status'
+            reduce: Apply transitive reduction to edges
+            title_length: Maximum title characters shown per node
+        """
+        if cluster_by is not None and cluster_by not in CLUSTER_FIELDS:
+            raise ValueError(f"cluster_by must be one of {CLUSTER_FIELDS}, got {cluster_by!r}")
+
+        self.store = store
+        self.graph = TaskGraph.from_store(store)
+        self.collapse_completed = collapse_completed
+        self.cluster_by = cluster_by
+        self.reduce = reduce
+        self.title_length = title_length
+
+        self._layout: Optional[Tuple[List[int], List[Tuple[str, str]], int]] = None
+
+    def _reduced_edges(self) -> List[Tuple[int, int]]:
+        """Return graph edges, transitively reduced if requested"""
+        graph = self.graph
+        offsets, targets = graph.offsets, graph.targets
+        n = len(graph)
+
+        if not self.reduce:
+            return [(u, targets[k]) for u in range(n) for k in range(offsets[u], offsets[u + 1])]
+
+        order = graph.topological_order()
+        position = [n] * n
+        for pos, u in enumerate(order):
+            position[u] = pos
+
+        # reach[u] is a bitset of every node reachable from u. Nodes on a
+        # cycle are not in ``order``, so they only reach themselves and their
+        # edges are kept as-is.
+        reach = [1 << u for u in range(n)]
+        kept: List[Tuple[int, int]] = []
+        for u in range(n):
+            if position[u] == n:
+                kept.extend((u, targets[k]) for k in range(offsets[u], offsets[u + 1]))
+
+        for u in reversed(order):
+            succ = sorted(targets[offsets[u]:offsets[u + 1]], key=position.__getitem__)
+            covered = 0
+            for v in succ:
+                if covered >> v & 1:
+                    continue
+                kept.append((u, v))
+                covered |= reach[v]
+            reach[u] |= covered
+
+        return kept
+
+    def _collapsed_nodes(self) -> List[bool]:
+        """Flag completed tasks whose predecessors are all collapsed too"""
+        graph = self.graph
+        offsets, targets = graph.offsets, graph.targets
+        statuses = self.store.statuses
+        n = len(graph)
+
+        collapsed = [False] * n
+        if not self.collapse_completed:
+            return collapsed
+
+        order = graph.topological_order()
+        for u in order:
+            if statuses[u] == 'Completed':
+                collapsed[u] = True
+
+        # Any collapsed node with a visible predecessor must stay visible
+        for u in order:
+            if not collapsed[u]:
+                for k in range(offsets[u], offsets[u + 1]):
+                    collapsed[targets[k]] = False
+
+        return collapsed
+
+    def layout(self) -> Tuple[List[int], List[Tuple[str, str]], int]:
+        """
+        Compute visible nodes and edges
+
+        Returns:
+            Tuple of (visible node indices, edges as (from_id, to_id), number
+            of tasks merged into the collapsed summary node)
+        """
+        if self._layout is not None:
+            return self._layout
+
+        ids = self.graph.ids
+        collapsed = self._collapsed_nodes()
+        visible = [i for i in range(len(ids)) if not collapsed[i]]
+        collapsed_count = len(ids) - len(visible)
+
+        edges: List[Tuple[str, str]] = []
+        seen = set()
+        for u, v in self._reduced_edges():
+            if collapsed[v]:
+                continue
+            source = COLLAPSED_NODE if collapsed[u] else ids[u]
+            if (source, ids[v]) not in seen:
+                seen.add((source, ids[v]))
+                edges.append((source, ids[v]))
+
+        self._layout = (visible, edges, collapsed_count)
+        return self._layout
+
+    def _label(self, i: int) -> str:
+        """Build display label for node i"""
+        store = self.store
+        symbol = STATUS_SYMBOLS.get(store.statuses[i], '○')
+        title = store.titles[i][:self.title_length]
+        return f"{symbol} {store.ids[i]}: {title}"
+
+    def _clusters(self, visible: List[int]) -> Dict[str, List[int]]:
+        """Group visible nodes by the clustering field, preserving order"""
+        column = self.store.owners if self.cluster_by == 'owner' else self.store.statuses
+        clusters: Dict[str, List[int]] = {}
+        for i in visible:
+            clusters.setdefault(column[i], []).append(i)
+        return clusters
+
+    def to_mermaid(self) -> str:
+        """Render graph as a Mermaid code block"""
+        visible, edges, collapsed_count = self.layout()
+        ids = self.graph.ids
+        lines = ["```mermaid", "graph TD"]
+
+        if collapsed_count:
+            lines.append(f'    {COLLAPSED_NODE}["✓ {collapsed_count} completed task(s)"]')
+
+        if self.cluster_by:
+            for n, (name, members) in enumerate(self._clusters(visible).items()):
+                lines.append(f'    subgraph cluster{n}["{_mermaid_text(name)}"]')
+                for i in members:
+                    lines.append(f'        {ids[i]}["{_mermaid_text(self._label(i))}"]')
+                lines.append('    end')
+        else:
+            for i in visible:
+                lines.append(f'    {ids[i]}["{_mermaid_text(self._label(i))}"]')
+
+        for source, target in edges:
+            lines.append(f'    {source} --> {target}')
+
+        lines.append("```")
+        return '\n'.join(lines)
+
+    def to_dot(self) -> str:
+        """Render graph in Graphviz DOT format"""
+        visible, edges, collapsed_count = self.layout()
+        ids = self.graph.ids
+        lines = ["digraph tasks {", "    rankdir=TB;", "    node [shape=box];"]
+
+        if collapsed_count:
+            lines.append(f'    "{COLLAPSED_NODE}" [label="✓ {collapsed_count} completed task(s)", style=dashed];')
+
+        if self.cluster_by:
+            for n, (name, members) in enumerate(self._clusters(visible).items()):
+                lines.append(f'    subgraph cluster_{n} {{')
+                lines.append(f'        label="{_dot_text(name)}";')
+                for i in members:
+                    lines.append(f'        "{_dot_text(ids[i])}" [label="{_dot_text(self._label(i))}"];')
+                lines.append('    }')
+        else:
+            for i in visible:
+                lines.append(f'    "{_dot_text(ids[i])}" [label="{_dot_text(self._label(i))}"];')
+
+        for source, target in edges:
+            lines.append(f'    "{_dot_text(source)}" -> "{_dot_text(target)}";')
+
+        lines.append("}")
+        return '\n'.join(lines)
+
+    def to_json(self) -> str:
+        """Render graph as JSON with nodes, edges and collapse summary"""
+        visible, edges, collapsed_count = self.layout()
+        store = self.store
+        column = None
+        if self.cluster_by:
+            column = store.owners if self.cluster_by == 'owner' else store.statuses
+
+        nodes = []
+        for i in visible:
+            node = {
+                'id': store.ids[i],
+                'title': store.titles[i],
+                'owner': store.owners[i],
+                'status': store.statuses[i],
+            }
+            if column is not None:
+                node['cluster'] = column[i]
+            nodes.append(node)
+
+        return json.dumps({
+            'nodes': nodes,
+            'edges': [list(edge) for edge in edges],
+            'collapsed_completed': collapsed_count,
+        }, indent=2, ensure_ascii=False)
+
+    def render(self, fmt: str) -> str:
+        """
+        Render graph in the requested format
+
+        Args:
+            fmt: One of 'mermaid', 'dot', 'json'
+
+        Returns:
+            Rendered graph text
+        """
+        if fmt == 'mermaid':
+            return self.to_mermaid()
+        if fmt == 'dot':
+            return self.to_dot()
+        if fmt == 'json':
+            return self.to_json()
+        raise ValueError(f"Unsupported graph format: {fmt}")
+
+    def write(self, output_file: Path, fmt: str = 'mermaid') -> None:
+        """Render graph and write it to output_file"""
+        output_file.write_text(self.render(fmt), encoding='utf-8')
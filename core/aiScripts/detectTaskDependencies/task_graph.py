@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Task Graph Scheduling Engine
+Topological ordering, critical path and parallel wave analysis over Task.blocks.
+
+The graph is stored as compressed adjacency arrays (CSR): task IDs are mapped
+to integer indices, and the successors of task ``i`` live in
+``targets[offsets[i]:offsets[i + 1]]``. All passes are linear in the number of
+tasks plus edges, so analysis stays fast on large imported backlogs.
+
+Edge semantics follow TASKS.md: if TASK-A lists ``Blocks: TASK-B`` then A must
+finish before B can start (edge A -> B).
+"""
+
+import math
+import re
+from array import array
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    from .task_store import TaskStore
+except ImportError:
+    from task_store import TaskStore
+
+# Effort used for tasks without an explicit estimate (in days)
+DEFAULT_EFFORT = 1.0
+
+# Unit multipliers for effort estimates, normalized to days
+EFFORT_UNITS = {
+    'h': 1.0 / 8.0,
+    'd': 1.0,
+    'w': 5.0,
+}
+
+
+def parse_effort(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an effort estimate such as "3d", "4h", "1.5w" or "2"
+
+    Args:
+        value: Raw effort string from TASKS.md (unitless numbers are days)
+
+    Returns:
+        Effort in days, or None if the value is missing or unparseable
+    """
+    if not value:
+        return None
+
+    match = re.match(r'\s*(\d+(?:\.\d+)?)\s*([hdw])?', value.lower())
+    if not match:
+        return None
+
+    amount = float(match.group(1))
+    unit = match.group(2) or 'd'
+    return amount * EFFORT_UNITS[unit]
+
+
+@dataclass
+class ScheduleResult:
+    """Result of scheduling the task graph"""
+    order: List[str]
+    earliest_start: Dict[str, float]
+    earliest_finish: Dict[str, float]
+    critical_path: List[str]
+    critical_length: float
+    waves: List[List[str]]
+    unscheduled: List[str] = field(default_factory=list)
+
+
+class TaskGraph:
+    """Directed task graph backed by CSR adjacency arrays"""
+
+    def __init__(self, ids: Sequence[str], offsets: array, targets: array,
+                 durations: Optional[Sequence[float]] = None):
+        """
+        Wrap existing CSR adjacency arrays
+
+        Args:
+            ids: Task IDs, one per node
+            offsets: Row offsets, length len(ids) + 1
+            targets: Successor node indices (no self-loops or duplicates)
+            durations: Optional per-node effort (defaults to DEFAULT_EFFORT)
+        """
+        self.ids: List[str] = list(ids)
+        self.index: Dict[str, int] = {task_id: i for i, task_id in enumerate(self.ids)}
+        n = len(self.ids)
+
+        if durations is None:
+            self.durations = array('d', [DEFAULT_EFFORT] * n)
+        else:
+            self.durations = array('d', durations)
+
+        self.offsets = offsets
+        self.targets = targets
+
+        self.indegree = array('i', [0] * n)
+        for v in targets:
+            self.indegree[v] += 1
+
+    @classmethod
+    def from_edges(cls, ids: Sequence[str], edges: Iterable[tuple],
+                   durations: Optional[Sequence[float]] = None) -> 'TaskGraph':
+        """
+        Build graph from task IDs and (from_id, to_id) edges
+
+        Args:
+            ids: Task IDs, one per node
+            edges: Iterable of (from_id, to_id) pairs; unknown IDs are ignored
+            durations: Optional per-node effort (defaults to DEFAULT_EFFORT)
+
+        Returns:
+            TaskGraph instance
+        """
+        ids = list(ids)
+        index = {task_id: i for i, task_id in enumerate(ids)}
+        n = len(ids)
+
+        # Collect edges as parallel integer arrays, dropping self-loops and
+        # duplicates so in-degrees stay accurate
+        sources = array('i')
+        dests = array('i')
+        seen = set()
+        for from_id, to_id in edges:
+            u = index.get(from_id)
+            v = index.get(to_id)
+            if u is None or v is None or u == v or (u, v) in seen:
+                continue
+            seen.add((u, v))
+            sources.append(u)
+            dests.append(v)
+
+        # Counting sort edges by source into CSR layout
+        offsets = array('i', [0] * (n + 1))
+        for u in sources:
+            offsets[u + 1] += 1
+        for i in range(n):
+            offsets[i + 1] += offsets[i]
+
+        targets = array('i', [0] * len(sources))
+        cursor = array('i', offsets[:n]) if n else array('i')
+        for u, v in zip(sources, dests):
+            targets[cursor[u]] = v
+            cursor[u] += 1
+
+        return cls(ids, offsets, targets, durations)
+
+    @classmethod
+    def from_store(cls, store: TaskStore, completed_status: str = 'Completed') -> 'TaskGraph':
+        """
+        Build graph directly from a TaskStore's Blocks CSR arrays
+
+        Args:
+            store: Populated task store
+            completed_status: Status value treated as finished
+
+        Returns:
+            TaskGraph instance
+        """
+        store.freeze()
+        n = len(store)
+        src_offsets = store.block_offsets
+        src_targets = store.block_targets_flat
+
+        # Store rows are already grouped by source; only references to
+        # undefined tasks, self-loops and duplicates need filtering
+        offsets = array('i', [0] * (n + 1))
+        targets = array('i')
+        for u in range(n):
+            row = set()
+            for k in range(src_offsets[u], src_offsets[u + 1]):
+                v = src_targets[k]
+                if v < n and v != u and v not in row:
+                    row.add(v)
+                    targets.append(v)
+            offsets[u + 1] = len(targets)
+
+        durations = array('d', [0.0] * n)
+        for i in range(n):
+            if store.statuses[i] != completed_status:
+                effort = store.efforts[i]
+                durations[i] = DEFAULT_EFFORT if math.isnan(effort) else effort
+
+        return cls(store.ids[:n], offsets, targets, durations)
+
+    @classmethod
+    def from_tasks(cls, tasks: Sequence, completed_status: str = 'Completed') -> 'TaskGraph':
+        """
+        Build graph from Task objects or a TaskStore
+
+        Completed tasks keep their place in the graph but contribute no
+        remaining effort, so the schedule reflects outstanding work only.
+
+        Args:
+            tasks: TaskStore, or Task objects with id, blocks, status and effort
+            completed_status: Status value treated as finished
+
+        Returns:
+            TaskGraph instance
+        """
+        if isinstance(tasks, TaskStore):
+            return cls.from_store(tasks, completed_status)
+
+        ids = [task.id for task in tasks]
+        edges = ((task.id, blocked) for task in tasks for blocked in task.blocks)
+        durations = []
+        for task in tasks:
+            if task.status == completed_status:
+                durations.append(0.0)
+            else:
+                effort = getattr(task, 'effort', None)
+                durations.append(DEFAULT_EFFORT if effort is None else effort)
+        return cls.from_edges(ids, edges, durations)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def successors(self, i: int) -> array:
+        """Return successor indices of node i"""
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def topological_order(self) -> List[int]:
+        """
+        Compute topological order using Kahn's algorithm
+
+        Returns:
+            Node indices in dependency order. Nodes on or downstream of a
+            cycle are omitted; compare against len(graph) to detect this.
+        """
+        indegree = array('i', self.indegree)
+        offsets, targets = self.offsets, self.targets
+        queue = deque(i for i in range(len(self.ids)) if indegree[i] == 0)
+        order = []
+
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    queue.append(v)
+
+        return order
+
+    def schedule(self) -> ScheduleResult:
+        """
+        Compute earliest start times, the critical path and parallel waves
+
+        Returns:
+            ScheduleResult with per-task timings keyed by task ID
+        """
+        n = len(self.ids)
+        order = self.topological_order()
+        offsets, targets, durations = self.offsets, self.targets, self.durations
+
+        start = array('d', [0.0] * n)
+        level = array('i', [0] * n)
+        best_pred = array('i', [-1] * n)
+
+        # Forward pass: relax successors in topological order
+        for u in order:
+            finish = start[u] + durations[u]
+            next_level = level[u] + 1
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                if best_pred[v] == -1 or finish > start[v]:
+                    start[v] = finish
+                    best_pred[v] = u
+                if next_level > level[v]:
+                    level[v] = next_level
+
+        # Critical path ends at the task with the latest finish
+        end_node = -1
+        critical_length = 0.0
+        for u in order:
+            finish = start[u] + durations[u]
+            if end_node == -1 or finish > critical_length:
+                end_node = u
+                critical_length = finish
+
+        critical_path = []
+        node = end_node
+        while node != -1:
+            critical_path.append(self.ids[node])
+            node = best_pred[node]
+        critical_path.reverse()
+
+        waves: List[List[str]] = []
+        for u in order:
+            while len(waves) <= level[u]:
+                waves.append([])
+            waves[level[u]].append(self.ids[u])
+
+        scheduled = set(order)
+        unscheduled = [self.ids[i] for i in range(n) if i not in scheduled]
+
+        return ScheduleResult(
+            order=[self.ids[u] for u in order],
+            earliest_start={self.ids[u]: start[u] for u in order},
+            earliest_finish={self.ids[u]: start[u] + durations[u] for u in order},
+            critical_path=critical_path,
+            critical_length=critical_length,
+            waves=waves,
+            unscheduled=unscheduled
+        )
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Task Similarity Index
+TF-IDF vectors over task titles and contexts with batched sparse similarity.
+
+Documents are stored as L2-normalized sparse vectors in an inverted index
+(term -> postings of (document, weight)). Scoring a batch of queries walks
+only the postings of terms each query contains, which is the sparse
+matrix product Q x D^T without ever comparing every pair of tasks.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Words that carry no topical signal, including the dependency keywords
+# themselves so "depends on database setup" matches on "database setup"
+STOPWORDS = frozenset("""
+    a an and are as at be been but by for from has have in into is it its of
+    on or so that the their then this to was were will with all any can may
+    should would about after once when requires require depends depend blocked
+    waiting wait needs need first before prior must complete completed done
+    finished related similar connected see also part task tasks
+""".split())
+
+TOKEN_PATTERN = re.compile(r'[a-z][a-z0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, dropping stopwords and task IDs"""
+    return [
+        token for token in TOKEN_PATTERN.findall(text.lower())
+        if token not in STOPWORDS
+    ]
+
+
+class TaskSimilarityIndex:
+    """Inverted TF-IDF index for finding tasks related to a piece of text"""
+
+    def __init__(self, ids: Sequence[str], texts: Sequence[str]):
+        """
+        Build index from parallel sequences of task IDs and texts
+
+        Args:
+            ids: Task IDs
+            texts: Text describing each task (typically title and context)
+        """
+        self.ids: List[str] = list(ids)
+        self.index: Dict[str, int] = {task_id: i for i, task_id in enumerate(self.ids)}
+
+        term_counts = [Counter(tokenize(text)) for text in texts]
+
+        document_frequency: Counter = Counter()
+        for counts in term_counts:
+            document_frequency.update(counts.keys())
+
+        n = len(self.ids)
+        self.idf: Dict[str, float] = {
+            term: math.log((1 + n) / (1 + df)) + 1.0
+            for term, df in document_frequency.items()
+        }
+
+        self.postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for doc, counts in enumerate(term_counts):
+            for term, weight in self._weigh(counts).items():
+                self.postings[term].append((doc, weight))
+
+    def _weigh(self, counts: Counter) -> Dict[str, float]:
+        """Convert term counts to an L2-normalized TF-IDF vector"""
+        vector = {
+            term: (1.0 + math.log(count)) * self.idf[term]
+            for term, count in counts.items()
+            if term in self.idf
+        }
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        if norm == 0.0:
+            return {}
+        return {term: w / norm for term, w in vector.items()}
+
+    def query(self, texts: Sequence[str], exclude: Optional[Sequence[Optional[str]]] = None,
+              top_k: int = 1, min_score: float = 0.1) -> List[List[Tuple[str, float]]]:
+        """
+        Find the best-matching tasks for a batch of query texts
+
+        Args:
+            texts: Query texts
+            exclude: Optional task ID per query to leave out (e.g. the task itself)
+            top_k: Maximum number of matches per query
+            min_score: Minimum cosine similarity for a match
+
+        Returns:
+            One list of (task_id, score) per query, best match first
+        """
+        results = []
+
+        for i, text in enumerate(texts):
+            vector = self._weigh(Counter(tokenize(text)))
+            skip = self.index.get(exclude[i]) if exclude else None
+
+            scores: Dict[int, float] = defaultdict(float)
+            for term, weight in vector.items():
+                for doc, doc_weight in self.postings.get(term, ()):
+                    scores[doc] += weight * doc_weight
+
+            scores.pop(skip, None)
+            ranked = sorted(
+                (item for item in scores.items() if item[1] >= min_score),
+                key=lambda item: (-item[1], item[0])
+            )
+            results.append([(self.ids[doc], score) for doc, score in ranked[:top_k]])
+
+        return results
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Compact Task Store
+Columnar storage for parsed tasks with interned IDs and CSR adjacency.
+
+Every task ID (including IDs that are only referenced from Blocks/Related)
+is interned to an integer. Scalar fields live in per-column lists, effort in
+a float array, and the Blocks and Related edges in compressed sparse row
+arrays: the targets of task ``i`` are ``targets[offsets[i]:offsets[i + 1]]``.
+Task descriptions are kept as spans into the original TASKS.md text rather
+than as copied strings.
+
+Task objects are lightweight ``__slots__`` views created on demand, so a store
+with thousands of tasks holds a handful of containers instead of thousands
+of dataclass instances and lists.
+"""
+
+import math
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class Task:
+    """Read-only view of one task in a TaskStore"""
+
+    __slots__ = ('_store', 'index')
+
+    def __init__(self, store: 'TaskStore', index: int):
+        self._store = store
+        self.index = index
+
+    @property
+    def id(self) -> str:
+        return self._store.ids[self.index]
+
+    @property
+    def title(self) -> str:
+        return self._store.titles[self.index]
+
+    @property
+    def description(self) -> str:
+        store = self._store
+        return store.content[store.desc_start[self.index]:store.desc_end[self.index]]
+
+    @property
+    def owner(self) -> str:
+        return self._store.owners[self.index]
+
+    @property
+    def status(self) -> str:
+        return self._store.statuses[self.index]
+
+    @property
+    def blocks(self) -> List[str]:
+        store = self._store
+        return [store.ids[j] for j in store.block_targets(self.index)]
+
+    @property
+    def related(self) -> List[str]:
+        store = self._store
+        return [store.ids[j] for j in store.related_targets(self.index)]
+
+    @property
+    def source(self) -> str:
+        return self._store.sources[self.index]
+
+    @property
+    def context(self) -> str:
+        return self._store.contexts[self.index]
+
+    @property
+    def deadline(self) -> Optional[str]:
+        return self._store.deadlines[self.index]
+
+    @property
+    def effort(self) -> Optional[float]:
+        value = self._store.efforts[self.index]
+        return None if math.isnan(value) else value
+
+    def __repr__(self) -> str:
+        return f"Task(id={self.id!r}, title={self.title!r}, status={self.status!r})"
+
+
+class TaskStore:
+    """Columnar task container keyed by interned integer IDs"""
+
+    def __init__(self, content: str = ""):
+        """
+        Create an empty store
+
+        Args:
+            content: Source text that description spans point into
+        """
+        self.content = content
+
+        # ID table: the first ``len(self)`` entries are tasks, the rest are
+        # IDs only seen in Blocks/Related references (added by freeze())
+        self.ids: List[str] = []
+        self.id_index: Dict[str, int] = {}
+        self.task_count = 0
+        self.frozen = False
+
+        self.titles: List[str] = []
+        self.owners: List[str] = []
+        self.statuses: List[str] = []
+        self.sources: List[str] = []
+        self.contexts: List[str] = []
+        self.deadlines: List[Optional[str]] = []
+        self.efforts = array('d')
+        self.desc_start = array('i')
+        self.desc_end = array('i')
+
+        # CSR rows; targets hold reference strings until freeze() interns them
+        self.block_offsets = array('i', [0])
+        self.related_offsets = array('i', [0])
+        self._block_refs: List[str] = []
+        self._related_refs: List[str] = []
+        self.block_targets_flat = array('i')
+        self.related_targets_flat = array('i')
+
+    def add(self, task_id: str, title: str, owner: str, status: str,
+            blocks: List[str], related: List[str], source: str, context: str,
+            deadline: Optional[str] = None, effort: Optional[float] = None,
+            span: Tuple[int, int] = (0, 0)) -> Task:
+        """
+        Append a task to the store
+
+        Args:
+            task_id: Task ID (e.g. TASK-001)
+            title: Task title
+            owner: Task owner
+            status: Task status
+            blocks: IDs of tasks this task blocks
+            related: IDs of related tasks
+            source: Where the task originated
+            context: Additional context
+            deadline: Optional deadline
+            effort: Optional effort estimate in days
+            span: (start, end) of the task description within ``content``
+
+        Returns:
+            View of the added task
+
+        Raises:
+            ValueError: If the store has already been frozen
+        """
+        if self.frozen:
+            raise ValueError("Cannot add tasks to a frozen TaskStore")
+
+        # A repeated ID gets its own row but lookups resolve to the latest
+        i = self.task_count
+        task_id = sys.intern(task_id)
+        self.ids.append(task_id)
+        self.id_index[task_id] = i
+        self.task_count += 1
+
+        self.titles.append(title)
+        self.owners.append(sys.intern(owner))
+        self.statuses.append(sys.intern(status))
+        self.sources.append(source)
+        self.contexts.append(context)
+        self.deadlines.append(deadline)
+        self.efforts.append(math.nan if effort is None else effort)
+        self.desc_start.append(span[0])
+        self.desc_end.append(span[1])
+
+        # Rows are appended in task order, so offsets grow naturally
+        self._block_refs.extend(blocks)
+        self.block_offsets.append(len(self._block_refs))
+        self._related_refs.extend(related)
+        self.related_offsets.append(len(self._related_refs))
+
+        return Task(self, i)
+
+    def freeze(self) -> 'TaskStore':
+        """
+        Intern Blocks/Related references into integer CSR targets
+
+        Called automatically on first adjacency access. IDs that are
+        referenced but never defined are appended after the task rows.
+
+        Returns:
+            The store, for chaining
+        """
+        if self.frozen:
+            return self
+
+        for refs, targets in ((self._block_refs, self.block_targets_flat),
+                              (self._related_refs, self.related_targets_flat)):
+            for ref in refs:
+                i = self.id_index.get(ref)
+                if i is None:
+                    i = len(self.ids)
+                    ref = sys.intern(ref)
+                    self.ids.append(ref)
+                    self.id_index[ref] = i
+                targets.append(i)
+
+        self._block_refs = []
+        self._related_refs = []
+        self.frozen = True
+        return self
+
+    def block_targets(self, i: int) -> array:
+        """Return interned IDs of tasks blocked by task i"""
+        self.freeze()
+        return self.block_targets_flat[self.block_offsets[i]:self.block_offsets[i + 1]]
+
+    def related_targets(self, i: int) -> array:
+        """Return interned IDs of tasks related to task i"""
+        self.freeze()
+        return self.related_targets_flat[self.related_offsets[i]:self.related_offsets[i + 1]]
+
+    def is_task(self, i: int) -> bool:
+        """Whether interned ID i is a defined task (not just a reference)"""
+        return i < self.task_count
+
+    def get(self, task_id: str) -> Optional[Task]:
+        """Return view of a task by ID, or None if it is not defined"""
+        i = self.id_index.get(task_id)
+        if i is None or i >= self.task_count:
+            return None
+        return Task(self, i)
+
+    def __len__(self) -> int:
+        return self.task_count
+
+    def __iter__(self) -> Iterator[Task]:
+        for i in range(self.task_count):
+            yield Task(self, i)
+
+    def __contains__(self, task_id: object) -> bool:
+        i = self.id_index.get(task_id)
+        return i is not None and i < self.task_count
+
+    def __getitem__(self, task_id: str) -> Task:
+        task = self.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        return task
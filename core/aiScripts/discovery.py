@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Single-pass discovery of convertible files in raw/ trees
+
+Converters find their inputs with one os.scandir walk instead of a glob
+per extension. Each entry is dispatched through a format registry
+(suffix -> format name); bundle formats such as .textbundle are
+directories that are yielded whole rather than descended into. With
+recursion, nested export hierarchies (OneNote notebooks/sections, Apple
+Notes folders) are walked too.
+
+Results are yielded as they are found, with the mtime from the scandir
+entry, so callers can feed them straight into prescan or a recency queue
+without building intermediate lists or stat-ing each file again.
+
+Hidden entries (names starting with '.', e.g. staging and cache
+directories) are always skipped.
+
+Usage:
+    for item in discover(raw_dir, NOTES_FORMATS, recursive=True, exclude=['Archive/*']):
+        print(item.relative, item.format)
+"""
+
+import os
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional, Sequence
+
+# Format registries: lower-case suffix -> format name
+EMAIL_FORMATS: Dict[str, str] = {'.eml': 'eml'}
+NOTES_FORMATS: Dict[str, str] = {
+    '.txt': 'txt',
+    '.md': 'md',
+    '.docx': 'docx',
+    '.textbundle': 'textbundle',
+    '.html': 'html',
+}
+# Formats stored as a directory bundle rather than a single file
+BUNDLE_FORMATS = {'textbundle'}
+
+
+class Discovered(NamedTuple):
+    """A convertible input found under a raw/ directory"""
+    path: Path
+    relative: str  # POSIX path relative to the walked root
+    format: str
+    mtime: Optional[float]
+
+
+def format_for(name: str, formats: Dict[str, str]) -> Optional[str]:
+    """Registry format of a file name, or None if unsupported"""
+    return formats.get(os.path.splitext(name)[1].lower())
+
+
+def _matches(relative: str, name: str, patterns: Sequence[str]) -> bool:
+    """True if a pattern matches the relative path or the bare name"""
+    return any(fnmatchcase(relative, pattern) or fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def discover(root: Path, formats: Dict[str, str], recursive: bool = False,
+             include: Optional[Sequence[str]] = None,
+             exclude: Optional[Sequence[str]] = None) -> Iterator[Discovered]:
+    """
+    Walk a directory once and yield its convertible entries
+
+    Args:
+        root: Directory to walk (missing directories yield nothing)
+        formats: Format registry, e.g. NOTES_FORMATS
+        recursive: Descend into subdirectories (symlinked ones are not followed)
+        include: Glob patterns; if given, only matching inputs are yielded
+        exclude: Glob patterns for inputs and directories to skip; an
+                 excluded directory is not descended into
+
+    Patterns are matched against the path relative to root (e.g.
+    'Work/*.docx') and against the bare name (e.g. '*.html').
+
+    Yields:
+        Discovered entries, in directory order
+    """
+    include = list(include or [])
+    exclude = list(exclude or [])
+    stack = [(Path(root), '')]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+        with entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                relative = prefix + entry.name
+                if exclude and _matches(relative, entry.name, exclude):
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                fmt = format_for(entry.name, formats)
+                if is_dir and fmt not in BUNDLE_FORMATS:
+                    if recursive and not entry.is_symlink():
+                        stack.append((Path(entry.path), relative + '/'))
+                    continue
+                if fmt is None or (include and not _matches(relative, entry.name, include)):
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    mtime = None
+                yield Discovered(Path(entry.path), relative, fmt, mtime)
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Convert email attachments to Markdown for the AI corpus
+
+Attached DOCX/HTML/TXT/MD documents are converted with the notes
+converter's parsers, so their content appears in the email's Markdown
+instead of only a link to the saved file.
+
+DOCX and HTML conversion is CPU-bound Python, so it runs in a bounded
+process pool while the email body is converted. Results are cached by
+attachment content hash under email/attachments/.text-cache/, so a
+document attached to 40 replies is converted once, in this run or any
+later one.
+
+Waiting for a conversion is bounded by the per-file limits
+(LUMINA_FILE_TIMEOUT, LUMINA_FILE_MAX_RSS_MB). A document that runs past
+the time limit, or pushes a worker past the memory cap, is logged as
+failed and the pool's workers are terminated, so one pathological
+attachment cannot hang or exhaust the email run.
+
+Usage:
+    with AttachmentText(attachments_dir, ai_dir) as attachment_text:
+        future = attachment_text.submit(saved_path, payload, content_type)
+        ...
+        markdown = attachment_text.wait(future, saved_path.name)  # None if unsupported or failed
+"""
+
+import hashlib
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    from ..logger import get_logger
+    from ..checkDependencies import is_available
+    from ..mapped_io import read_text
+    from ..supervisor import file_limits, rss_bytes
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from logger import get_logger
+    from checkDependencies import is_available
+    from mapped_io import read_text
+    from supervisor import file_limits, rss_bytes
+
+logger = get_logger('email_converter')
+
+# Bump when conversion output changes to invalidate cached text
+CACHE_VERSION = 1
+CACHE_DIRNAME = '.text-cache'
+IMAGES_DIRNAME = 'inline-images'
+
+# Larger attachments are listed but not converted
+MAX_ATTACHMENT_BYTES = 25 * 1024 * 1024
+# Converted text beyond this is truncated in the email's Markdown
+MAX_TEXT_CHARS = 200_000
+
+_SUFFIX_FORMATS = {'.docx': 'docx', '.html': 'html', '.htm': 'html', '.txt': 'txt', '.md': 'md'}
+_TYPE_FORMATS = {
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'docx',
+    'text/html': 'html',
+    'text/plain': 'txt',
+    'text/markdown': 'md',
+}
+# Formats worth a worker process; the rest are decoded inline
+_POOLED_FORMATS = {'docx', 'html'}
+# How often a wait checks the time and memory limits
+POLL_INTERVAL = 0.1
+
+
+def attachment_format(filename: str, content_type: str) -> Optional[str]:
+    """Convertible format of an attachment ('docx', 'html', 'txt', 'md'), or None"""
+    return _SUFFIX_FORMATS.get(Path(filename).suffix.lower()) or _TYPE_FORMATS.get(content_type.lower())
+
+
+def _notes_converter():
+    """Import the notes converter (in the parent or a worker process)"""
+    notes_dir = str(Path(__file__).resolve().parent.parent / 'notesToMd')
+    if notes_dir not in sys.path:
+        sys.path.insert(0, notes_dir)
+    import notes_to_md_converter
+    return notes_to_md_converter
+
+
+def _convert_document(path: str, fmt: str, image_dir: str, link_base: str) -> str:
+    """Worker: convert one saved attachment to Markdown"""
+    notes = _notes_converter()
+    if fmt == 'docx':
+        return notes.parse_docx(Path(path))
+    return notes.parse_html(Path(path), Path(image_dir), Path(link_base))
+
+
+def _done(result: Optional[str]) -> Future:
+    future: Future = Future()
+    future.set_result(result)
+    return future
+
+
+class AttachmentText:
+    """Bounded, cached attachment-to-Markdown conversion"""
+
+    def __init__(self, attachments_dir: Path, ai_dir: Path, workers: Optional[int] = None, metrics=None,
+                 timeout: Optional[float] = None, max_rss_mb: Optional[int] = None):
+        """
+        Args:
+            attachments_dir: email/attachments/ (cache and extracted images live here)
+            ai_dir: Markdown output directory image links are relative to
+            workers: Process pool size (default: LUMINA_ATTACHMENT_WORKERS,
+                     else up to 4 by CPU count)
+            metrics: Optional RunMetrics; counts converted and cached attachments
+            timeout: Seconds wait() allows per document (default:
+                     LUMINA_FILE_TIMEOUT or 120; 0 or less waits indefinitely)
+            max_rss_mb: Memory cap per worker in MB while waiting (default:
+                        LUMINA_FILE_MAX_RSS_MB or 1024)
+        """
+        self.cache_dir = Path(attachments_dir) / CACHE_DIRNAME
+        self.image_dir = Path(attachments_dir) / IMAGES_DIRNAME
+        self.ai_dir = Path(ai_dir)
+        if workers is None:
+            try:
+                workers = int(os.environ.get('LUMINA_ATTACHMENT_WORKERS', 0))
+            except ValueError:
+                workers = 0
+        self.workers = max(1, workers or min(4, os.cpu_count() or 1))
+        self.metrics = metrics
+        default_timeout, default_max_rss = file_limits()
+        self.timeout = timeout if timeout is not None else default_timeout
+        self.max_rss = max_rss_mb * 1024 * 1024 if max_rss_mb is not None else default_max_rss
+        self.available = {'txt', 'md'}
+        if is_available('docx'):
+            self.available.add('docx')
+        if is_available('html2text'):
+            self.available.add('html')
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Set when a worker dies; the next submit starts a fresh pool
+        self._broken = False
+        # Same document submitted again before its first conversion finished
+        self._in_flight: Dict[str, Future] = {}
+
+    def __enter__(self) -> 'AttachmentText':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Wait for outstanding conversions and stop the workers"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _terminate(self) -> None:
+        """Kill the pool's workers without waiting; the next submit starts a new pool"""
+        pool, self._pool = self._pool, None
+        self._broken = False
+        if pool is None:
+            return
+        # The executor has no public way to stop a running task
+        for process in self._workers(pool):
+            process.kill()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _workers(pool: Optional[ProcessPoolExecutor]):
+        return list((getattr(pool, '_processes', None) or {}).values())
+
+    def _over_memory(self) -> Optional[int]:
+        """RSS in bytes of a worker over the memory cap, or None"""
+        for process in self._workers(self._pool):
+            rss = rss_bytes(process.pid) if process.pid else None
+            if rss is not None and rss > self.max_rss:
+                return rss
+        return None
+
+    def wait(self, future: Future, name: str) -> Optional[str]:
+        """
+        Wait for a conversion under the per-file time and memory limits
+
+        Args:
+            future: Future from submit()
+            name: Attachment name for the log
+
+        Returns:
+            Markdown, or None if the conversion failed or hit a limit (the
+            pool is then terminated, failing the other pending documents)
+        """
+        if self.timeout <= 0:
+            return future.result()
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                return future.result(timeout=POLL_INTERVAL)
+            except FutureTimeout:
+                pass
+            rss = self._over_memory()
+            if rss is not None:
+                reason = (f"exceeded the memory limit ({rss // (1024 * 1024)} MB > "
+                          f"{self.max_rss // (1024 * 1024)} MB)")
+            elif time.monotonic() > deadline:
+                reason = f"exceeded the {self.timeout:g}s time limit"
+            else:
+                continue
+            logger.warning(f"Could not convert attachment {name}: {reason}")
+            self._count('attachment_text_failed')
+            self._terminate()
+            return None
+
+    def _count(self, name: str) -> None:
+        if self.metrics is not None:
+            self.metrics.count(name)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._broken:
+            self._broken = False
+            self.close()
+        if self._pool is None:
+            # Spawned workers do not inherit the logger's queue thread
+            context = multiprocessing.get_context('spawn')
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        return self._pool
+
+    def submit(self, path: Path, payload: bytes, content_type: str) -> Optional[Future]:
+        """
+        Start converting a saved attachment
+
+        Args:
+            path: Saved attachment file
+            payload: Attachment bytes (hashed for the cache key)
+            content_type: MIME type from the email
+
+        Returns:
+            Future resolving to Markdown (None if conversion failed), or
+            None if the attachment is not a supported document
+        """
+        fmt = attachment_format(path.name, content_type)
+        if fmt is None or len(payload) > MAX_ATTACHMENT_BYTES:
+            return None
+        if fmt not in self.available:
+            logger.debug(f"Skipping {path.name}: no converter installed for .{fmt}")
+            return None
+
+        key = f"{hashlib.sha256(payload).hexdigest()}-{fmt}-v{CACHE_VERSION}"
+        cache_path = self.cache_dir / f"{key}.md"
+        if cache_path.exists():
+            self._count('attachment_text_cached')
+            return _done(cache_path.read_text(encoding='utf-8'))
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self._count('attachment_text_cached')
+            return pending
+
+        pool = None
+        if fmt in _POOLED_FORMATS:
+            try:
+                pool = self._get_pool()
+                future = pool.submit(
+                    _convert_document, str(path), fmt, str(self.image_dir), str(self.ai_dir)
+                )
+            except BrokenProcessPool as e:
+                self._broken = True
+                logger.warning(f"Could not convert attachment {path.name}: {e}")
+                return None
+        else:
+            future = _done(read_text(path)[0])
+
+        result: Future = Future()
+        self._in_flight[key] = result
+
+        def finished(done: Future) -> None:
+            self._in_flight.pop(key, None)
+            try:
+                text = done.result().strip()
+            except Exception as e:
+                # A pool terminated after a timeout has already been replaced
+                if isinstance(e, BrokenProcessPool) and self._pool is pool:
+                    self._broken = True
+                logger.warning(f"Could not convert attachment {path.name}: {e}")
+                result.set_result(None)
+                return
+            self._write_cache(cache_path, text)
+            self._count('attachment_text_converted')
+            result.set_result(text)
+
+        future.add_done_callback(finished)
+        return result
+
+    def _write_cache(self, cache_path: Path, text: str) -> None:
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+            tmp_path.write_text(text, encoding='utf-8')
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not cache attachment text {cache_path.name}: {e}")
+
+
+def format_attachment_text(attachments, attachment_text: Optional[AttachmentText] = None) -> str:
+    """
+    Markdown section with the converted content of each attachment
+
+    Waits for conversions still running, bounded by attachment_text's time
+    limit when given. Attachments without a 'text' future, or whose
+    conversion failed, timed out or was empty, are left out.
+    """
+    sections = []
+    for att in attachments:
+        future = att.get('text')
+        if future is None:
+            text = None
+        elif attachment_text is not None:
+            text = attachment_text.wait(future, att['original_name'])
+        else:
+            text = future.result()
+        if not text:
+            continue
+        if len(text) > MAX_TEXT_CHARS:
+            omitted = len(text) - MAX_TEXT_CHARS
+            text = text[:MAX_TEXT_CHARS] + f"\n\n*[Truncated: {omitted:,} more characters in the attachment]*"
+        sections.append(f"## Attachment: {att['original_name']}\n\n{text}\n")
+    if not sections:
+        return ""
+    return "\n---\n\n" + "\n".join(sections)
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Compact mode for converted email bodies
+
+Corporate mail converts to Markdown with a lot of text nobody needs to
+read twice: Outlook SafeLinks and Proofpoint URL Defense wrappers hundreds
+of characters long, the same signature under every message from a sender,
+and legal disclaimers pasted under every message from an organisation.
+
+Compaction:
+- unwraps SafeLinks / URL Defense links back to the original URL
+- normalizes zero-width characters and non-breaking spaces
+- strips signature and disclaimer blocks that follow a sign-off ("Best
+  regards," or a "--" delimiter) and were already seen in at least two
+  earlier messages, in this batch or earlier runs
+
+Only the blocks between the sign-off and any quoted reply are candidates,
+so repeated body text and quoted messages are never stripped. A message's
+blocks are learned once its conversion succeeds (learn()), so later
+messages in the same batch benefit straight away. If the message then
+fails to commit, discard() rolls that learning back, so a retried message
+is never compared against itself.
+
+Usage:
+    compactor = BoilerplateLearner(profile_path)
+    body = compactor.compact(body, sender='alice@example.com', message='a.eml')
+    compactor.learn('a.eml')        # converted and staged
+    compactor.confirm('a.eml')      # committed (or compactor.discard('a.eml'))
+    compactor.save()
+"""
+
+import hashlib
+import json
+import os
+import re
+from email.utils import parseaddr
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Only the last few paragraphs are candidates for signatures/disclaimers
+TAIL_BLOCKS = 6
+# Distinct earlier messages a block must appear in before it is stripped
+MIN_MESSAGES = 2
+# Shortest block treated as a sender's signature
+MIN_SIGNATURE_CHARS = 20
+# Shortest block treated as a disclaimer shared between senders
+MIN_DISCLAIMER_CHARS = 120
+# Learned blocks kept per sender / across senders
+MAX_SENDER_BLOCKS = 50
+MAX_SHARED_BLOCKS = 2000
+# Fingerprints of learned messages, so a re-sent message counts once
+MAX_LEARNED_MESSAGES = 5000
+
+# First lines that end the message proper; the signature follows
+_VALEDICTIONS = {
+    'best', 'best regards', 'best wishes', 'kind regards', 'warm regards', 'regards',
+    'many thanks', 'thanks', 'thank you', 'thanks again', 'cheers', 'sincerely',
+    'yours sincerely', 'yours truly', 'yours', 'all the best', 'talk soon',
+}
+# Start of a quoted or forwarded message
+_QUOTE_START = re.compile(r'(?:>|On .+ wrote:\s*$|-{2,}\s*Original Message\s*-{2,}|From:\s)', re.IGNORECASE)
+
+# Link wrappers end where Markdown/angle-bracket link syntax or whitespace does
+_URL_END = r'[^\s<>()\[\]"\']*'
+_SAFELINKS = re.compile(r'https?://[\w.-]+\.safelinks\.protection\.outlook\.com/' + _URL_END, re.IGNORECASE)
+_URLDEFENSE_V1_V2 = re.compile(r'https?://urldefense\.proofpoint\.com/v[12]/url\?' + _URL_END, re.IGNORECASE)
+_URLDEFENSE_V3 = re.compile(r'https?://urldefense\.com/v3/__(.+?)__;' + _URL_END, re.IGNORECASE)
+
+_ZERO_WIDTH = re.compile('[\u200b\u200c\u200d\u2060\ufeff\u00ad]')
+_NBSP = re.compile('[\u00a0\u2007\u202f]')
+_BLANK_LINES = re.compile(r'\n[ \t]*(?=\n)')
+_PARAGRAPHS = re.compile(r'\n{2,}')
+_SPACES = re.compile(r'\s+')
+
+
+def _query_url(link: str, decode=None) -> str:
+    """Original URL from a wrapper's url=/u= query parameter, else the link"""
+    query = parse_qs(urlsplit(link).query)
+    target = (query.get('url') or query.get('u') or [None])[0]
+    if not target:
+        return link
+    if decode:
+        target = decode(target)
+    return target if target.lower().startswith(('http://', 'https://', 'mailto:')) else link
+
+
+def _decode_urldefense_v2(target: str) -> str:
+    # v2 encodes '%' as '-' and '/' as '_' before percent-encoding
+    return unquote(target.replace('-', '%').replace('_', '/'))
+
+
+def unwrap_links(text: str) -> str:
+    """Replace SafeLinks and URL Defense wrappers with the URLs they wrap"""
+    if 'safelinks' in text:
+        text = _SAFELINKS.sub(lambda m: _query_url(m.group(0)), text)
+    if 'urldefense' in text:
+        text = _URLDEFENSE_V1_V2.sub(
+            lambda m: _query_url(m.group(0), _decode_urldefense_v2 if '/v2/' in m.group(0) else None),
+            text
+        )
+        # v3 keeps the URL readable; '*' marks characters moved to the
+        # encoded suffix, so those links are left wrapped
+        text = _URLDEFENSE_V3.sub(lambda m: m.group(0) if '*' in m.group(1) else m.group(1), text)
+    return text
+
+
+def normalize_whitespace(text: str) -> str:
+    """Drop zero-width characters, turn non-breaking spaces into spaces"""
+    text = _ZERO_WIDTH.sub('', text)
+    text = _NBSP.sub(' ', text)
+    # Lines left holding only spaces become blank
+    return _BLANK_LINES.sub('\n', text)
+
+
+def _block_key(block: str) -> str:
+    """Case and whitespace insensitive hash of a paragraph"""
+    normalized = _SPACES.sub(' ', block).strip().lower()
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+
+def _sender_key(sender: Optional[str]) -> str:
+    return parseaddr(sender or '')[1].lower()
+
+
+def _is_delimiter(block: str) -> bool:
+    return block.strip().split('\n', 1)[0].rstrip() == '--'
+
+
+def _is_sign_off(block: str) -> bool:
+    """True for a paragraph starting with a valediction or '--' line"""
+    line = block.strip().split('\n', 1)[0].strip().lower()
+    return line == '--' or line.rstrip(',.!') in _VALEDICTIONS or line.startswith('sent from my ')
+
+
+def signature_range(blocks: List[str]) -> range:
+    """
+    Indices of the paragraphs that may be signature or disclaimer
+
+    They follow the last sign-off near the end of the message proper,
+    which stops at the first quoted or forwarded message. Without a
+    sign-off the range is empty. The first paragraph is never included.
+    """
+    end = next((i for i in range(1, len(blocks)) if _QUOTE_START.match(blocks[i].lstrip())), len(blocks))
+    for i in range(end - 1, max(0, end - TAIL_BLOCKS) - 1, -1):
+        if _is_sign_off(blocks[i]):
+            # A '--' delimiter paragraph is itself part of the signature
+            return range(max(1, i if _is_delimiter(blocks[i]) else i + 1), end)
+    return range(0)
+
+
+# (sender key, message fingerprint, [(block key, disclaimer-sized)])
+Candidates = Tuple[str, str, List[Tuple[str, bool]]]
+
+
+def _trim(counts: Dict[str, int], limit: int) -> None:
+    """Keep the most frequently seen blocks"""
+    if len(counts) > limit:
+        for key in sorted(counts, key=counts.get)[:len(counts) - limit]:
+            del counts[key]
+
+
+def _decrement(counts: Dict[str, int], key: str) -> None:
+    """Undo one count of a block (it may have been trimmed meanwhile)"""
+    if counts.get(key, 0) > 1:
+        counts[key] -= 1
+    else:
+        counts.pop(key, None)
+
+
+class BoilerplateLearner:
+    """Learns repeated signature/disclaimer blocks and strips them"""
+
+    def __init__(self, profile_path: Optional[Path] = None):
+        """
+        Args:
+            profile_path: JSON file for blocks learned in earlier runs
+                          (None keeps them in memory for this batch only)
+        """
+        self.profile_path = Path(profile_path) if profile_path else None
+        self.senders: Dict[str, Dict[str, int]] = {}
+        self.shared: Dict[str, int] = {}
+        self.messages: List[str] = []
+        # Candidates of converted messages awaiting learn()/discard()
+        self.pending: Dict[str, Candidates] = {}
+        # Learned but not yet committed messages, for discard() to roll back
+        self.unconfirmed: Dict[str, Candidates] = {}
+        self.bytes_before = 0
+        self.bytes_after = 0
+        if self.profile_path and self.profile_path.exists():
+            try:
+                with open(self.profile_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                self.senders = data.get('senders', {})
+                self.shared = data.get('shared', {})
+                self.messages = data.get('messages', [])
+            except (OSError, ValueError):
+                # A damaged profile only costs relearning
+                self.senders, self.shared, self.messages = {}, {}, []
+        self._learned = set(self.messages)
+
+    def strip_boilerplate(self, body: str, sender: Optional[str] = None,
+                          message: Optional[str] = None) -> str:
+        """
+        Remove signature/disclaimer blocks seen in at least MIN_MESSAGES
+        earlier messages from this sender, or from anyone for long
+        (disclaimer-sized) blocks
+
+        Only blocks after a sign-off are considered (see signature_range).
+        They are learned when learn(message) is called, or straight away
+        (and for good) without a message name.
+
+        Args:
+            body: Email body
+            sender: From header (or address)
+            message: Name to learn this message's blocks under on learn()
+        """
+        blocks = _PARAGRAPHS.split(body)
+        sender_key = _sender_key(sender)
+        own = self.senders.get(sender_key, {})
+        candidates = []
+        dropped = set()
+        for i in signature_range(blocks):
+            size = len(blocks[i].strip())
+            if size < MIN_SIGNATURE_CHARS:
+                continue
+            key = _block_key(blocks[i])
+            disclaimer = size >= MIN_DISCLAIMER_CHARS
+            candidates.append((key, disclaimer))
+            if own.get(key, 0) >= MIN_MESSAGES or (disclaimer and self.shared.get(key, 0) >= MIN_MESSAGES):
+                dropped.add(i)
+
+        pending = (sender_key, _block_key(sender_key + '\n' + body), candidates)
+        if message is None:
+            self._learn(pending)
+        else:
+            self.pending[message] = pending
+        if not dropped:
+            return body
+        return '\n\n'.join(block for i, block in enumerate(blocks) if i not in dropped)
+
+    def learn(self, message: str) -> None:
+        """Learn the blocks of a converted message until confirm() or discard()"""
+        pending = self.pending.pop(message, None)
+        if pending is not None and self._learn(pending):
+            self.unconfirmed[message] = pending
+
+    def confirm(self, message: str) -> None:
+        """Keep what learn() added for a message whose conversion was committed"""
+        self.unconfirmed.pop(message, None)
+
+    def discard(self, message: str) -> None:
+        """Forget a failed message, rolling back anything learn() added for it"""
+        self.pending.pop(message, None)
+        learned = self.unconfirmed.pop(message, None)
+        if learned is None:
+            return
+        sender_key, fingerprint, candidates = learned
+        self._learned.discard(fingerprint)
+        if fingerprint in self.messages:
+            self.messages.remove(fingerprint)
+        own = self.senders.get(sender_key, {})
+        for key, disclaimer in set(candidates):
+            _decrement(own, key)
+            if disclaimer:
+                _decrement(self.shared, key)
+        if not own:
+            self.senders.pop(sender_key, None)
+
+    def _learn(self, pending: Candidates) -> bool:
+        """Count a message's blocks; False if it had none or was already learned"""
+        sender_key, fingerprint, candidates = pending
+        if not candidates or fingerprint in self._learned:
+            return False
+        self._learned.add(fingerprint)
+        self.messages.append(fingerprint)
+        if len(self.messages) > MAX_LEARNED_MESSAGES:
+            self._learned.discard(self.messages.pop(0))
+
+        own = self.senders.setdefault(sender_key, {})
+        for key, disclaimer in set(candidates):
+            own[key] = own.get(key, 0) + 1
+            if disclaimer:
+                self.shared[key] = self.shared.get(key, 0) + 1
+        _trim(own, MAX_SENDER_BLOCKS)
+        _trim(self.shared, MAX_SHARED_BLOCKS)
+        return True
+
+    def compact(self, body: str, sender: Optional[str] = None, message: Optional[str] = None) -> str:
+        """
+        Apply every compaction step to an email body
+
+        Args:
+            body: Markdown body
+            sender: From header (or address); signatures are learned per address
+            message: Message name; its blocks are learned on learn(message)
+                     (None learns them immediately)
+
+        Returns:
+            Compacted body; running size totals are kept in
+            bytes_before / bytes_after
+        """
+        self.bytes_before += len(body.encode('utf-8'))
+        body = normalize_whitespace(unwrap_links(body))
+        body = self.strip_boilerplate(body.strip(), sender, message)
+        self.bytes_after += len(body.encode('utf-8'))
+        return body
+
+    def save(self) -> None:
+        """Persist learned blocks to profile_path (atomic replace)"""
+        if not self.profile_path:
+            return
+        self.profile_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.profile_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'senders': self.senders, 'shared': self.shared, 'messages': self.messages}, f)
+        os.replace(tmp_path, self.profile_path)
+
+
+def format_size_stats(before: int, after: int) -> str:
+    """'12,345 -> 2,345 bytes (-81%)'"""
+    saved = 100 * (before - after) / before if before else 0
+    return f"{before:,} -> {after:,} bytes (-{saved:.0f}%)"
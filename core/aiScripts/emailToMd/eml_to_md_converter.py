@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 """
 Convert .eml files to Markdown format
+
+Usage:
+    python3 core/aiScripts/emailToMd/eml_to_md_converter.py
+    python3 core/aiScripts/emailToMd/eml_to_md_converter.py --since 2024-10-01 --from-domain acme.com
 """
 
-import email
+import argparse
 import base64
 import re
 import os
 from pathlib import Path
 import sys
+import time
 from email.header import decode_header
+from email.parser import BytesFeedParser, BytesHeaderParser
 
 # Import logger first
 try:
@@ -21,14 +27,65 @@ except ImportError:
     from logger import get_logger
     logger = get_logger('email_converter')
 
-# Check dependencies
 try:
-    import html2text
+    from ..state_manager import record_processing
+    from ..metrics import get_metrics
+    from ..profiling import run_main
+    from ..checkDependencies import is_available, lazy_import
+    from ..data_uris import externalize_data_uris
+    from ..mapped_io import map_file, header_end, iter_chunks
+    from ..staged_commit import StagedCommit
+    from ..scheduling import ProgressCheckpoint
+    from ..run_journal import RunJournal, RUN_JOURNAL_NAME, STARTED, CONVERTED, COMMITTED, FAILED
+    from ..supervisor import ResourceLimitExceeded, get_supervisor, quarantine
+    from ..discovery import EMAIL_FORMATS, discover
+    from .compact_body import BoilerplateLearner, format_size_stats
+    from .attachment_text import AttachmentText, format_attachment_text
+    from .prescan import build_filter, prescan
 except ImportError:
+    from state_manager import record_processing
+    from metrics import get_metrics
+    from profiling import run_main
+    from checkDependencies import is_available, lazy_import
+    from data_uris import externalize_data_uris
+    from mapped_io import map_file, header_end, iter_chunks
+    from staged_commit import StagedCommit
+    from scheduling import ProgressCheckpoint
+    from run_journal import RunJournal, RUN_JOURNAL_NAME, STARTED, CONVERTED, COMMITTED, FAILED
+    from supervisor import ResourceLimitExceeded, get_supervisor, quarantine
+    from discovery import EMAIL_FORMATS, discover
+    sys.path.insert(0, str(Path(__file__).parent))
+    from compact_body import BoilerplateLearner, format_size_stats
+    from attachment_text import AttachmentText, format_attachment_text
+    from prescan import build_filter, prescan
+
+metrics = get_metrics('email_converter')
+
+# Check dependencies (html2text itself is imported on the first HTML part)
+if not is_available('html2text'):
     logger.error("Missing required dependency 'html2text'")
     logger.error("Install dependencies with: pip install -r core/aiScripts/requirements.txt")
     sys.exit(1)
 
+_NON_SPACE = re.compile(rb'\S')
+
+# Embedded HTML images are written to email/attachments/inline-images/
+IMAGES_DIRNAME = 'inline-images'
+
+# Signatures/disclaimers learned in compact mode, kept under email/
+COMPACT_PROFILE_NAME = '.compact-profile.json'
+
+def _env_flag(name):
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+def compact_mode_enabled():
+    """Compact mode is opt-in via LUMINA_EMAIL_COMPACT=1"""
+    return _env_flag('LUMINA_EMAIL_COMPACT')
+
+def attachment_text_enabled():
+    """Attachment-to-text conversion is opt-in via LUMINA_EMAIL_ATTACHMENT_TEXT=1"""
+    return _env_flag('LUMINA_EMAIL_ATTACHMENT_TEXT')
+
 def decode_email_header(header):
     """Decode email headers that might be encoded"""
     if header is None:
@@ -37,7 +94,8 @@ def decode_email_header(header):
     decoded_string = ''
     for part, encoding in decoded_parts:
         if isinstance(part, bytes):
-            if encoding:
+            # 'unknown-8bit': raw non-ASCII bytes in a header parsed from bytes
+            if encoding and encoding != 'unknown-8bit':
                 decoded_string += part.decode(encoding)
             else:
                 decoded_string += part.decode('utf-8', errors='ignore')
@@ -45,8 +103,23 @@ def decode_email_header(header):
             decoded_string += part
     return decoded_string
 
-def extract_email_content(msg):
-    """Extract text content from email message"""
+def html_to_markdown(body_html):
+    """Convert an HTML body to Markdown with html2text"""
+    h = lazy_import('html2text').HTML2Text()
+    h.ignore_links = False
+    h.body_width = 0  # Don't wrap lines
+    return h.handle(body_html)
+
+def extract_email_content(msg, image_dir=None, link_base=None):
+    """Extract text content from email message
+
+    Embedded data: URI images in an HTML body are written to image_dir and
+    linked relative to link_base (the Markdown output directory) before
+    conversion. Without image_dir they are left inline.
+
+    HTML conversion runs in a supervised worker; a body that exceeds the
+    time or memory limit raises ResourceLimitExceeded.
+    """
     body_text = ''
     body_html = ''
 
@@ -88,18 +161,36 @@ def extract_email_content(msg):
 
     # Convert HTML to text if we have HTML but no plain text
     if body_html and not body_text:
-        h = html2text.HTML2Text()
-        h.ignore_links = False
-        h.body_width = 0  # Don't wrap lines
-        body_text = h.handle(body_html)
+        if image_dir is not None:
+            with metrics.stage('image_externalize'):
+                body_html, images = externalize_data_uris(body_html, image_dir, link_base, metrics=metrics)
+            if images:
+                logger.debug(f"Externalized {len(images)} embedded image(s) to {image_dir}")
+        with metrics.stage('html_conversion'):
+            body_text = get_supervisor().call(html_to_markdown, body_html)
 
     return body_text
 
-def clean_email_body(body_text):
-    """Clean up the email body text"""
+def clean_email_body(body_text, compactor=None, sender=None, message=None):
+    """Clean up the email body text
+
+    With a compactor (compact mode), SafeLinks/URL Defense wrappers are
+    unwrapped, zero-width and non-breaking spaces normalized, and
+    signatures/disclaimers already seen in the batch stripped.
+
+    Args:
+        body_text: Markdown body
+        compactor: Optional BoilerplateLearner shared across the batch
+        sender: From header, for per-sender signature learning
+        message: Message name; its signatures are learned when the caller
+                 calls compactor.learn(message) after a successful conversion
+    """
     if not body_text:
         return ""
 
+    if compactor is not None:
+        body_text = compactor.compact(body_text, sender, message)
+
     # Remove excessive newlines
     body_text = re.sub(r'\n{3,}', '\n\n', body_text)
 
@@ -126,15 +217,20 @@ def sanitize_filename(filename):
 
     return filename if filename else "unnamed_attachment"
 
-def extract_attachments(msg, attachments_dir, email_name):
+def extract_attachments(msg, attachments_dir, email_name, attachment_text=None):
     """Extract attachments from email and save to disk
 
+    With attachment_text (an AttachmentText), supported documents are
+    submitted for conversion to Markdown as they are saved.
+
     Returns list of attachment metadata dicts with keys:
     - original_name: Original filename from email
     - saved_name: Sanitized filename saved to disk
     - saved_path: Relative path to attachment
     - size: Size in bytes
     - content_type: MIME type
+    - text: Future for the converted Markdown (only with attachment_text,
+      None for unsupported attachments)
     """
     attachments = []
 
@@ -166,33 +262,47 @@ def extract_attachments(msg, attachments_dir, email_name):
                     # Save to disk
                     attachment_path = email_attachments_dir / safe_filename
 
-                    # Handle duplicate filenames
+                    # Handle duplicate filenames; an identical file was
+                    # written by an interrupted attempt and is reused
                     counter = 1
-                    while attachment_path.exists():
+                    while attachment_path.exists() and not _same_content(attachment_path, payload):
                         name, ext = os.path.splitext(safe_filename)
                         safe_filename = f"{name}_{counter}{ext}"
                         attachment_path = email_attachments_dir / safe_filename
                         counter += 1
 
-                    with open(attachment_path, 'wb') as f:
-                        f.write(payload)
+                    if not attachment_path.exists():
+                        with metrics.stage('attachment_write'), open(attachment_path, 'wb') as f:
+                            f.write(payload)
+                    metrics.count('attachments')
+                    metrics.count('attachment_bytes', len(payload))
 
                     # Store metadata
-                    attachments.append({
+                    metadata = {
                         'original_name': filename,
                         'saved_name': safe_filename,
                         'saved_path': f"email/attachments/{email_name}/{safe_filename}",
                         'size': len(payload),
                         'content_type': part.get_content_type()
-                    })
+                    }
+                    if attachment_text is not None:
+                        metadata['text'] = attachment_text.submit(attachment_path, payload, part.get_content_type())
+                    attachments.append(metadata)
 
-                    print(f"  Extracted attachment: {filename} ({len(payload)} bytes)")
+                    logger.info(f"  Extracted attachment: {filename} ({len(payload)} bytes)")
 
             except Exception as e:
-                print(f"  Warning: Could not extract attachment {filename}: {str(e)}")
+                logger.warning(f"  Could not extract attachment {filename}: {str(e)}")
 
     return attachments
 
+def _same_content(path, payload):
+    """True if the file at path holds exactly payload"""
+    try:
+        return path.stat().st_size == len(payload) and path.read_bytes() == payload
+    except OSError:
+        return False
+
 def format_attachment_section(attachments):
     """Format attachments metadata for Markdown output"""
     if not attachments:
@@ -222,23 +332,28 @@ def format_attachment_section(attachments):
 def validate_email_file(eml_file_path):
     """Validate that email file is parseable before processing
     
+    Only the header block is parsed; the body is checked for content in
+    place over the mapped file.
+
     Returns: (valid, error_message)
     - valid: True if email is parseable, False otherwise
     - error_message: None if valid, error description if invalid
     """
     try:
-        with open(eml_file_path, 'rb') as f:
-            msg = email.message_from_binary_file(f)
+        with map_file(eml_file_path) as buffer:
+            body_start = header_end(buffer)
+            header_block = buffer[:body_start] if body_start != -1 else buffer[:]
+            headers = BytesHeaderParser().parsebytes(header_block)
             
             # Check for required headers
-            if not msg.get('Subject'):
+            if not headers.get('Subject'):
                 return False, "Email missing Subject header"
             
-            if not msg.get('From'):
+            if not headers.get('From'):
                 return False, "Email missing From header"
             
             # Validate file is not empty
-            if not msg.get_payload():
+            if body_start == -1 or not _NON_SPACE.search(buffer, body_start):
                 return False, "Email has no content"
             
         return True, None
@@ -247,23 +362,39 @@ def validate_email_file(eml_file_path):
         return False, f"Failed to parse email: {str(e)}"
 
 
-def convert_eml_to_md(eml_file_path, output_dir, attachments_dir=None):
+def parse_email_file(eml_file_path):
+    """Parse an .eml file from its bytes, feeding the mapped file in chunks"""
+    parser = BytesFeedParser()
+    with map_file(eml_file_path) as buffer:
+        for chunk in iter_chunks(buffer):
+            parser.feed(chunk)
+    return parser.close()
+
+
+def convert_eml_to_md(eml_file_path, output_dir, attachments_dir=None, output_path=None, compactor=None,
+                      attachment_text=None):
     """Convert a single .eml file to Markdown
     
+    The Markdown is written to output_dir/<name>.md, or to output_path if
+    given (e.g. a staging path). With a compactor the body is compacted and
+    the Markdown ends with a comment giving its size before and after. With
+    attachment_text, the content of supported attachments is appended.
+    
     Returns: (success, md_file_path, error_message)
     - success: True if conversion succeeded, False otherwise
     - md_file_path: Path to created Markdown file if successful, None otherwise
     - error_message: None if successful, error description if failed
+
+    Raises:
+        ResourceLimitExceeded: If the body exceeded the time or memory limit
+        (after rolling back), so the caller can quarantine the file
     """
     md_file_path = None
     
     try:
-        # Read the .eml file
-        with open(eml_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            raw_email = f.read()
-
-        # Parse the email
-        msg = email.message_from_string(raw_email)
+        with metrics.stage('parse'):
+            # Parse as bytes so each part is decoded with its own charset
+            msg = parse_email_file(eml_file_path)
 
         # Extract headers
         from_addr = decode_email_header(msg.get('From'))
@@ -272,15 +403,25 @@ def convert_eml_to_md(eml_file_path, output_dir, attachments_dir=None):
         subject = decode_email_header(msg.get('Subject'))
         date = decode_email_header(msg.get('Date'))
 
-        # Extract body
-        body_text = extract_email_content(msg)
-        body_text = clean_email_body(body_text)
-
-        # Extract attachments if directory provided
+        # Extract attachments first so document conversion runs in the
+        # background while the body is converted
         attachments = []
         if attachments_dir:
             eml_filename = Path(eml_file_path).stem
-            attachments = extract_attachments(msg, attachments_dir, eml_filename)
+            attachments = extract_attachments(msg, attachments_dir, eml_filename, attachment_text)
+
+        # Extract body (embedded images go next to the attachments)
+        image_dir = Path(attachments_dir) / IMAGES_DIRNAME if attachments_dir else None
+        body_text = extract_email_content(msg, image_dir, Path(output_dir))
+        if compactor is not None:
+            bytes_before = len(body_text.encode('utf-8'))
+            with metrics.stage('compact'):
+                body_text = clean_email_body(body_text, compactor, from_addr, Path(eml_file_path).name)
+            bytes_after = len(body_text.encode('utf-8'))
+            metrics.count('body_bytes_before', bytes_before)
+            metrics.count('body_bytes_after', bytes_after)
+        else:
+            body_text = clean_email_body(body_text)
 
         # Create Markdown content
         md_content = f"""# {subject}
@@ -300,14 +441,23 @@ def convert_eml_to_md(eml_file_path, output_dir, attachments_dir=None):
         # Add attachments section if any
         if attachments:
             md_content += format_attachment_section(attachments)
+            if attachment_text is not None:
+                with metrics.stage('attachment_text'):
+                    md_content += format_attachment_text(attachments, attachment_text)
+
+        if compactor is not None:
+            md_content += f"\n\n<!-- Compact body: {format_size_stats(bytes_before, bytes_after)} -->\n"
 
         # Create output filename
-        eml_filename = Path(eml_file_path).stem
-        md_filename = f"{eml_filename}.md"
-        md_file_path = os.path.join(output_dir, md_filename)
+        if output_path:
+            md_file_path = str(output_path)
+        else:
+            eml_filename = Path(eml_file_path).stem
+            md_filename = f"{eml_filename}.md"
+            md_file_path = os.path.join(output_dir, md_filename)
 
         # Write Markdown file
-        with open(md_file_path, 'w', encoding='utf-8') as f:
+        with metrics.stage('markdown_write'), open(md_file_path, 'w', encoding='utf-8') as f:
             f.write(md_content)
 
         return True, md_file_path, None
@@ -320,12 +470,180 @@ def convert_eml_to_md(eml_file_path, output_dir, attachments_dir=None):
                 logger.debug(f"Rolled back partial file: {md_file_path}")
             except Exception as cleanup_error:
                 logger.warning(f"Could not clean up partial file {md_file_path}: {str(cleanup_error)}")
-        
+        if isinstance(e, ResourceLimitExceeded):
+            raise
+
         logger.error(f"Conversion failed: {str(e)}", exc_info=True)
         return False, None, str(e)
 
-def main():
+def process_email_file(eml_file, ai_dir, processed_dir, attachments_dir, commit=None, on_done=None,
+                       compactor=None, attachment_text=None):
+    """
+    Validate, convert and move a single .eml file
+
+    The original is only moved to processed/ once the Markdown file has been
+    written, so failed conversions stay in raw/ for another attempt. A file
+    that exceeds the time or memory limit is moved to email/failed/ instead.
+
+    Args:
+        eml_file: Path to the .eml file in raw/
+        ai_dir: Output directory for Markdown
+        processed_dir: Destination for the original after conversion
+        attachments_dir: Base directory for extracted attachments
+        commit: Optional StagedCommit; the Markdown is staged and the output
+                rename and original move happen in its next batch
+        on_done: With commit, called as on_done(success, reason) once the
+                 file's batch has been committed
+        compactor: Optional BoilerplateLearner for compact mode; it learns
+                   the message's signature once converted, and forgets it
+                   again if the file fails to commit
+        attachment_text: Optional AttachmentText to convert attachments to Markdown
+
+    Returns:
+        tuple: (success, reason) where reason describes the failed step.
+        With commit, success means the file was converted and staged.
+    """
+    logger.info(f"Processing: {eml_file.name}")
+    started = time.perf_counter()
+
+    def settle(ok):
+        # Failed attempts must not teach the compactor their own signature
+        if compactor is not None:
+            if ok:
+                compactor.confirm(eml_file.name)
+            else:
+                compactor.discard(eml_file.name)
+
+    # Step 1: Validate email is parseable
+    logger.info("  [1/3] Validating...")
+    with metrics.stage('validate'):
+        valid, error_msg = validate_email_file(str(eml_file))
+    if not valid:
+        logger.error(f"  ✗ Validation failed: {error_msg}")
+        record_processing('email', eml_file, 'failed', time.perf_counter() - started, f"Validation: {error_msg}")
+        return False, f"Validation: {error_msg}"
+    logger.info("  ✓ Valid email")
+
+    # Step 2: Convert to Markdown
+    logger.info("  [2/3] Converting to Markdown...")
+    md_name = f"{eml_file.stem}.md"
+    staged_path = commit.stage_path(md_name) if commit is not None else None
+    try:
+        success, md_file_path, error_msg = convert_eml_to_md(
+            str(eml_file), str(ai_dir), attachments_dir, staged_path, compactor, attachment_text
+        )
+    except ResourceLimitExceeded as e:
+        settle(False)
+        logger.error(f"  ✗ Conversion failed: {e}")
+        quarantine(eml_file, processed_dir.parent / "failed", str(e))
+        record_processing('email', eml_file, 'failed', time.perf_counter() - started, f"Quarantined: {e}")
+        return False, f"Quarantined: {e}"
+    if not success:
+        settle(False)
+        logger.error(f"  ✗ Conversion failed: {error_msg}")
+        record_processing('email', eml_file, 'failed', time.perf_counter() - started, f"Conversion: {error_msg}")
+        return False, f"Conversion: {error_msg}"
+    logger.info(f"  ✓ Created {md_name}")
+    # Later messages in this batch learn from it; undone if it fails to commit
+    if compactor is not None:
+        compactor.learn(eml_file.name)
+
+    processed_path = processed_dir / eml_file.name
+
+    if commit is not None:
+        # Step 3: Output rename and original move are batched
+        logger.info("  [3/3] Staged for commit")
+        elapsed = time.perf_counter() - started
+
+        def committed(ok, error):
+            settle(ok)
+            if ok:
+                metrics.file_done(size=processed_path.stat().st_size)
+                record_processing('email', processed_path, 'success', elapsed)
+                reason = None
+            else:
+                reason = f"Commit: {error}"
+                record_processing('email', eml_file, 'failed', elapsed, reason)
+            if on_done:
+                on_done(ok, reason)
+
+        commit.add(staged_path, ai_dir / md_name, eml_file, processed_path, on_done=committed)
+        return True, None
+
+    # Step 3: Only now move original (transaction complete)
+    logger.info("  [3/3] Moving original to processed...")
+    try:
+        with metrics.stage('file_move'):
+            eml_file.rename(processed_path)
+    except Exception as e:
+        settle(False)
+        logger.error(f"  ✗ Error moving file: {str(e)}")
+        # Note: Markdown was created successfully, so this is not a complete failure
+        # But we'll still track it
+        record_processing('email', eml_file, 'failed', time.perf_counter() - started, f"Move operation: {str(e)}")
+        return False, f"Move operation: {str(e)} (Markdown created successfully)"
+
+    logger.info("  ✓ Moved to processed")
+    settle(True)
+    metrics.file_done(size=processed_path.stat().st_size)
+    record_processing('email', processed_path, 'success', time.perf_counter() - started)
+    return True, None
+
+def reconcile_interrupted(journal, ai_dir, processed_dir):
+    """
+    Settle files an interrupted attempt left mid-way
+
+    StagedCommit.recover() has already completed journaled commits and
+    discarded uncommitted outputs, and attachment extraction reuses
+    identical files, so a file whose original is still in raw/ is simply
+    converted again. Files whose commit did complete are recorded as such.
+    """
+    for name in journal.interrupted:
+        if (processed_dir / name).exists() and (ai_dir / f"{Path(name).stem}.md").exists():
+            journal.record(name, COMMITTED)
+            logger.info(f"  ✓ {name} was committed before the interruption")
+        else:
+            logger.info(f"  ↻ {name} was interrupted; converting again")
+
+def parse_args(argv=None):
+    """Command-line options: header filters for selective ingestion"""
+    parser = argparse.ArgumentParser(
+        description='Convert .eml files from email/raw/ to Markdown in email/ai/',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Only the header block of each message is read to apply filters; messages
+that are filtered out stay in email/raw/ untouched.
+
+Examples:
+  # Last quarter only
+  python3 core/aiScripts/emailToMd/eml_to_md_converter.py --since 2024-10-01 --until 2024-12-31
+
+  # One customer's domain (subdomains included), invoices only
+  python3 core/aiScripts/emailToMd/eml_to_md_converter.py --from-domain acme.com --subject-regex 'invoice'
+        """
+    )
+    parser.add_argument('--since', metavar='DATE', help='Only messages dated on/after DATE (YYYY-MM-DD or ISO datetime)')
+    parser.add_argument('--until', metavar='DATE', help='Only messages dated on/before DATE (inclusive)')
+    parser.add_argument('--from-domain', action='append', metavar='DOMAIN', dest='from_domains',
+                        help='Only senders in DOMAIN (repeatable or comma-separated)')
+    parser.add_argument('--subject-regex', metavar='REGEX', help='Only subjects matching REGEX (case-insensitive)')
+    parser.add_argument('--oldest-first', action='store_true',
+                        help='Convert oldest messages first (default: newest first)')
+    parser.add_argument('--include', action='append', metavar='PATTERN',
+                        help="Only files whose name matches PATTERN, e.g. 'inbox-*' (repeatable)")
+    parser.add_argument('--exclude', action='append', metavar='PATTERN',
+                        help='Skip files whose name matches PATTERN (repeatable)')
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """Main function to convert all .eml files from email/raw to email/ai"""
+    args = parse_args(argv)
+    try:
+        header_filter = build_filter(args.since, args.until, args.from_domains, args.subject_regex)
+    except ValueError as e:
+        logger.error(str(e))
+        return 2
+
     # Get the script directory and project root
     script_dir = Path(__file__).parent.resolve()
     # Script lives in core/aiScripts/emailToMd/, so go up 3 levels to project root
@@ -348,59 +666,124 @@ def main():
     logger.debug(f"  Processed: {processed_dir}")
     logger.debug(f"  Attachments: {attachments_dir}")
 
-    # Find all .eml files in raw directory
-    eml_files = list(raw_dir.glob("*.eml"))
-
-    if not eml_files:
-        logger.info(f"No .eml files found in {raw_dir}")
-        return
-
-    logger.info(f"Found {len(eml_files)} .eml file(s) to convert")
-
-    # Track results for summary report
-    successful = []
-    failed = []
-    
-    # Convert each file with transaction-safe operations
-    for eml_file in eml_files:
-        logger.info(f"Processing: {eml_file.name}")
-        
-        # Step 1: Validate email is parseable
-        logger.info("  [1/3] Validating...")
-        valid, error_msg = validate_email_file(str(eml_file))
-        if not valid:
-            logger.error(f"  ✗ Validation failed: {error_msg}")
-            failed.append((eml_file.name, f"Validation: {error_msg}"))
-            continue
-        logger.info("  ✓ Valid email")
-        
-        # Step 2: Convert to Markdown
-        logger.info("  [2/3] Converting to Markdown...")
-        success, md_file_path, error_msg = convert_eml_to_md(str(eml_file), str(ai_dir), attachments_dir)
-        if not success:
-            logger.error(f"  ✗ Conversion failed: {error_msg}")
-            failed.append((eml_file.name, f"Conversion: {error_msg}"))
-            continue
-        logger.info(f"  ✓ Created {Path(md_file_path).name}")
-        
-        # Step 3: Only now move original (transaction complete)
-        logger.info("  [3/3] Moving original to processed...")
-        processed_path = processed_dir / eml_file.name
+    # Finish a commit batch interrupted by a crash before looking at raw/
+    commit = StagedCommit(ai_dir, metrics=metrics)
+    commit.recover()
+    # recover() takes the output lock; it is held until the batches are committed
+    try:
+        # The run journal lets an interrupted run resume where it stopped
+        journal = RunJournal(project_root / "email" / RUN_JOURNAL_NAME)
+        resumed = journal.open(vars(args))
+        if resumed:
+            reconcile_interrupted(journal, ai_dir, processed_dir)
+
+        # One scandir pass over raw/ streams .eml files into the pre-scan;
+        # files that already failed in this run are not retried until a fresh run
+        retry_later = []
+
+        def candidates():
+            for item in discover(raw_dir, EMAIL_FORMATS, include=args.include, exclude=args.exclude):
+                if journal.stage(item.path.name) == FAILED:
+                    retry_later.append(item.path)
+                else:
+                    yield item.path
+
+        metrics.reset()
+
+        # Header-only pre-scan: filter and order by date before full parsing.
+        # Newest messages are converted first so recent material lands first.
+        newest_first = not args.oldest_first
+        with metrics.stage('prescan'):
+            selected, skipped = prescan(candidates(), header_filter, metrics=metrics, newest_first=newest_first)
+        if retry_later:
+            logger.info(f"Skipping {len(retry_later)} file(s) that already failed in this run")
+
+        if not selected and not skipped and not resumed:
+            logger.info(f"No .eml files found in {raw_dir}")
+            journal.close()
+            return
+
+        eml_files = [headers.path for headers in selected]
+        queue = [(headers.path, headers.date.timestamp() if headers.date else None) for headers in selected]
+        if header_filter.active:
+            logger.info(f"Filters matched {len(eml_files)} of {len(eml_files) + skipped} .eml file(s)")
+            if not eml_files and not resumed:
+                journal.close()
+                return
+
+        logger.info(f"Found {len(eml_files)} .eml file(s) to convert")
+
+        # Track results for summary report (cumulative across resumes)
+        successful = [name for name, _ in journal.finished(COMMITTED)]
+        failed = journal.finished(FAILED)
+
+        # Checkpoints every N files tell downstream prompts how far back
+        # the converted corpus is complete
+        progress = ProgressCheckpoint(ai_dir, queue, newest_first=newest_first)
+
+        def track(position, name):
+            def done(ok, reason):
+                if ok:
+                    successful.append(name)
+                    journal.record(name, COMMITTED)
+                else:
+                    failed.append((name, reason))
+                    journal.record(name, FAILED, reason)
+                progress.record(position, ok)
+            return done
+
+        # Compact mode learns signatures/disclaimers across the batch and runs
+        compactor = None
+        if compact_mode_enabled():
+            compactor = BoilerplateLearner(project_root / "email" / COMPACT_PROFILE_NAME)
+            logger.info("Compact mode: unwrapping links, stripping repeated signatures/disclaimers")
+
+        # Attachment documents are converted in a worker pool, cached by hash
+        attachment_text = None
+        if attachment_text_enabled():
+            attachment_text = AttachmentText(attachments_dir, ai_dir, metrics=metrics)
+            logger.info(f"Converting attachments to Markdown ({attachment_text.workers} worker(s))")
+
+        # Convert each file; outputs are staged and committed in batches
+        completed = False
         try:
-            eml_file.rename(processed_path)
-            logger.info("  ✓ Moved to processed")
-            successful.append(eml_file.name)
-        except Exception as e:
-            logger.error(f"  ✗ Error moving file: {str(e)}")
-            # Note: Markdown was created successfully, so this is not a complete failure
-            # But we'll still track it
-            failed.append((eml_file.name, f"Move operation: {str(e)} (Markdown created successfully)"))
+            with commit:
+                for position, eml_file in enumerate(eml_files):
+                    journal.record(eml_file.name, STARTED)
+                    success, reason = process_email_file(
+                        eml_file, ai_dir, processed_dir, attachments_dir,
+                        commit=commit, on_done=track(position, eml_file.name), compactor=compactor,
+                        attachment_text=attachment_text
+                    )
+                    if success:
+                        journal.record(eml_file.name, CONVERTED)
+                    else:
+                        failed.append((eml_file.name, reason))
+                        journal.record(eml_file.name, FAILED, reason)
+                        progress.record(position, False)
+            completed = True
+        finally:
+            if attachment_text is not None:
+                attachment_text.close()
+            if compactor is not None:
+                compactor.save()
+            # An interrupted run keeps its journal so the next run resumes it
+            journal.close(complete=completed)
+    finally:
+        # Early returns (nothing to convert) must not keep the lock
+        commit.unlock()
+
+    progress.finish()
 
     # Print summary report
     logger.info("\n" + "="*60)
     logger.info("CONVERSION SUMMARY")
     logger.info("="*60)
-    logger.info(f"Total files: {len(eml_files)}")
+    if resumed:
+        logger.info(f"Resumed run started {journal.started_at}")
+    logger.info(f"Total files: {len(successful) + len(failed)}")
+    if skipped:
+        logger.info(f"Filtered out (left in raw/): {skipped}")
     logger.info(f"Successful: {len(successful)}")
     logger.info(f"Failed: {len(failed)}")
     
@@ -415,8 +798,15 @@ def main():
             logger.warning(f"  - {filename}")
             logger.warning(f"    Reason: {reason}")
         logger.warning(f"\nNote: Original .eml files for failed conversions remain in {raw_dir}")
+        if any(reason and reason.startswith("Quarantined") for _, reason in failed):
+            logger.warning(f"      except quarantined files, moved to {raw_dir.parent / 'failed'}")
+
+    if compactor is not None:
+        logger.info(f"\nCompact bodies: {format_size_stats(compactor.bytes_before, compactor.bytes_after)}")
     
+    metrics.log_summary(logger)
+    logger.info(f"Metrics: {metrics.write()}")
     logger.info("="*60)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run_main(main, 'email_converter'))
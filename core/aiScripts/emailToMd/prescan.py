@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Header-only pre-scan of raw .eml files
+
+Before any message is converted, only its header block is read (a few KB)
+and parsed with a headers-only parser. Messages can then be selected by
+date range, sender domain or subject, and ordered by date (newest first
+for recency-first conversion), without parsing bodies or attachments of
+messages that are filtered out.
+
+Usage:
+    header_filter = HeaderFilter(since=parse_date_arg('2024-10-01'), from_domains=['acme.com'])
+    selected, skipped = prescan((item.path for item in discover(raw_dir, EMAIL_FORMATS)), header_filter)
+"""
+
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, time as dt_time, timezone
+from email.header import decode_header, make_header
+from email.parser import BytesHeaderParser
+from email.utils import getaddresses, parsedate_to_datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+try:
+    from ..mapped_io import read_header_block
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from mapped_io import read_header_block
+
+
+@dataclass
+class EmailHeaders:
+    """Headers needed to filter and order a raw message"""
+    path: Path
+    date: Optional[datetime]
+    sender: str
+    subject: str
+
+    @property
+    def sender_domain(self) -> str:
+        return self.sender.rpartition('@')[2].lower()
+
+
+def _decode(value: Optional[str]) -> str:
+    if not value:
+        return ''
+    try:
+        return str(make_header(decode_header(value)))
+    except (LookupError, UnicodeDecodeError, ValueError):
+        return str(value)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Aware datetime in UTC (naive values are taken as UTC)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def parse_date_header(value: Optional[str]) -> Optional[datetime]:
+    """RFC 2822 Date header as an aware UTC datetime, None if missing or invalid"""
+    if not value:
+        return None
+    try:
+        return _as_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def parse_date_arg(value: str, end_of_day: bool = False) -> datetime:
+    """
+    Parse a --since/--until value (YYYY-MM-DD or ISO 8601 datetime)
+
+    Args:
+        value: Date or datetime string
+        end_of_day: For a bare date, use its last moment (inclusive --until)
+
+    Raises:
+        ValueError: If the value is not a date
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}': use YYYY-MM-DD or an ISO 8601 datetime") from None
+    if end_of_day and len(value) == 10:
+        parsed = datetime.combine(parsed.date(), dt_time.max)
+    return _as_utc(parsed)
+
+
+def scan_headers(path: Path) -> EmailHeaders:
+    """Read and parse just the header block of an .eml file"""
+    headers = BytesHeaderParser().parsebytes(read_header_block(path))
+    addresses = getaddresses([_decode(headers.get('From'))])
+    sender = addresses[0][1].lower() if addresses else ''
+    return EmailHeaders(
+        path=Path(path),
+        date=parse_date_header(headers.get('Date')),
+        sender=sender,
+        subject=_decode(headers.get('Subject')),
+    )
+
+
+@dataclass
+class HeaderFilter:
+    """Selection criteria applied to pre-scanned headers"""
+    since: Optional[datetime] = None
+    until: Optional[datetime] = None
+    from_domains: List[str] = field(default_factory=list)
+    subject_regex: Optional[Pattern] = None
+
+    @property
+    def active(self) -> bool:
+        return bool(self.since or self.until or self.from_domains or self.subject_regex)
+
+    def matches(self, headers: EmailHeaders) -> bool:
+        """True if the message passes every criterion given"""
+        if self.since or self.until:
+            # Undated messages cannot be placed in a date range
+            if headers.date is None:
+                return False
+            if self.since and headers.date < self.since:
+                return False
+            if self.until and headers.date > self.until:
+                return False
+        if self.from_domains:
+            domain = headers.sender_domain
+            if not any(domain == d or domain.endswith('.' + d) for d in self.from_domains):
+                return False
+        if self.subject_regex and not self.subject_regex.search(headers.subject):
+            return False
+        return True
+
+
+def build_filter(since: Optional[str] = None, until: Optional[str] = None,
+                 from_domains: Optional[Iterable[str]] = None,
+                 subject_regex: Optional[str] = None) -> HeaderFilter:
+    """
+    Build a HeaderFilter from command-line strings
+
+    Domains may be repeated or comma-separated; subject matching is
+    case-insensitive.
+
+    Raises:
+        ValueError: For an invalid date or regular expression
+    """
+    domains = []
+    for value in from_domains or []:
+        domains.extend(d.strip().lstrip('@').lower() for d in value.split(',') if d.strip())
+    try:
+        pattern = re.compile(subject_regex, re.IGNORECASE) if subject_regex else None
+    except re.error as e:
+        raise ValueError(f"Invalid --subject-regex: {e}") from e
+    return HeaderFilter(
+        since=parse_date_arg(since) if since else None,
+        until=parse_date_arg(until, end_of_day=True) if until else None,
+        from_domains=domains,
+        subject_regex=pattern,
+    )
+
+
+def prescan(paths: Iterable[Path], header_filter: Optional[HeaderFilter] = None,
+            metrics=None, newest_first: bool = False) -> Tuple[List[EmailHeaders], int]:
+    """
+    Pre-scan headers, filter, and order messages by date
+
+    Unreadable files are kept so that the conversion step reports them.
+    Undated messages go last in either order.
+
+    Args:
+        paths: Raw .eml files
+        header_filter: Optional selection criteria
+        metrics: Optional RunMetrics; counts 'filtered_out'
+        newest_first: Order newest first instead of oldest first
+
+    Returns:
+        (selected messages in date order, number filtered out)
+    """
+    selected: List[EmailHeaders] = []
+    skipped = 0
+    for path in paths:
+        try:
+            headers = scan_headers(path)
+        except OSError:
+            selected.append(EmailHeaders(Path(path), None, '', ''))
+            continue
+        if header_filter is not None and not header_filter.matches(headers):
+            skipped += 1
+            continue
+        selected.append(headers)
+
+    if metrics is not None:
+        metrics.count('filtered_out', skipped)
+    dated = [headers for headers in selected if headers.date is not None]
+    undated = sorted((headers for headers in selected if headers.date is None), key=lambda h: h.path.name)
+    sign = -1 if newest_first else 1
+    dated.sort(key=lambda h: (sign * h.date.timestamp(), h.path.name))
+    return dated + undated, skipped
@@ -0,0 +1,566 @@
+#!/usr/bin/env python3
+"""
+Export project documentation to PDF with incremental rebuilds
+
+Collects the same sections as the original export-pdf.sh (PROJECT.md,
+docs/ and aiDocs/) and typesets them with Pandoc + XeLaTeX, but avoids
+repeating work:
+- The inputs, template, metadata and Pandoc version are hashed; if nothing
+  changed since the last export and the PDF exists, nothing is rebuilt
+- Each section is converted to a LaTeX fragment once and cached by content
+  hash, so only edited sections go through Pandoc again
+- The template wrapper (cover page, TOC) is cached separately
+- LaTeX auxiliary files are kept between builds, so an unchanged outline
+  needs a single XeLaTeX pass instead of two or three
+
+Phase timings (collect, fragments, assemble, typeset, publish) are logged
+and written to logs/export_pdf_metrics.json.
+
+--html skips Pandoc and LaTeX entirely: the same sections are rendered by
+a built-in Markdown renderer into one self-contained HTML file (styles and
+local images inlined) for quick previews. The PDF remains the deliverable.
+
+Cache layout (under exports/.cache/):
+    fragments/<hash>.tex   Per-section LaTeX
+    wrapper-<hash>.tex     Rendered template with a body placeholder
+    build/                 Assembled document and LaTeX aux files
+    manifest.json          Input hash of the last successful export
+
+Usage:
+    python3 core/aiScripts/exportPdf/export_pdf.py [--force] [--no-open]
+    python3 core/aiScripts/exportPdf/export_pdf.py --html
+"""
+
+import argparse
+import base64
+import hashlib
+import html
+import json
+import mimetypes
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from ..logger import get_logger
+    logger = get_logger('export_pdf')
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from logger import get_logger
+    logger = get_logger('export_pdf')
+
+try:
+    from ..metrics import get_metrics
+    from ..profiling import run_main
+except ImportError:
+    from metrics import get_metrics
+    from profiling import run_main
+
+try:
+    from .markdown_html import MarkdownRenderer
+except ImportError:
+    from markdown_html import MarkdownRenderer
+
+metrics = get_metrics('export_pdf')
+
+# Bump when section assembly or Pandoc options change to invalidate caches
+CACHE_VERSION = 1
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+TEMPLATE_RELPATH = Path('core/templates/lumina.latex')
+CACHE_DIRNAME = '.cache'
+BODY_PLACEHOLDER = '%LUMINA-BODY%'
+MAX_LATEX_PASSES = 3
+
+# Options shared by fragment and wrapper rendering
+PANDOC_OPTIONS = ['--from=markdown', '--to=latex', '--syntax-highlighting=tango']
+
+# (heading, source file, leading lines to skip, page break after)
+# A None source is a part heading that is always emitted.
+SECTIONS: List[Tuple[str, Optional[str], int, bool]] = [
+    ('# Executive Summary', 'PROJECT.md', 3, True),
+    ('# Quick Reference', None, 0, False),
+    ('## Contacts', 'docs/CONTACTS.md', 2, True),
+    ('## Tasks', 'docs/TASKS.md', 2, True),
+    ('## Decisions', 'docs/DECISIONS.md', 2, True),
+    ('## Outstanding Questions', 'docs/QUESTIONS.md', 2, True),
+    ('# Complete Project Context', None, 0, False),
+    ('## Project Summary', 'aiDocs/SUMMARY.md', 2, True),
+    ('## Detailed Tasks', 'aiDocs/TASKS.md', 2, True),
+    ('## Discovery Questions', 'aiDocs/DISCOVERY.md', 2, True),
+    ('## AI Agent Context', 'aiDocs/AI.md', 2, False),
+]
+
+# Inline stylesheet for HTML previews, following the lumina.latex palette
+HTML_STYLE = """
+body { font-family: Georgia, serif; color: #222; max-width: 50rem; margin: 2rem auto; padding: 0 1.5rem; line-height: 1.55; }
+h1, h2, h3, h4, h5, h6, .cover, nav { font-family: Arial, Helvetica, sans-serif; }
+h1, h2, h3, .cover h1 { color: rgb(0, 51, 102); }
+h1 { border-bottom: 2px solid rgb(0, 51, 102); padding-bottom: .2em; }
+a { color: rgb(0, 102, 204); }
+.cover { text-align: center; padding: 4rem 0; }
+.cover .customer { font-size: 1.4em; }
+nav ul { list-style: none; padding-left: 1.2em; }
+nav > ul { padding-left: 0; }
+pre, code { font-family: "Courier New", monospace; background: #f5f5f5; color: #333; }
+pre { padding: .8em; overflow-x: auto; }
+table { border-collapse: collapse; margin: 1em 0; }
+th, td { border-top: 1px solid #999; border-bottom: 1px solid #999; padding: .3em .7em; text-align: left; }
+blockquote { border-left: 3px solid #ccc; margin-left: 0; padding-left: 1em; color: #555; }
+li.task { list-style: none; margin-left: -1.3em; }
+img { max-width: 100%; }
+.page-break { height: 0; }
+@media print {
+  body { max-width: none; margin: 0; }
+  .page-break, .cover, nav { page-break-after: always; }
+}
+"""
+
+_AI_TAGLINE = re.compile(r'^\*This document was originally created.*\n?', re.MULTILINE)
+
+
+def _hash_text(*parts: str) -> str:
+    """SHA-256 over the given strings (length-prefixed, so boundaries count)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode('utf-8')
+        digest.update(f"{len(data)}:".encode('ascii'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def get_project_metadata(project_root: Path) -> Dict[str, str]:
+    """
+    Extract project name and customer from PROJECT.md and aiDocs/SUMMARY.md
+
+    Returns:
+        Dict with 'project_name', 'customer' and 'date'
+    """
+    project_name = 'Project Documentation'
+    customer = ''
+
+    project_file = project_root / 'PROJECT.md'
+    if project_file.is_file():
+        lines = project_file.read_text(encoding='utf-8', errors='replace').splitlines()
+        for line in lines:
+            if line.startswith('# '):
+                project_name = line[2:]
+                break
+        for line in lines:
+            if re.search(r'customer|client', line, re.IGNORECASE):
+                customer = line.rsplit(':', 1)[-1].replace('**', '').lstrip()
+                break
+
+    summary_file = project_root / 'aiDocs' / 'SUMMARY.md'
+    if summary_file.is_file():
+        for line in summary_file.read_text(encoding='utf-8', errors='replace').splitlines():
+            if line.startswith('**Who**:'):
+                customer = line.rsplit(':', 1)[-1].replace('[', '', 1).replace(']', '', 1).strip()
+                break
+
+    return {
+        'project_name': project_name,
+        'customer': customer,
+        'date': datetime.now().strftime('%B %d, %Y'),
+    }
+
+
+def collect_sections(project_root: Path) -> List[Tuple[str, str]]:
+    """
+    Build the Markdown for each exported section
+
+    Args:
+        project_root: Project directory containing PROJECT.md, docs/, aiDocs/
+
+    Returns:
+        List of (heading, markdown) in document order; missing files are skipped
+    """
+    sections = []
+    for heading, source, skip, page_break in SECTIONS:
+        if source is None:
+            sections.append((heading, f"{heading}\n\n"))
+            continue
+
+        path = project_root / source
+        if not path.is_file():
+            continue
+
+        lines = path.read_text(encoding='utf-8', errors='replace').splitlines(keepends=True)
+        body = ''.join(lines[skip:])
+        if source == 'PROJECT.md':
+            body = _AI_TAGLINE.sub('', body)
+
+        markdown = f"{heading}\n\n{body.rstrip()}\n\n"
+        if page_break:
+            markdown += "\\newpage\n\n"
+        sections.append((heading, markdown))
+    return sections
+
+
+def output_filename(project_name: str, suffix: str = '.pdf') -> str:
+    """Export filename from the project name and today's date"""
+    sanitized = ''.join(
+        c for c in project_name.lower().replace(' ', '-')
+        if c == '-' or (c.isascii() and c.isalnum())
+    )
+    return f"{sanitized}-{datetime.now().strftime('%Y-%m-%d')}{suffix}"
+
+
+def _inline_image(project_root: Path, src: str) -> Optional[str]:
+    """data: URI for a local image, so the HTML has no external files"""
+    if re.match(r'^[a-z][a-z0-9+.-]*:', src, re.IGNORECASE):
+        return None
+    path = project_root / src
+    mime_type = mimetypes.guess_type(path.name)[0]
+    if mime_type is None or not mime_type.startswith('image/') or not path.is_file():
+        return None
+    return f"data:{mime_type};base64,{base64.b64encode(path.read_bytes()).decode('ascii')}"
+
+
+def _toc_html(headings: List[Tuple[int, str, str]], depth: int = 3) -> str:
+    """Nested table of contents (levels 1..depth, like --toc-depth=3)"""
+    parts: List[str] = []
+    open_levels: List[int] = []
+
+    def close_list():
+        parts.append('</ul></li>' if len(open_levels) > 1 else '</ul>')
+        open_levels.pop()
+
+    for level, anchor, text in headings:
+        if level > depth:
+            continue
+        if open_levels and level > open_levels[-1]:
+            # Nest inside the previous entry
+            parts[-1] = parts[-1][:-len('</li>')]
+            parts.append('<ul>')
+            open_levels.append(level)
+        else:
+            while open_levels and level < open_levels[-1]:
+                close_list()
+            if not open_levels:
+                parts.append('<ul>')
+                open_levels.append(level)
+        parts.append(f'<li><a href="#{anchor}">{text}</a></li>')
+
+    while open_levels:
+        close_list()
+    return '\n'.join(parts)
+
+
+def export_html(project_root: Path, export_dir: Optional[Path] = None) -> Path:
+    """
+    Render the documentation to a single self-contained HTML file
+
+    Uses the same sections and metadata as the PDF export, but a built-in
+    Markdown renderer instead of Pandoc + XeLaTeX.
+
+    Args:
+        project_root: Project directory
+        export_dir: Output directory (default: <project_root>/exports)
+
+    Returns:
+        Path of the written HTML file
+    """
+    project_root = Path(project_root)
+    export_dir = Path(export_dir) if export_dir else project_root / 'exports'
+
+    with metrics.stage('collect'):
+        metadata = get_project_metadata(project_root)
+        sections = collect_sections(project_root)
+    for _, markdown in sections:
+        metrics.file_done(size=len(markdown.encode('utf-8')))
+
+    with metrics.stage('render'):
+        renderer = MarkdownRenderer(image_resolver=lambda src: _inline_image(project_root, src))
+        body = '\n'.join(renderer.render(markdown) for _, markdown in sections)
+        title = html.escape(metadata['project_name'])
+        customer = html.escape(metadata['customer'])
+        document = (
+            '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+            f'<title>{title}</title>\n<style>{HTML_STYLE}</style>\n</head>\n<body>\n'
+            f'<header class="cover">\n<h1>{title}</h1>\n'
+            + (f'<p class="customer">{customer}</p>\n' if customer else '')
+            + '<p>Complete Project Documentation</p>\n'
+            f'<p>Generated: {html.escape(metadata["date"])}</p>\n</header>\n'
+            f'<nav>\n<h2>Contents</h2>\n{_toc_html(renderer.headings)}\n</nav>\n'
+            f'<main>\n{body}\n</main>\n</body>\n</html>\n'
+        )
+
+    with metrics.stage('publish'):
+        export_dir.mkdir(parents=True, exist_ok=True)
+        output = export_dir / output_filename(metadata['project_name'], '.html')
+        tmp_output = output.with_suffix('.html.tmp')
+        tmp_output.write_text(document, encoding='utf-8')
+        os.replace(tmp_output, output)
+    return output
+
+
+def _run(command: List[str], input_text: Optional[str] = None, cwd: Optional[Path] = None) -> str:
+    """Run an external tool, returning stdout; raises RuntimeError on failure"""
+    result = subprocess.run(
+        command, input=input_text, cwd=cwd,
+        capture_output=True, text=True, encoding='utf-8', errors='replace'
+    )
+    if result.returncode != 0:
+        output = (result.stderr or result.stdout).strip()
+        raise RuntimeError(f"{Path(command[0]).name} failed ({result.returncode}): {output[-2000:]}")
+    return result.stdout
+
+
+def pandoc_version() -> str:
+    """First line of `pandoc --version` (part of every cache key)"""
+    return _run(['pandoc', '--version']).splitlines()[0]
+
+
+class PdfExporter:
+    """Incremental Pandoc + XeLaTeX export of the project documentation"""
+
+    def __init__(self, project_root: Path, export_dir: Optional[Path] = None,
+                 template: Optional[Path] = None):
+        """
+        Args:
+            project_root: Project directory
+            export_dir: Output directory (default: <project_root>/exports)
+            template: Pandoc LaTeX template (default: core/templates/lumina.latex)
+        """
+        self.project_root = Path(project_root)
+        self.export_dir = Path(export_dir) if export_dir else self.project_root / 'exports'
+        self.template = Path(template) if template else self.project_root / TEMPLATE_RELPATH
+        self.cache_dir = self.export_dir / CACHE_DIRNAME
+        self.fragment_dir = self.cache_dir / 'fragments'
+        self.build_dir = self.cache_dir / 'build'
+        self.manifest_path = self.cache_dir / 'manifest.json'
+
+    def _read_manifest(self) -> Dict[str, str]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write_manifest(self, input_hash: str, output: Path) -> None:
+        with open(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump({'hash': input_hash, 'output': str(output)}, f, indent=2)
+
+    def render_fragments(self, sections: List[Tuple[str, str]], version: str) -> List[str]:
+        """
+        Convert sections to LaTeX, reusing cached fragments
+
+        Uncached sections are rendered concurrently (one Pandoc process each).
+
+        Returns:
+            LaTeX fragments in section order
+        """
+        self.fragment_dir.mkdir(parents=True, exist_ok=True)
+        keys = [_hash_text(str(CACHE_VERSION), version, markdown) for _, markdown in sections]
+
+        missing = {}
+        for key, (heading, markdown) in zip(keys, sections):
+            if not (self.fragment_dir / f"{key}.tex").exists():
+                missing[key] = (heading, markdown)
+
+        metrics.count('fragments_cached', len(set(keys)) - len(missing))
+        metrics.count('fragments_rendered', len(missing))
+
+        def render(item):
+            key, (heading, markdown) = item
+            logger.debug(f"Rendering section: {heading}")
+            latex = _run(['pandoc', *PANDOC_OPTIONS], input_text=markdown)
+            tmp_path = self.fragment_dir / f"{key}.tex.tmp"
+            tmp_path.write_text(latex, encoding='utf-8')
+            os.replace(tmp_path, self.fragment_dir / f"{key}.tex")
+
+        if missing:
+            workers = min(len(missing), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(render, missing.items()))
+
+        # Fragments no longer referenced by any section are dropped
+        used = {f"{key}.tex" for key in keys}
+        for stale in self.fragment_dir.glob('*.tex'):
+            if stale.name not in used:
+                stale.unlink()
+
+        return [(self.fragment_dir / f"{key}.tex").read_text(encoding='utf-8') for key in keys]
+
+    def render_wrapper(self, metadata: Dict[str, str], template_text: str, version: str) -> str:
+        """
+        Render the template (cover page, TOC) around a body placeholder
+
+        Returns:
+            Standalone LaTeX with BODY_PLACEHOLDER where the body goes
+        """
+        key = _hash_text(str(CACHE_VERSION), version, template_text, json.dumps(metadata, sort_keys=True))
+        wrapper_path = self.cache_dir / f"wrapper-{key}.tex"
+        if wrapper_path.exists():
+            return wrapper_path.read_text(encoding='utf-8')
+
+        for old in self.cache_dir.glob('wrapper-*.tex'):
+            old.unlink()
+
+        project_name = metadata['project_name']
+        latex = _run([
+            'pandoc', *PANDOC_OPTIONS,
+            '--standalone',
+            f"--template={self.template}",
+            f"--variable=project-name:{project_name}",
+            f"--variable=customer:{metadata['customer']}",
+            f"--variable=date:{metadata['date']}",
+            f"--variable=title:{project_name}",
+            '--variable=subtitle:Complete Project Documentation',
+            '--variable=tables:true',
+            '--toc',
+            '--toc-depth=3',
+        ], input_text=f"```{{=latex}}\n{BODY_PLACEHOLDER}\n```\n")
+
+        if BODY_PLACEHOLDER not in latex:
+            raise RuntimeError(f"Template {self.template} has no $body$")
+        wrapper_path.write_text(latex, encoding='utf-8')
+        return latex
+
+    def typeset(self, document: str) -> Path:
+        """
+        Run XeLaTeX until cross-references (TOC, labels) settle
+
+        Aux files from the previous build are kept, so when the outline is
+        unchanged the first pass already produces the final PDF.
+
+        Returns:
+            Path of the built PDF in the build directory
+        """
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        tex_path = self.build_dir / 'document.tex'
+        tex_path.write_text(document, encoding='utf-8')
+
+        def aux_state() -> str:
+            return _hash_text(*(
+                path.read_text(encoding='utf-8', errors='replace') if path.exists() else ''
+                for path in (tex_path.with_suffix('.aux'), tex_path.with_suffix('.toc'))
+            ))
+
+        for latex_pass in range(1, MAX_LATEX_PASSES + 1):
+            before = aux_state()
+            with metrics.stage('typeset'):
+                _run(['xelatex', '-interaction=nonstopmode', '-halt-on-error', tex_path.name],
+                     cwd=self.build_dir)
+            metrics.count('latex_passes')
+            if aux_state() == before:
+                break
+            logger.debug(f"Cross-references changed after pass {latex_pass}, re-running")
+
+        return tex_path.with_suffix('.pdf')
+
+    def export(self, force: bool = False) -> Tuple[Path, bool]:
+        """
+        Export the documentation, skipping work that is already done
+
+        Args:
+            force: Ignore the manifest and fragment caches and rebuild everything
+
+        Returns:
+            (PDF path, whether it was rebuilt)
+        """
+        if force and self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        with metrics.stage('collect'):
+            metadata = get_project_metadata(self.project_root)
+            sections = collect_sections(self.project_root)
+            template_text = self.template.read_text(encoding='utf-8')
+            version = pandoc_version()
+            input_hash = _hash_text(
+                str(CACHE_VERSION), version, template_text,
+                json.dumps(metadata, sort_keys=True),
+                *(markdown for _, markdown in sections)
+            )
+        for _, markdown in sections:
+            metrics.file_done(size=len(markdown.encode('utf-8')))
+
+        output = self.export_dir / output_filename(metadata['project_name'])
+        manifest = self._read_manifest()
+        if manifest.get('hash') == input_hash and output.exists():
+            logger.info("Documentation unchanged since last export, skipping rebuild")
+            return output, False
+
+        with metrics.stage('fragments'):
+            fragments = self.render_fragments(sections, version)
+
+        with metrics.stage('assemble'):
+            wrapper = self.render_wrapper(metadata, template_text, version)
+            document = wrapper.replace(BODY_PLACEHOLDER, '\n'.join(fragments), 1)
+
+        pdf = self.typeset(document)
+
+        with metrics.stage('publish'):
+            tmp_output = output.with_suffix('.pdf.tmp')
+            shutil.copyfile(pdf, tmp_output)
+            os.replace(tmp_output, output)
+            self._write_manifest(input_hash, output)
+
+        return output, True
+
+
+def main():
+    """Main export workflow"""
+    parser = argparse.ArgumentParser(description='Export project documentation to PDF')
+    parser.add_argument('--root', type=Path, default=PROJECT_ROOT,
+                        help='Project root (default: repository root)')
+    parser.add_argument('--force', action='store_true',
+                        help='Ignore caches and rebuild everything')
+    parser.add_argument('--no-open', action='store_true',
+                        help="Don't open the export after writing it (macOS)")
+    parser.add_argument('--html', action='store_true',
+                        help='Fast self-contained HTML preview (no Pandoc/LaTeX needed)')
+    args = parser.parse_args()
+
+    if args.html:
+        metrics.reset()
+        try:
+            output = export_html(args.root)
+        except OSError as e:
+            logger.error(f"HTML export failed: {e}")
+            return 1
+        finally:
+            metrics.write()
+            metrics.log_summary(logger)
+        logger.info(f"Generated: {output}")
+        if sys.platform == 'darwin' and not args.no_open:
+            subprocess.run(['open', str(output)])
+        return 0
+
+    missing = [tool for tool in ('pandoc', 'xelatex') if shutil.which(tool) is None]
+    if missing:
+        logger.error(f"Missing required tools: {', '.join(missing)}")
+        logger.error("Run core/scripts/export-pdf.sh for installation instructions")
+        return 1
+
+    metrics.reset()
+    exporter = PdfExporter(args.root)
+    try:
+        output, rebuilt = exporter.export(force=args.force)
+    except (OSError, RuntimeError) as e:
+        logger.error(f"PDF generation failed: {e}")
+        return 1
+    finally:
+        metrics.write()
+        metrics.log_summary(logger)
+
+    logger.info(f"{'Generated' if rebuilt else 'Up to date'}: {output}")
+    logger.info(f"Size: {output.stat().st_size / 1024:.0f} KB")
+
+    if sys.platform == 'darwin' and not args.no_open:
+        subprocess.run(['open', str(output)])
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_main(main, 'export_pdf'))
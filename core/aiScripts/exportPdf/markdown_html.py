@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Minimal Markdown to HTML renderer for documentation previews
+
+Covers the Markdown the Lumina templates and prompts produce, without
+Pandoc or third-party packages:
+- ATX headings (with unique ids for the table of contents)
+- Paragraphs, hard line breaks (two trailing spaces)
+- Nested bullet/numbered lists and task checkboxes (- [ ] / - [x])
+- Pipe tables with alignment, blockquotes, fenced code, rules
+- Emphasis, strong, strikethrough, inline code, links, images, autolinks
+- A lone \\newpage line becomes a print page break
+
+Raw HTML is escaped rather than passed through.
+
+Usage:
+    renderer = MarkdownRenderer()
+    html = renderer.render(markdown)
+    renderer.headings  # [(level, id, text), ...] for a TOC
+"""
+
+import html
+import re
+from typing import Callable, List, Optional, Set, Tuple
+
+_FENCE = re.compile(r'^ {0,3}(`{3,}|~{3,})\s*([\w+#.-]*)')
+_HEADING = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+_RULE = re.compile(r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+_LIST_ITEM = re.compile(r'^( *)([-*+]|\d{1,9}[.)])(?:[ \t]+(.*))?$')
+_TABLE_SEPARATOR = re.compile(r'^ {0,3}\|?[ \t]*:?-+:?[ \t]*(\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$')
+_BLOCKQUOTE = re.compile(r'^ {0,3}> ?(.*)$')
+_TASK = re.compile(r'^\[([ xX])\][ \t]+')
+
+_CODE_SPAN = re.compile(r'(`+)(.+?)\1', re.DOTALL)
+_IMAGE = re.compile(r'!\[([^\]]*)\]\(([^)\s]+)(?:[ \t]+"([^"]*)")?\)')
+_LINK = re.compile(r'\[([^\]]+)\]\(([^)\s]+)(?:[ \t]+"([^"]*)")?\)')
+_AUTOLINK = re.compile(r'&lt;((?:https?|mailto):[^\s&]+)&gt;')
+_STRONG = re.compile(r'\*\*(?=\S)(.+?)(?<=\S)\*\*|__(?=\S)(.+?)(?<=\S)__')
+_EMPHASIS = re.compile(r'(?<![\w*])\*(?=\S)(.+?)(?<=\S)\*(?![\w*])|(?<!\w)_(?=\S)(.+?)(?<=\S)_(?!\w)')
+_STRIKE = re.compile(r'~~(?=\S)(.+?)(?<=\S)~~')
+_HARD_BREAK = re.compile(r' {2,}\n')
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_TAGS = re.compile(r'<[^>]+>')
+_INLINE_MARKERS = re.compile(r'[&<>\[*_~]| \n')
+
+PAGE_BREAK = '<div class="page-break"></div>'
+
+# First characters of lines that can start a non-paragraph block
+_BLOCK_STARTS = frozenset('`~#-*_>+\\0123456789')
+
+# Resolves an image src (e.g. to a data: URI); None leaves it unchanged
+ImageResolver = Callable[[str], Optional[str]]
+
+
+def _attr(value: str) -> str:
+    return html.escape(value, quote=True)
+
+
+class MarkdownRenderer:
+    """Renders Markdown sections, keeping heading ids unique across calls"""
+
+    def __init__(self, image_resolver: Optional[ImageResolver] = None):
+        """
+        Args:
+            image_resolver: Optional hook to rewrite image sources
+        """
+        self.image_resolver = image_resolver
+        self.headings: List[Tuple[int, str, str]] = []
+        self._ids: Set[str] = set()
+
+    def render(self, text: str) -> str:
+        """Render one Markdown document or section to HTML"""
+        return self._blocks(text.expandtabs(4).splitlines())
+
+    # Inline
+
+    def inline(self, text: str) -> str:
+        """Render inline Markdown (code spans are left untouched)"""
+        if '`' not in text:
+            return self._inline_text(text)
+        parts = []
+        position = 0
+        for match in _CODE_SPAN.finditer(text):
+            parts.append(self._inline_text(text[position:match.start()]))
+            parts.append(f"<code>{html.escape(match.group(2).strip(), quote=False)}</code>")
+            position = match.end()
+        parts.append(self._inline_text(text[position:]))
+        return ''.join(parts)
+
+    def _image(self, match: re.Match) -> str:
+        alt, src, title = match.group(1), match.group(2), match.group(3)
+        if self.image_resolver is not None:
+            src = self.image_resolver(html.unescape(src)) or src
+        title_attr = f' title="{_attr(title)}"' if title else ''
+        return f'<img src="{_attr(html.unescape(src))}" alt="{_attr(alt)}"{title_attr}>'
+
+    @staticmethod
+    def _link(match: re.Match) -> str:
+        label, href, title = match.group(1), match.group(2), match.group(3)
+        title_attr = f' title="{_attr(title)}"' if title else ''
+        return f'<a href="{_attr(html.unescape(href))}"{title_attr}>{label}</a>'
+
+    def _inline_text(self, text: str) -> str:
+        # Each pass is skipped unless its marker occurs; most lines are plain
+        if not _INLINE_MARKERS.search(text):
+            return text
+        if '&' in text or '<' in text or '>' in text:
+            text = html.escape(text, quote=False)
+        if '](' in text:
+            text = _IMAGE.sub(self._image, text)
+            text = _LINK.sub(self._link, text)
+        if '&lt;' in text:
+            text = _AUTOLINK.sub(lambda m: f'<a href="{m.group(1)}">{m.group(1)}</a>', text)
+        if '*' in text or '_' in text:
+            text = _STRONG.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", text)
+            text = _EMPHASIS.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", text)
+        if '~~' in text:
+            text = _STRIKE.sub(r'<del>\1</del>', text)
+        if '  \n' in text:
+            text = _HARD_BREAK.sub('<br>\n', text)
+        return text
+
+    # Blocks
+
+    def _heading_id(self, text: str) -> str:
+        """Pandoc-style identifier, made unique within this renderer"""
+        slug = _SLUG_STRIP.sub('', html.unescape(_TAGS.sub('', text)).lower()).strip()
+        slug = re.sub(r'\s+', '-', slug).lstrip('0123456789-_') or 'section'
+        candidate, n = slug, 0
+        while candidate in self._ids:
+            n += 1
+            candidate = f"{slug}-{n}"
+        self._ids.add(candidate)
+        return candidate
+
+    @staticmethod
+    def _starts_block(line: str) -> bool:
+        """Whether a line interrupts a paragraph"""
+        stripped = line.lstrip()
+        if not stripped or stripped[0] not in _BLOCK_STARTS:
+            return False
+        return bool(
+            _FENCE.match(line) or _HEADING.match(line) or _RULE.match(line)
+            or _BLOCKQUOTE.match(line) or _LIST_ITEM.match(line)
+            or stripped.rstrip() == '\\newpage'
+        )
+
+    def _blocks(self, lines: List[str], tight: bool = False) -> str:
+        out = []
+        i = 0
+        n = len(lines)
+        while i < n:
+            line = lines[i]
+            stripped = line.strip()
+
+            if not stripped:
+                i += 1
+                continue
+
+            if '|' in line and i + 1 < n and '|' in lines[i + 1] and _TABLE_SEPARATOR.match(lines[i + 1]):
+                i = self._table(lines, i, out)
+                continue
+
+            if stripped[0] in _BLOCK_STARTS:
+                fence = _FENCE.match(line)
+                if fence:
+                    marker, language = fence.group(1), fence.group(2)
+                    i += 1
+                    code = []
+                    while i < n and not lines[i].strip().startswith(marker):
+                        code.append(lines[i])
+                        i += 1
+                    i += 1
+                    css = f' class="language-{_attr(language)}"' if language else ''
+                    out.append(f"<pre><code{css}>{html.escape(chr(10).join(code), quote=False)}</code></pre>")
+                    continue
+
+                heading = _HEADING.match(line)
+                if heading:
+                    level = len(heading.group(1))
+                    content = self.inline(heading.group(2) or '')
+                    anchor = self._heading_id(content)
+                    self.headings.append((level, anchor, _TAGS.sub('', content)))
+                    out.append(f'<h{level} id="{anchor}">{content}</h{level}>')
+                    i += 1
+                    continue
+
+                if stripped == '\\newpage':
+                    out.append(PAGE_BREAK)
+                    i += 1
+                    continue
+
+                if _RULE.match(line):
+                    out.append('<hr>')
+                    i += 1
+                    continue
+
+                if _BLOCKQUOTE.match(line):
+                    quoted = []
+                    while i < n and lines[i].strip():
+                        match = _BLOCKQUOTE.match(lines[i])
+                        quoted.append(match.group(1) if match else lines[i])
+                        i += 1
+                    out.append(f"<blockquote>\n{self._blocks(quoted)}\n</blockquote>")
+                    continue
+
+                if _LIST_ITEM.match(line):
+                    i = self._list(lines, i, out)
+                    continue
+
+            paragraph = [stripped if not line.endswith('  ') else line.lstrip()]
+            i += 1
+            while i < n and lines[i].strip() and not self._starts_block(lines[i]):
+                paragraph.append(lines[i].lstrip())
+                i += 1
+            content = self.inline('\n'.join(paragraph).rstrip())
+            out.append(content if tight else f"<p>{content}</p>")
+
+        return '\n'.join(out)
+
+    def _list(self, lines: List[str], i: int, out: List[str]) -> int:
+        """Render a list starting at lines[i]; returns the next line index"""
+        first = _LIST_ITEM.match(lines[i])
+        indent = len(first.group(1))
+        ordered = first.group(2)[0].isdigit()
+        items: List[List[str]] = []
+        loose = False
+        n = len(lines)
+
+        while i < n:
+            match = _LIST_ITEM.match(lines[i])
+            if match and len(match.group(1)) == indent and match.group(2)[0].isdigit() == ordered:
+                content_indent = indent + len(match.group(2)) + 1
+                items.append([match.group(3) or ''])
+                i += 1
+            elif lines[i].strip() and items and (
+                    len(lines[i]) - len(lines[i].lstrip()) > indent or not self._starts_block(lines[i])):
+                # Nested content or a lazy continuation line
+                items[-1].append(lines[i][content_indent:] if lines[i][:content_indent].isspace()
+                                 else lines[i].lstrip())
+                i += 1
+            elif not lines[i].strip():
+                # A blank line continues the list only if indented content follows
+                j = i
+                while j < n and not lines[j].strip():
+                    j += 1
+                if j < n and (len(lines[j]) - len(lines[j].lstrip()) > indent or (
+                        _LIST_ITEM.match(lines[j]) and len(_LIST_ITEM.match(lines[j]).group(1)) == indent)):
+                    if len(lines[j]) - len(lines[j].lstrip()) <= indent:
+                        loose = True
+                    items[-1].extend([''] * (j - i))
+                    i = j
+                else:
+                    break
+            else:
+                break
+
+        tag = 'ol' if ordered else 'ul'
+        start = int(first.group(2)[:-1]) if ordered else 1
+        start_attr = f' start="{start}"' if ordered and start != 1 else ''
+        rendered = []
+        for item in items:
+            checkbox = ''
+            task = _TASK.match(item[0])
+            if task:
+                checked = ' checked' if task.group(1) != ' ' else ''
+                checkbox = f'<input type="checkbox" disabled{checked}> '
+                item[0] = item[0][task.end():]
+            body = self._blocks(item, tight=not loose)
+            css = ' class="task"' if task else ''
+            rendered.append(f"<li{css}>{checkbox}{body}</li>")
+        out.append(f"<{tag}{start_attr}>\n" + '\n'.join(rendered) + f"\n</{tag}>")
+        return i
+
+    def _table(self, lines: List[str], i: int, out: List[str]) -> int:
+        """Render a pipe table starting at lines[i]; returns the next line index"""
+        def cells(row: str) -> List[str]:
+            row = row.strip()
+            if row.startswith('|'):
+                row = row[1:]
+            if row.endswith('|') and not row.endswith('\\|'):
+                row = row[:-1]
+            return [cell.strip().replace('\\|', '|') for cell in re.split(r'(?<!\\)\|', row)]
+
+        header = cells(lines[i])
+        aligns = []
+        for spec in cells(lines[i + 1]):
+            if spec.startswith(':') and spec.endswith(':'):
+                aligns.append(' style="text-align: center"')
+            elif spec.endswith(':'):
+                aligns.append(' style="text-align: right"')
+            elif spec.startswith(':'):
+                aligns.append(' style="text-align: left"')
+            else:
+                aligns.append('')
+
+        def row_html(values: List[str], cell_tag: str) -> str:
+            values = (values + [''] * len(aligns))[:len(aligns)]
+            return '<tr>' + ''.join(
+                f"<{cell_tag}{align}>{self.inline(value)}</{cell_tag}>" for value, align in zip(values, aligns)
+            ) + '</tr>'
+
+        rows = [f"<thead>{row_html(header, 'th')}</thead>", '<tbody>']
+        i += 2
+        while i < len(lines) and lines[i].strip() and '|' in lines[i]:
+            rows.append(row_html(cells(lines[i]), 'td'))
+            i += 1
+        rows.append('</tbody>')
+        out.append('<table>\n' + '\n'.join(rows) + '\n</table>')
+        return i
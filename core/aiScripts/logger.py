@@ -7,6 +7,11 @@ Provides consistent logging across all Python scripts with:
 - Log rotation (10MB max, 5 backups)
 - Configurable log levels
 - Environment variable support for debug mode
+- Non-blocking writes: records are queued and written by a background
+  listener thread, so callers never wait on console or disk I/O. One
+  queue and one listener serve every logger, so lines reach the console
+  in the order they were logged
+- Optional structured JSON-lines log
 
 Usage:
     from logger import get_logger
@@ -14,55 +19,98 @@ Usage:
     logger.info("Processing started")
     logger.debug("Detailed info for debugging")
     logger.error("Error occurred", exc_info=True)
+    wait_for_logs()  # before print()ing to the console
 """
 
+import atexit
+import json
 import logging
 import logging.handlers
 import os
+import queue
+import threading
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Dict, List, Optional
 
+LOG_DIR = Path(__file__).parent.parent.parent / 'logs'
 
-def get_logger(name: str) -> logging.Logger:
-    """
-    Get configured logger with file and console handlers
+# Process-wide queue and its listener thread, stopped (and flushed) at exit
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: Optional[logging.handlers.QueueListener] = None
+# Handlers of the loggers routed through the queue, by logger name
+_routes: Dict[str, List[logging.Handler]] = {}
+_routes_lock = threading.Lock()
 
-    Args:
-        name: Logger name (typically script name without extension)
 
-    Returns:
-        Configured logger instance
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that defers all formatting to the listener thread
 
-    Environment Variables:
-        LUMINA_DEBUG: Set to '1', 'true', or 'yes' to enable DEBUG level on console
+    The stock QueueHandler merges message and args (and renders tracebacks)
+    in the calling thread so records can be pickled. Our queue never leaves
+    the process, so the record is enqueued untouched and only formatted by
+    the handlers that actually emit it.
     """
-    logger = logging.getLogger(name)
 
-    # Return existing logger if already configured
-    if logger.handlers:
-        return logger
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
-    # Set base level to DEBUG to capture everything
-    logger.setLevel(logging.DEBUG)
 
+class _Router(logging.Handler):
+    """Listener-side handler that passes each record to its logger's handlers"""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for handler in _routes.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'logger': record.name,
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'module': record.module,
+            'line': record.lineno,
+            'process': record.process,
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _env_flag(name: str) -> bool:
+    """Check a boolean environment variable"""
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+def _build_handlers(name: str) -> List[logging.Handler]:
+    """Create the console, file and optional JSON-lines handlers for a logger"""
     # Console handler - INFO and above (or DEBUG if enabled)
     console = logging.StreamHandler()
 
     # Check for debug mode via environment variable
-    debug_mode = os.environ.get('LUMINA_DEBUG', '').lower() in ('1', 'true', 'yes')
+    debug_mode = _env_flag('LUMINA_DEBUG')
     console.setLevel(logging.DEBUG if debug_mode else logging.INFO)
 
     console_format = logging.Formatter('%(levelname)s: %(message)s')
     console.setFormatter(console_format)
 
     # File handler - DEBUG and above with rotation
-    log_dir = Path(__file__).parent.parent.parent / 'logs'
+    log_dir = LOG_DIR
     log_dir.mkdir(exist_ok=True)
 
     log_file = log_dir / f'{name}.log'
     file_handler = logging.handlers.RotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
-        backupCount=5
+        backupCount=5,
+        delay=True  # Don't open the file until the first record is written
     )
     file_handler.setLevel(logging.DEBUG)
 
@@ -72,8 +120,124 @@ def get_logger(name: str) -> logging.Logger:
     )
     file_handler.setFormatter(file_format)
 
-    # Add handlers to logger
-    logger.addHandler(console)
-    logger.addHandler(file_handler)
+    handlers: List[logging.Handler] = [console, file_handler]
+
+    # Structured log - one JSON object per line, same rotation policy
+    if _env_flag('LUMINA_LOG_JSON'):
+        json_handler = logging.handlers.RotatingFileHandler(
+            log_dir / f'{name}.jsonl',
+            maxBytes=10 * 1024 * 1024,
+            backupCount=5,
+            delay=True
+        )
+        json_handler.setLevel(logging.DEBUG)
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+
+    return handlers
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get configured logger with file and console handlers
+
+    Args:
+        name: Logger name (typically script name without extension)
+
+    Returns:
+        Configured logger instance
+
+    Environment Variables:
+        LUMINA_DEBUG: Set to '1', 'true', or 'yes' to enable DEBUG level on console
+        LUMINA_LOG_JSON: Set to '1', 'true', or 'yes' to also write logs/<name>.jsonl
+        LUMINA_LOG_SYNC: Set to '1', 'true', or 'yes' to write logs synchronously
+    """
+    logger = logging.getLogger(name)
+
+    # Return existing logger if already configured
+    if logger.handlers:
+        return logger
+
+    # Set base level to DEBUG to capture everything
+    logger.setLevel(logging.DEBUG)
+
+    handlers = _build_handlers(name)
+
+    if _env_flag('LUMINA_LOG_SYNC'):
+        for handler in handlers:
+            logger.addHandler(handler)
+        return logger
+
+    # Hot path only enqueues; the shared listener thread formats and writes
+    global _listener
+    with _routes_lock:
+        _routes[name] = handlers
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(_queue, _Router())
+            _listener.start()
+
+    logger.addHandler(LazyQueueHandler(_queue))
 
     return logger
+
+
+def _attach_directly(name: str, handlers: List[logging.Handler]) -> None:
+    """Replace a logger's queue handler with its own handlers"""
+    logger = logging.getLogger(name)
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.QueueHandler):
+            logger.removeHandler(handler)
+    for handler in handlers:
+        logger.addHandler(handler)
+
+
+def wait_for_logs() -> None:
+    """
+    Write out all queued records, keeping the background listener running
+
+    Call before print()ing to the console so earlier log lines appear first.
+    """
+    with _routes_lock:
+        if _listener is not None:
+            # stop() drains the queue and joins the thread; start() a fresh one
+            _listener.stop()
+            _listener.start()
+
+
+def flush_logs() -> None:
+    """
+    Write out all queued records and stop the background listener
+
+    Called automatically at interpreter exit. Loggers stay usable afterwards
+    and write synchronously.
+    """
+    global _listener
+    with _routes_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for name, handlers in _routes.items():
+            _attach_directly(name, handlers)
+        _routes.clear()
+
+
+def _reset_after_fork() -> None:
+    """
+    Switch loggers to direct handlers in a forked child
+
+    The listener thread doesn't survive fork(), and pool workers exit without
+    running atexit hooks, so queued records would be lost. Workers are short
+    lived, so they write synchronously through the inherited handlers.
+    """
+    global _listener, _queue, _routes_lock
+    _routes_lock = threading.Lock()
+    _listener = None
+    _queue = queue.SimpleQueue()
+    for name, handlers in list(_routes.items()):
+        _attach_directly(name, handlers)
+    _routes.clear()
+
+
+atexit.register(flush_logs)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
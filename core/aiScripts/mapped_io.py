@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped input reading for Lumina converters
+
+Large raw inputs are mapped instead of read, so scans (header boundaries,
+regex searches) run over the page cache without first copying the file
+into a bytes object. Small files are read normally, where mmap's setup
+cost outweighs the copy.
+
+Encoding is detected from a prefix of the buffer, so a non-UTF-8 file
+costs one prefix decode instead of a full failed decode plus a re-read.
+
+Usage:
+    from mapped_io import map_file, read_text
+
+    with map_file(path) as buffer:
+        end = header_end(buffer)
+
+    text, encoding = read_text(path)
+"""
+
+import codecs
+import mmap
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Tuple, Union
+
+# Files smaller than this are read into memory instead of mapped
+MMAP_THRESHOLD = 256 * 1024
+
+# Bytes inspected when detecting the encoding
+ENCODING_PREFIX = 64 * 1024
+
+# Chunk size when feeding a mapped buffer to incremental parsers
+CHUNK_SIZE = 64 * 1024
+
+# Header blocks are read in reads of this size, up to HEADER_LIMIT
+HEADER_READ_SIZE = 8 * 1024
+HEADER_LIMIT = 1024 * 1024
+
+Buffer = Union[bytes, mmap.mmap]
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+_HEADER_END = re.compile(rb'\r?\n\r?\n')
+
+
+@contextmanager
+def map_file(path: Union[str, Path], threshold: int = MMAP_THRESHOLD) -> Iterator[Buffer]:
+    """
+    Open a file as a read-only buffer
+
+    Args:
+        path: File to open
+        threshold: Files at least this large are memory-mapped
+
+    Yields:
+        mmap (large files) or bytes (small or empty files). Both support
+        slicing, find() and the re module.
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, 2)
+        f.seek(0)
+        if size < threshold or size == 0:
+            yield f.read()
+            return
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def detect_encoding(buffer: Buffer, prefix_size: int = ENCODING_PREFIX) -> str:
+    """
+    Guess a text encoding from the start of a buffer
+
+    Args:
+        buffer: File contents
+        prefix_size: Number of leading bytes to inspect
+
+    Returns:
+        Codec name: a BOM-declared codec, 'utf-8' if the prefix decodes,
+        otherwise 'latin-1' (which accepts any byte sequence)
+    """
+    prefix = buffer[:prefix_size]
+    for bom, encoding in _BOMS:
+        if prefix.startswith(bom):
+            return encoding
+
+    # Incremental decode tolerates a multi-byte character cut by the prefix
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=len(prefix) < prefix_size)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+def decode_buffer(buffer: Buffer, encoding: str) -> Tuple[str, str]:
+    """
+    Decode a buffer, falling back to latin-1 if the guess was wrong
+
+    A prefix can decode as UTF-8 while a later part doesn't; the fallback
+    decodes the same buffer again rather than re-reading the file.
+
+    Returns:
+        (text, encoding actually used)
+    """
+    try:
+        return str(buffer, encoding), encoding
+    except UnicodeDecodeError:
+        return str(buffer, 'latin-1'), 'latin-1'
+
+
+def read_text(path: Union[str, Path]) -> Tuple[str, str]:
+    """
+    Read a text file with prefix-based encoding detection
+
+    Returns:
+        (text, encoding used)
+    """
+    with map_file(path) as buffer:
+        return decode_buffer(buffer, detect_encoding(buffer))
+
+
+def header_end(buffer: Buffer) -> int:
+    """
+    Find the end of an RFC 5322 header block
+
+    Returns:
+        Offset of the first body byte, or -1 if there is no blank line
+    """
+    match = _HEADER_END.search(buffer)
+    return match.end() if match else -1
+
+
+def read_header_block(path: Union[str, Path], limit: int = HEADER_LIMIT) -> bytes:
+    """
+    Read only the RFC 5322 header block of a file
+
+    The file is read in small pieces until the blank line ending the
+    headers, so pre-scanning a large message costs a few KB of I/O.
+
+    Returns:
+        Header bytes (without the blank line); the first ``limit`` bytes
+        if no end of headers is found by then
+    """
+    data = b''
+    with open(path, 'rb') as f:
+        while len(data) < limit:
+            piece = f.read(HEADER_READ_SIZE)
+            if not piece:
+                break
+            # Re-search the last bytes too: the blank line may span reads
+            searched_from = max(0, len(data) - 3)
+            data += piece
+            match = _HEADER_END.search(data, searched_from)
+            if match:
+                return data[:match.start()]
+    return data[:limit]
+
+
+def iter_chunks(buffer: Buffer, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Yield a buffer in bounded chunks (for feed-style parsers)."""
+    for start in range(0, len(buffer), size):
+        yield buffer[start:start + size]
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Lightweight run instrumentation for Lumina AI scripts
+
+Provides per-stage timers and counters with:
+- Context-manager timers (p50/p95/max per stage)
+- Named counters and byte/file throughput
+- JSON metrics file per run in logs/
+- End-of-run summary through the script's logger
+
+Usage:
+    from metrics import get_metrics
+    metrics = get_metrics('script_name')
+
+    with metrics.stage('parse'):
+        msg = parse(raw)
+    metrics.file_done(size=len(raw))
+
+    metrics.write()
+    metrics.log_summary(logger)
+"""
+
+import json
+import logging
+import math
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+_registry: Dict[str, 'RunMetrics'] = {}
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+class RunMetrics:
+    """Stage timings and counters for a single script run"""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Metrics name (typically the logger name)
+        """
+        self.name = name
+        self.reset()
+
+    def reset(self) -> None:
+        """Start a new run, discarding collected data."""
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.timings: Dict[str, array] = {}
+        self.counters: Dict[str, int] = {}
+        self.files = 0
+        self.bytes = 0
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one occurrence of ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Record a duration for a stage measured elsewhere."""
+        timings = self.timings.get(name)
+        if timings is None:
+            timings = self.timings[name] = array('d')
+        timings.append(seconds)
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a named counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def merge(self, timings: Dict[str, Any], counters: Dict[str, int]) -> None:
+        """Add stage timings and counters collected in another process."""
+        for name, values in timings.items():
+            for seconds in values:
+                self.record(name, seconds)
+        for name, amount in counters.items():
+            self.count(name, amount)
+
+    def file_done(self, size: int = 0) -> None:
+        """Count one processed input file and its size in bytes."""
+        self.files += 1
+        self.bytes += size
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Build per-run statistics.
+
+        Returns:
+            Dict with elapsed time, throughput, counters and per-stage
+            count/total/p50/p95/max in seconds
+        """
+        elapsed = time.perf_counter() - self._start
+        stages = {}
+        for name, timings in self.timings.items():
+            values = sorted(timings)
+            stages[name] = {
+                'count': len(values),
+                'total': sum(values),
+                'p50': percentile(values, 0.50),
+                'p95': percentile(values, 0.95),
+                'max': values[-1],
+            }
+
+        return {
+            'name': self.name,
+            'started_at': self.started_at.isoformat(),
+            'elapsed_seconds': elapsed,
+            'files': self.files,
+            'bytes': self.bytes,
+            'files_per_sec': self.files / elapsed if elapsed > 0 else 0.0,
+            'bytes_per_sec': self.bytes / elapsed if elapsed > 0 else 0.0,
+            'counters': dict(self.counters),
+            'stages': stages,
+        }
+
+    def write(self, output_file: Optional[Path] = None) -> Path:
+        """
+        Write the run summary as JSON.
+
+        Args:
+            output_file: Destination (defaults to logs/<name>_metrics.json)
+
+        Returns:
+            Path of the written file
+        """
+        if output_file is None:
+            log_dir = Path(__file__).parent.parent.parent / 'logs'
+            log_dir.mkdir(exist_ok=True)
+            output_file = log_dir / f'{self.name}_metrics.json'
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=2)
+        return output_file
+
+    def log_summary(self, logger: logging.Logger) -> None:
+        """Log a human-readable performance summary."""
+        data = self.summary()
+        logger.info(
+            f"Performance: {data['files']} file(s) in {data['elapsed_seconds']:.2f}s "
+            f"({data['files_per_sec']:.1f} files/s, {data['bytes_per_sec'] / 1024:.1f} KB/s)"
+        )
+        for name, stats in data['stages'].items():
+            logger.info(
+                f"  {name}: n={stats['count']} total={stats['total'] * 1000:.0f}ms "
+                f"p50={stats['p50'] * 1000:.1f}ms p95={stats['p95'] * 1000:.1f}ms"
+            )
+
+
+def get_metrics(name: str) -> RunMetrics:
+    """
+    Get the shared RunMetrics instance for a script
+
+    Args:
+        name: Metrics name (typically the logger name)
+
+    Returns:
+        RunMetrics instance, created on first use
+    """
+    metrics = _registry.get(name)
+    if metrics is None:
+        metrics = _registry[name] = RunMetrics(name)
+    return metrics
+
+
+def take_all() -> Dict[str, Dict[str, Any]]:
+    """
+    Collect and clear the timings and counters of every RunMetrics
+
+    Used in worker processes to hand their measurements back to the parent,
+    which applies them with merge().
+
+    Returns:
+        {name: {'timings': {stage: [seconds]}, 'counters': {...}}} for
+        metrics with data
+    """
+    taken = {}
+    for name, metrics in _registry.items():
+        if metrics.timings or metrics.counters:
+            taken[name] = {
+                'timings': {stage: values.tolist() for stage, values in metrics.timings.items()},
+                'counters': dict(metrics.counters),
+            }
+            metrics.timings = {}
+            metrics.counters = {}
+    return taken
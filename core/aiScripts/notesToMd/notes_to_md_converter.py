@@ -18,44 +18,75 @@ Supported formats:
 
 Usage:
     python3 core/aiScripts/notesToMd/notes_to_md_converter.py
+    python3 core/aiScripts/notesToMd/notes_to_md_converter.py --exclude 'Archive/*'
 """
 
+import argparse
 import os
 import re
 import shutil
 from pathlib import Path
 from datetime import datetime
 import sys
-import zipfile
-import json
+import time
 
-# Import docx for OneNote support
+# Import logger
 try:
-    from docx import Document
-    DOCX_AVAILABLE = True
+    from ..logger import get_logger, wait_for_logs
+    logger = get_logger('notes_converter')
 except ImportError:
-    DOCX_AVAILABLE = False
+    # Fallback if running as standalone script
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from logger import get_logger, wait_for_logs
+    logger = get_logger('notes_converter')
 
-# Import html2text for Apple Notes HTML support
 try:
-    import html2text
-    HTML2TEXT_AVAILABLE = True
+    from ..checkDependencies import is_available, lazy_import
+    from ..data_uris import externalize_data_uris
+    from ..mapped_io import read_text
+    from ..staged_commit import StagedCommit
+    from ..scheduling import ProgressCheckpoint, order_by_recency
+    from ..discovery import NOTES_FORMATS, discover, format_for
+    from ..supervisor import ArchiveLimitExceeded, ResourceLimitExceeded, get_supervisor, quarantine
 except ImportError:
-    HTML2TEXT_AVAILABLE = False
+    from checkDependencies import is_available, lazy_import
+    from data_uris import externalize_data_uris
+    from mapped_io import read_text
+    from staged_commit import StagedCommit
+    from scheduling import ProgressCheckpoint, order_by_recency
+    from discovery import NOTES_FORMATS, discover, format_for
+    from supervisor import ArchiveLimitExceeded, ResourceLimitExceeded, get_supervisor, quarantine
+
+# Embedded HTML images are written to notes/ai/inline-images/
+IMAGES_DIRNAME = 'inline-images'
+
+# Limits on zipped .textbundle members, against decompression bombs
+MAX_BUNDLE_MEMBER_BYTES = 64 * 1024 * 1024
+MAX_BUNDLE_INFO_BYTES = 1024 * 1024
+MAX_COMPRESSION_RATIO = 100
+# Small members may exceed the ratio legitimately (e.g. blank padding)
+RATIO_CHECK_MIN_BYTES = 1024 * 1024
+
+# Optional format support: checked without importing, loaded on first use
+DOCX_AVAILABLE = is_available('docx')  # OneNote (.docx)
+HTML2TEXT_AVAILABLE = is_available('html2text')  # Apple Notes (.html)
 
-# Import logger
 try:
-    from ..logger import get_logger
-    logger = get_logger('notes_converter')
+    from ..state_manager import record_processing
+    from ..metrics import get_metrics
+    from ..profiling import run_main
 except ImportError:
-    # Fallback if running as standalone script
-    sys.path.insert(0, str(Path(__file__).parent.parent))
-    from logger import get_logger
-    logger = get_logger('notes_converter')
+    from state_manager import record_processing
+    from metrics import get_metrics
+    from profiling import run_main
+
+metrics = get_metrics('notes_converter')
 
 
 def print_format_support():
     """Print format support status with nice formatting"""
+    # Log lines queued before the banner must not print inside it
+    wait_for_logs()
     print()
     print("=" * 70)
     print("NOTES CONVERTER - FORMAT SUPPORT STATUS")
@@ -237,7 +268,7 @@ def parse_docx(source_path):
     if not DOCX_AVAILABLE:
         raise ImportError("python-docx is required for .docx support. Install with: pip install python-docx")
 
-    doc = Document(str(source_path))
+    doc = lazy_import('docx').Document(str(source_path))
     content_lines = []
 
     for paragraph in doc.paragraphs:
@@ -280,6 +311,37 @@ def parse_docx(source_path):
     return '\n'.join(content_lines)
 
 
+def read_bundle_member(zip_ref, name, limit=MAX_BUNDLE_MEMBER_BYTES):
+    """
+    Read a zip member without trusting its declared size
+
+    Args:
+        zip_ref: Open zipfile.ZipFile
+        name: Member name
+        limit: Maximum uncompressed bytes
+
+    Returns:
+        bytes: Member content
+
+    Raises:
+        ArchiveLimitExceeded: If the member is larger than limit, or its
+                              compression ratio suggests a zip bomb
+    """
+    info = zip_ref.getinfo(name)
+    if (info.file_size > RATIO_CHECK_MIN_BYTES
+            and info.file_size > MAX_COMPRESSION_RATIO * max(info.compress_size, 1)):
+        raise ArchiveLimitExceeded(
+            f"{name} expands {info.file_size // max(info.compress_size, 1)}x "
+            f"(limit {MAX_COMPRESSION_RATIO}x)"
+        )
+    # The header sizes can lie, so stop reading at the limit regardless
+    with zip_ref.open(info) as member:
+        data = member.read(limit + 1)
+    if len(data) > limit:
+        raise ArchiveLimitExceeded(f"{name} is larger than {limit // (1024 * 1024)} MB uncompressed")
+    return data
+
+
 def parse_textbundle(source_path):
     """
     Parse Bear .textbundle format
@@ -294,7 +356,13 @@ def parse_textbundle(source_path):
 
     Returns:
         str: Extracted markdown content
+
+    Raises:
+        ArchiveLimitExceeded: If a zipped member is too large to expand
     """
+    import json
+    import zipfile
+
     content_lines = []
     metadata = {}
 
@@ -306,7 +374,7 @@ def parse_textbundle(source_path):
                 # Look for info.json
                 if 'info.json' in zip_ref.namelist():
                     try:
-                        info_data = json.loads(zip_ref.read('info.json'))
+                        info_data = json.loads(read_bundle_member(zip_ref, 'info.json', MAX_BUNDLE_INFO_BYTES))
                         metadata = info_data
                     except json.JSONDecodeError:
                         logger.warning(f"Could not parse info.json in {source_path.name}")
@@ -319,7 +387,7 @@ def parse_textbundle(source_path):
                     text_file = 'text.txt'
 
                 if text_file:
-                    content = zip_ref.read(text_file).decode('utf-8')
+                    content = read_bundle_member(zip_ref, text_file).decode('utf-8')
                     content_lines.append(content)
                 else:
                     logger.warning(f"No text.md or text.txt found in {source_path.name}")
@@ -342,11 +410,9 @@ def parse_textbundle(source_path):
         text_txt = source_path / 'text.txt'
 
         if text_md.exists():
-            with open(text_md, 'r', encoding='utf-8') as f:
-                content_lines.append(f.read())
+            content_lines.append(read_text(text_md)[0])
         elif text_txt.exists():
-            with open(text_txt, 'r', encoding='utf-8') as f:
-                content_lines.append(f.read())
+            content_lines.append(read_text(text_txt)[0])
         else:
             logger.warning(f"No text.md or text.txt found in {source_path.name}")
 
@@ -366,12 +432,16 @@ def parse_textbundle(source_path):
     return '\n'.join(content_lines)
 
 
-def parse_html(source_path):
+def parse_html(source_path, image_dir=None, link_base=None):
     """
     Parse Apple Notes HTML export
 
     Args:
         source_path: Path to .html file
+        image_dir: Directory for embedded (data: URI) images. If None,
+                   images stay inline.
+        link_base: Directory image links are relative to (the Markdown
+                   output directory); defaults to image_dir's parent
 
     Returns:
         str: Markdown content converted from HTML
@@ -380,11 +450,19 @@ def parse_html(source_path):
         raise ImportError("html2text is required for HTML support. Install with: pip install html2text")
 
     # Read HTML content
-    with open(source_path, 'r', encoding='utf-8') as f:
-        html_content = f.read()
+    html_content, _ = read_text(source_path)
+
+    # Write embedded images to files so base64 never reaches the Markdown
+    if image_dir is not None:
+        with metrics.stage('image_externalize'):
+            html_content, images = externalize_data_uris(
+                html_content, image_dir, link_base or Path(image_dir).parent, metrics=metrics
+            )
+        if images:
+            logger.debug(f"Externalized {len(images)} embedded image(s) to {image_dir}")
 
     # Configure html2text for clean markdown conversion
-    h = html2text.HTML2Text()
+    h = lazy_import('html2text').HTML2Text()
     h.ignore_links = False
     h.ignore_images = False
     h.ignore_emphasis = False
@@ -396,7 +474,8 @@ def parse_html(source_path):
     h.mark_code = True
 
     # Convert HTML to markdown
-    markdown_content = h.handle(html_content)
+    with metrics.stage('html_conversion'):
+        markdown_content = h.handle(html_content)
 
     # Clean up excessive newlines (more than 2 consecutive)
     markdown_content = re.sub(r'\n{3,}', '\n\n', markdown_content)
@@ -409,45 +488,56 @@ def detect_format(file_path):
     Detect file format from extension or directory name
 
     Args:
-        file_path: Path to file or directory
+        file_path: Path to file or directory (.textbundle can be either)
 
     Returns:
         str: File format ('txt', 'md', 'docx', 'textbundle', 'html', 'unknown')
     """
-    # Check if it's a .textbundle (can be file or directory)
-    if file_path.suffix.lower() == '.textbundle':
-        return 'textbundle'
-
-    # Check if it's a directory with .textbundle extension
-    if file_path.is_dir() and file_path.name.endswith('.textbundle'):
-        return 'textbundle'
-
-    suffix = file_path.suffix.lower()
-
-    if suffix == '.txt':
-        return 'txt'
-    elif suffix == '.md':
-        return 'md'
-    elif suffix == '.docx':
-        return 'docx'
-    elif suffix == '.html':
-        return 'html'
-    else:
-        return 'unknown'
+    return format_for(file_path.name, NOTES_FORMATS) or 'unknown'
+
+
+def relative_location(source_path, raw_dir):
+    """Path of a source relative to raw_dir (just its name if outside it)"""
+    try:
+        return Path(source_path).relative_to(raw_dir)
+    except ValueError:
+        return Path(Path(source_path).name)
+
+
+def output_filename_for(source_path, raw_dir):
+    """
+    Markdown filename for a source file
+
+    Notes in nested export folders (e.g. Notebook/Section/Page.docx) are
+    flattened into notes/ai/ with their folders as a prefix
+    ("Notebook - Section - Page.md") so same-named pages don't collide.
+    """
+    relative = relative_location(source_path, raw_dir)
+    parts = list(relative.parent.parts) + [relative.stem]
+    return f"{sanitize_filename(' - '.join(parts))}.md"
 
 
-def process_notes_file(source_path, raw_dir, ai_dir, processed_dir):
+def process_notes_file(source_path, raw_dir, ai_dir, processed_dir, commit=None, on_done=None):
     """
     Process a single notes file
 
     Args:
         source_path: Path to source file
-        raw_dir: Path to raw directory
+        raw_dir: Path to raw directory (a nested source keeps its folders
+                 under processed_dir)
         ai_dir: Path to AI directory
         processed_dir: Path to processed directory
+        commit: Optional StagedCommit; the Markdown is staged and the output
+                rename and original move happen in its next batch
+        on_done: With commit, called as on_done(success, error) once the
+                 file's batch has been committed
+
+    HTML, DOCX and textbundle parsing runs in a supervised worker. A file
+    that exceeds the time, memory or archive limits is moved to
+    notes/failed/ instead of being retried every run.
 
     Returns:
-        bool: True if successful, False otherwise
+        bool: True if successful (with commit: converted and staged), False otherwise
     """
     try:
         filename = source_path.name
@@ -456,31 +546,28 @@ def process_notes_file(source_path, raw_dir, ai_dir, processed_dir):
         # Detect format and read content
         file_format = detect_format(source_path)
 
-        if file_format == 'html':
-            if not HTML2TEXT_AVAILABLE:
-                logger.error(f"Skipping {filename}: html2text not available. Install with: pip install html2text")
-                return False
-            content = parse_html(source_path)
-        elif file_format == 'textbundle':
-            content = parse_textbundle(source_path)
-        elif file_format == 'docx':
-            if not DOCX_AVAILABLE:
-                logger.error(f"Skipping {filename}: python-docx not available. Install with: pip install python-docx")
+        supervisor = get_supervisor()
+        with metrics.stage('parse'):
+            if file_format == 'html':
+                if not HTML2TEXT_AVAILABLE:
+                    logger.error(f"Skipping {filename}: html2text not available. Install with: pip install html2text")
+                    return False
+                content = supervisor.call(parse_html, source_path, image_dir=ai_dir / IMAGES_DIRNAME)
+            elif file_format == 'textbundle':
+                content = supervisor.call(parse_textbundle, source_path)
+            elif file_format == 'docx':
+                if not DOCX_AVAILABLE:
+                    logger.error(f"Skipping {filename}: python-docx not available. Install with: pip install python-docx")
+                    return False
+                content = supervisor.call(parse_docx, source_path)
+            elif file_format in ('txt', 'md'):
+                # Read text/markdown files directly (encoding guessed from a prefix)
+                content, encoding = read_text(source_path)
+                if encoding == 'latin-1':
+                    logger.warning(f"{filename} is not valid UTF-8, read as latin-1")
+            else:
+                logger.warning(f"Skipping {filename}: Unsupported format {source_path.suffix}")
                 return False
-            content = parse_docx(source_path)
-        elif file_format in ('txt', 'md'):
-            # Read text/markdown files directly
-            try:
-                with open(source_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-            except UnicodeDecodeError:
-                # Try with latin-1 encoding as fallback
-                logger.warning(f"UTF-8 decode failed for {filename}, trying latin-1")
-                with open(source_path, 'r', encoding='latin-1') as f:
-                    content = f.read()
-        else:
-            logger.warning(f"Skipping {filename}: Unsupported format {source_path.suffix}")
-            return False
 
         if not content.strip():
             logger.warning(f"Empty file: {filename}")
@@ -494,31 +581,57 @@ def process_notes_file(source_path, raw_dir, ai_dir, processed_dir):
         markdown_content = convert_note_to_markdown(content, metadata)
 
         # Generate output filename
-        base_name = Path(filename).stem
-        safe_name = sanitize_filename(base_name)
-        output_filename = f"{safe_name}.md"
+        output_filename = output_filename_for(source_path, raw_dir)
 
-        # Save to AI directory
+        # Save to AI directory (or stage it for the next commit batch)
         output_path = ai_dir / output_filename
-        with open(output_path, 'w', encoding='utf-8') as f:
+        write_path = commit.stage_path(output_filename) if commit is not None else output_path
+        with metrics.stage('markdown_write'), open(write_path, 'w', encoding='utf-8') as f:
             f.write(markdown_content)
 
+        processed_path = processed_dir / relative_location(source_path, raw_dir)
+        processed_path.parent.mkdir(parents=True, exist_ok=True)
+        if commit is not None:
+            commit.add(write_path, output_path, source_path, processed_path, on_done=on_done)
+            logger.info(f"Staged: {output_path}")
+            return True
+
         logger.info(f"Saved to: {output_path}")
 
         # Move original to processed directory
-        processed_path = processed_dir / filename
-        shutil.move(str(source_path), str(processed_path))
+        with metrics.stage('file_move'):
+            shutil.move(str(source_path), str(processed_path))
         logger.info(f"Moved original to: {processed_path}")
 
         return True
 
+    except ResourceLimitExceeded as e:
+        logger.error(f"Error processing {source_path.name}: {e}")
+        quarantine(source_path, processed_dir.parent / 'failed', str(e), raw_dir)
+        return False
+
     except Exception as e:
         logger.error(f"Error processing {source_path.name}: {e}", exc_info=True)
         return False
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command-line options"""
+    parser = argparse.ArgumentParser(
+        description='Convert notes in notes/raw/ (including nested export folders) to Markdown'
+    )
+    parser.add_argument('--no-recursive', dest='recursive', action='store_false',
+                        help='Only convert files directly in notes/raw/, not in subfolders')
+    parser.add_argument('--include', action='append', metavar='PATTERN',
+                        help="Only convert matching files, e.g. 'Work/*' or '*.docx' (repeatable)")
+    parser.add_argument('--exclude', action='append', metavar='PATTERN',
+                        help="Skip matching files and folders, e.g. 'Archive' (repeatable)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """Main conversion workflow"""
+    args = parse_args(argv)
     logger.info("Starting notes to Markdown conversion")
 
     # Show format support
@@ -534,31 +647,55 @@ def main():
         directory.mkdir(parents=True, exist_ok=True)
         logger.debug(f"Ensured directory exists: {directory}")
 
-# Find all notes files in raw directory (.txt, .md, .docx, .textbundle, .html)
-    notes_files = (
-        list(raw_dir.glob('*.txt')) +
-        list(raw_dir.glob('*.md')) +
-        list(raw_dir.glob('*.docx')) +
-        list(raw_dir.glob('*.textbundle')) +
-        list(raw_dir.glob('*.html'))
-    )
+    # One scandir walk over notes/raw/ (and its export folders) feeds the
+    # queue directly: newest notes first (by modification time) so recent
+    # material lands first
+    found = discover(raw_dir, NOTES_FORMATS, recursive=args.recursive,
+                     include=args.include, exclude=args.exclude)
+    queue = order_by_recency((item.path, item.mtime) for item in found)
 
-    if not notes_files:
+    if not queue:
         logger.info("No notes files found in notes/raw/")
         logger.info("Place .txt, .md, .docx, .textbundle, or .html files in notes/raw/ to process them")
         return 0
 
-    logger.info(f"Found {len(notes_files)} notes file(s) to process")
+    logger.info(f"Found {len(queue)} notes file(s) to process")
+    metrics.reset()
+    progress = ProgressCheckpoint(ai_dir, queue)
 
     # Process each file
     success_count = 0
     fail_count = 0
-
-    for notes_file in notes_files:
-        if process_notes_file(notes_file, raw_dir, ai_dir, processed_dir):
-            success_count += 1
-        else:
-            fail_count += 1
+    durations = {}
+
+    def committed(position, notes_file):
+        def done(ok, error):
+            nonlocal success_count, fail_count
+            if ok:
+                success_count += 1
+                processed_path = processed_dir / relative_location(notes_file, raw_dir)
+                metrics.file_done(size=processed_path.stat().st_size if processed_path.is_file() else 0)
+                record_processing('notes', processed_path, 'success', durations[notes_file])
+            else:
+                fail_count += 1
+                record_processing('notes', notes_file, 'failed', durations[notes_file], error)
+            progress.record(position, ok)
+        return done
+
+    # Outputs are staged and committed (renamed, originals moved) in batches
+    commit = StagedCommit(ai_dir, metrics=metrics)
+    with commit:
+        commit.recover()
+        for position, (notes_file, _) in enumerate(queue):
+            started = time.perf_counter()
+            staged = process_notes_file(notes_file, raw_dir, ai_dir, processed_dir,
+                                        commit=commit, on_done=committed(position, notes_file))
+            durations[notes_file] = time.perf_counter() - started
+            if not staged:
+                fail_count += 1
+                record_processing('notes', notes_file, 'failed', durations[notes_file])
+                progress.record(position, False)
+    progress.finish()
 
     # Summary
     logger.info("=" * 60)
@@ -567,10 +704,12 @@ def main():
     logger.info(f"  Failed: {fail_count}")
     logger.info(f"  Output directory: {ai_dir.absolute()}")
     logger.info(f"  Processed files moved to: {processed_dir.absolute()}")
+    metrics.log_summary(logger)
+    logger.info(f"  Metrics: {metrics.write()}")
     logger.info("=" * 60)
 
     return 0 if fail_count == 0 else 1
 
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(run_main(main, 'notes_converter'))
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling for Lumina AI script entry points
+
+Runs a script's main() under a profiler when LUMINA_PROFILE is set:
+- LUMINA_PROFILE=1 (or 'cprofile'): deterministic cProfile run, dumps a
+  .prof file loadable with pstats/snakeviz
+- LUMINA_PROFILE=sample: low-overhead sampling of the main thread, dumps
+  collapsed stacks (.folded) for flame graph tools
+Both modes write a top-N hot-function summary next to the dump in logs/.
+
+Environment Variables:
+    LUMINA_PROFILE: '1', 'true', 'yes', 'cprofile' or 'sample'
+    LUMINA_PROFILE_TOP: Number of functions in the summary (default: 25)
+    LUMINA_PROFILE_INTERVAL: Sampling interval in seconds (default: 0.005)
+
+Usage:
+    from profiling import run_main
+
+    if __name__ == '__main__':
+        sys.exit(run_main(main, 'script_name'))
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+CPROFILE_VALUES = ('1', 'true', 'yes', 'cprofile')
+SAMPLE_VALUES = ('sample', 'sampling')
+DEFAULT_TOP = 25
+DEFAULT_INTERVAL = 0.005
+
+
+def get_profile_mode() -> Optional[str]:
+    """
+    Read the requested profiling mode from LUMINA_PROFILE
+
+    Returns:
+        'cprofile', 'sample', or None when profiling is disabled
+    """
+    value = os.environ.get('LUMINA_PROFILE', '').strip().lower()
+    if value in CPROFILE_VALUES:
+        return 'cprofile'
+    if value in SAMPLE_VALUES:
+        return 'sample'
+    return None
+
+
+def _env_number(name: str, default, cast):
+    """Parse a numeric environment variable, falling back to default"""
+    try:
+        return cast(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _output_stem(name: str) -> Path:
+    """Timestamped path prefix for profile outputs in logs/"""
+    log_dir = Path(__file__).parent.parent.parent / 'logs'
+    log_dir.mkdir(exist_ok=True)
+    return log_dir / f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+
+class SamplingProfiler:
+    """Periodically samples the call stack of one thread"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        """
+        Args:
+            interval: Seconds between samples
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._target_id = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling the calling thread."""
+        self._target_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='lumina-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the sampler thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{Path(code.co_filename).name}:{code.co_name}:{code.co_firstlineno}")
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def write_folded(self, output_file: Path) -> None:
+        """Write collapsed stacks ('a;b;c count'), as used by flame graph tools."""
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+    def summary(self, top: int = DEFAULT_TOP) -> str:
+        """Top functions by own (self) and inclusive (total) samples."""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for func in set(stack):
+                total[func] += count
+
+        samples = self.samples or 1
+        lines = [
+            f"{self.samples} samples at {self.interval * 1000:g}ms intervals",
+            "",
+            f"{'self %':>7} {'total %':>8}  function",
+        ]
+        for func, count in own.most_common(top):
+            lines.append(f"{count * 100 / samples:>6.1f}% {total[func] * 100 / samples:>7.1f}%  {func}")
+        return '\n'.join(lines) + '\n'
+
+
+def run_main(main: Callable[[], Any], name: str) -> Any:
+    """
+    Run a script's main(), under a profiler if LUMINA_PROFILE is set
+
+    Args:
+        main: Entry point to call
+        name: Output name (typically the logger name)
+
+    Returns:
+        Whatever main() returns
+    """
+    mode = get_profile_mode()
+    if mode is None:
+        return main()
+
+    top = _env_number('LUMINA_PROFILE_TOP', DEFAULT_TOP, int)
+    stem = _output_stem(name)
+
+    if mode == 'cprofile':
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(main)
+        finally:
+            profile_file = stem.with_suffix('.prof')
+            profiler.dump_stats(str(profile_file))
+            buffer = io.StringIO()
+            pstats.Stats(profiler, stream=buffer).sort_stats('cumulative').print_stats(top)
+            summary_file = Path(f"{stem}_profile.txt")
+            summary_file.write_text(buffer.getvalue(), encoding='utf-8')
+            print(f"Profile written to {profile_file} (summary: {summary_file})", file=sys.stderr)
+
+    sampler = SamplingProfiler(_env_number('LUMINA_PROFILE_INTERVAL', DEFAULT_INTERVAL, float))
+    sampler.start()
+    started = time.perf_counter()
+    try:
+        return main()
+    finally:
+        sampler.stop()
+        folded_file = stem.with_suffix('.folded')
+        sampler.write_folded(folded_file)
+        summary_file = Path(f"{stem}_profile.txt")
+        summary_file.write_text(
+            f"Wall time: {time.perf_counter() - started:.2f}s\n" + sampler.summary(top),
+            encoding='utf-8'
+        )
+        print(f"Profile written to {folded_file} (summary: {summary_file})", file=sys.stderr)
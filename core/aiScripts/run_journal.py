@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Run journal for resumable batch conversions
+
+A converter appends one JSON line per file stage (started, converted,
+committed, failed) to a journal next to its raw/ directory. If the run is
+killed, the next run with the same options resumes it:
+
+- files committed before the interruption are already in processed/ and
+  are reported in the cumulative summary
+- files that failed are not retried until a fresh run
+- files that were started but not committed are reconciled (their partial
+  outputs removed, or marked committed if the commit had completed) and
+  converted again
+
+The journal is removed when a run completes. Lines are flushed as they are
+written, so a killed process loses nothing; an OS crash may lose the last
+few records, which only means those files are converted again.
+
+Usage:
+    journal = RunJournal(project_root / 'email' / RUN_JOURNAL_NAME)
+    resumed = journal.open({'since': args.since})
+    for name in journal.interrupted:
+        ...  # reconcile
+    journal.record(name, STARTED)
+    ...
+    journal.close()
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from logger import get_logger
+
+logger = get_logger('run_journal')
+
+RUN_JOURNAL_NAME = '.run-journal.jsonl'
+
+# Per-file stages, in order
+STARTED = 'started'
+CONVERTED = 'converted'
+COMMITTED = 'committed'
+FAILED = 'failed'
+FINISHED = (COMMITTED, FAILED)
+
+
+class RunJournal:
+    """Append-only per-file stage log for one batch run"""
+
+    def __init__(self, path: Path):
+        """
+        Args:
+            path: Journal file (JSON lines)
+        """
+        self.path = Path(path)
+        self.started_at: Optional[str] = None
+        # name -> (stage, reason) for this run, including resumed attempts
+        self.files: Dict[str, Tuple[str, Optional[str]]] = {}
+        # Files a previous attempt started but did not finish
+        self.interrupted: List[str] = []
+        self._file = None
+
+    def _load(self) -> Tuple[Optional[Dict[str, Any]], Dict[str, Tuple[str, Optional[str]]]]:
+        """Read an existing journal; a torn last line is ignored"""
+        header = None
+        files: Dict[str, Tuple[str, Optional[str]]] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if 'run' in record:
+                        header = record['run']
+                    elif 'file' in record:
+                        files[record['file']] = (record['stage'], record.get('reason'))
+        except OSError:
+            return None, {}
+        return header, files
+
+    def open(self, options: Dict[str, Any]) -> bool:
+        """
+        Resume an interrupted run with the same options, or start a new one
+
+        Files the previous attempt left unfinished are listed in
+        ``interrupted`` either way, for reconciliation. When the options
+        differ, the old run's finished files are not carried over.
+
+        Args:
+            options: Run options that must match to resume (e.g. filters)
+
+        Returns:
+            True if an interrupted run was resumed
+        """
+        header, files = self._load() if self.path.exists() else (None, {})
+        resumed = header is not None and header.get('options') == options
+        self.interrupted = [name for name, (last, _) in files.items() if last not in FINISHED]
+        self.files = files if resumed else {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if resumed:
+            self.started_at = header.get('started')
+            self._file = open(self.path, 'a', encoding='utf-8')
+            # Start after a torn last line rather than on it
+            if self.path.stat().st_size:
+                with open(self.path, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        self._file.write('\n')
+            logger.info(f"Resuming interrupted run from {self.started_at}")
+        else:
+            if header is not None:
+                logger.info("Options changed; starting a new run instead of resuming")
+            self.started_at = datetime.now().isoformat(timespec='seconds')
+            self._file = open(self.path, 'w', encoding='utf-8')
+            self._write({'run': {'started': self.started_at, 'options': options}})
+        return resumed
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+
+    def record(self, name: str, stage: str, reason: Optional[str] = None) -> None:
+        """Record that a file reached a stage (COMMITTED/FAILED finish it)"""
+        record = {'file': name, 'stage': stage}
+        if reason:
+            record['reason'] = reason
+        self._write(record)
+        self.files[name] = (stage, reason)
+
+    def stage(self, name: str) -> Optional[str]:
+        """Last recorded stage of a file, or None"""
+        entry = self.files.get(name)
+        return entry[0] if entry else None
+
+    def finished(self, stage: str) -> List[Tuple[str, Optional[str]]]:
+        """(name, reason) of files whose last stage is ``stage`` (e.g. COMMITTED)"""
+        return [(name, reason) for name, (last, reason) in self.files.items() if last == stage]
+
+    def close(self, complete: bool = True) -> None:
+        """
+        Close the journal; a complete run removes it
+
+        Args:
+            complete: False keeps the journal so the next run resumes
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if complete:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Recency-first scheduling and progress checkpoints for converters
+
+On a large backlog the newest material is usually the most relevant, so
+converters queue files newest first (by message Date or file mtime) and
+publish a checkpoint every N committed files. The checkpoint records how
+far back the converted corpus is complete, so summary prompts can start on
+recent data while older files are still being converted.
+
+The checkpoint is <ai_dir>/.progress.json:
+
+    {"total": 2000, "processed": 300, "succeeded": 298, "failed": 2,
+     "order": "newest_first", "covered_since": "2024-11-02T09:14:00+00:00",
+     "complete": false, "updated": "..."}
+
+Everything dated at or after covered_since has been processed. Files
+finish out of queue order when commits are batched, so the boundary only
+advances over an unbroken run of finished files from the queue's head.
+
+Usage:
+    queue = by_mtime(paths)
+    progress = ProgressCheckpoint(ai_dir, queue)
+    for position, (path, timestamp) in enumerate(queue):
+        ...
+        progress.record(position, ok)
+    progress.finish()
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from logger import get_logger
+
+logger = get_logger('scheduling')
+
+PROGRESS_FILENAME = '.progress.json'
+DEFAULT_CHECKPOINT_EVERY = 100
+
+# (path, POSIX timestamp or None when unknown)
+WorkItem = Tuple[Path, Optional[float]]
+
+
+def order_by_recency(items: Iterable[WorkItem], newest_first: bool = True) -> List[WorkItem]:
+    """
+    Order work items by timestamp; items without one always go last
+
+    Ties are broken by file name so the order is stable between runs.
+    """
+    items = list(items)
+    dated = [item for item in items if item[1] is not None]
+    undated = sorted((item for item in items if item[1] is None), key=lambda item: item[0].name)
+    dated.sort(key=lambda item: (-item[1], item[0].name) if newest_first else (item[1], item[0].name))
+    return dated + undated
+
+
+def by_mtime(paths: Iterable[Path], newest_first: bool = True) -> List[WorkItem]:
+    """Work items timestamped by file modification time"""
+    items = []
+    for path in paths:
+        try:
+            items.append((path, path.stat().st_mtime))
+        except OSError:
+            items.append((path, None))
+    return order_by_recency(items, newest_first)
+
+
+def _iso(timestamp: Optional[float]) -> Optional[str]:
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(timespec='seconds')
+
+
+class ProgressCheckpoint:
+    """Counts completed files and periodically writes .progress.json"""
+
+    def __init__(self, output_dir: Path, queue: Sequence[WorkItem], every: Optional[int] = None,
+                 newest_first: bool = True):
+        """
+        Args:
+            output_dir: Converter output directory (the checkpoint goes here)
+            queue: Work items in processing order
+            every: Files between checkpoints (default: LUMINA_CHECKPOINT_EVERY or 100)
+            newest_first: Whether the queue runs newest first
+        """
+        self.path = Path(output_dir) / PROGRESS_FILENAME
+        self.queue = queue
+        self.total = len(queue)
+        if every is None:
+            try:
+                every = int(os.environ.get('LUMINA_CHECKPOINT_EVERY', DEFAULT_CHECKPOINT_EVERY))
+            except ValueError:
+                every = DEFAULT_CHECKPOINT_EVERY
+        self.every = max(1, every)
+        self.newest_first = newest_first
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        # Queue positions finished ahead of the unbroken head
+        self._finished: Set[int] = set()
+        self._head = 0
+        # Timestamp of the last dated item in the finished head
+        self.boundary: Optional[float] = None
+        self._logged_at = -1
+
+    def record(self, position: int, ok: bool) -> None:
+        """
+        Count one finished file; checkpoint every N files
+
+        Args:
+            position: The file's index in the queue
+            ok: Whether it was converted and committed
+        """
+        self.processed += 1
+        if ok:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+
+        self._finished.add(position)
+        while self._head in self._finished:
+            self._finished.discard(self._head)
+            timestamp = self.queue[self._head][1]
+            if timestamp is not None:
+                self.boundary = timestamp
+            self._head += 1
+
+        if self.processed % self.every == 0:
+            self.write()
+
+    def write(self, complete: bool = False) -> None:
+        """Write the checkpoint (atomic replace) and log progress"""
+        key = 'covered_since' if self.newest_first else 'covered_until'
+        data = {
+            'total': self.total,
+            'processed': self.processed,
+            'succeeded': self.succeeded,
+            'failed': self.failed,
+            'order': 'newest_first' if self.newest_first else 'oldest_first',
+            key: _iso(self.boundary),
+            'complete': complete,
+            'updated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write progress checkpoint {self.path}: {e}")
+            return
+
+        # The final checkpoint often repeats the last periodic one
+        if self._logged_at != self.processed:
+            self._logged_at = self.processed
+            covered = f", covered {'back to' if self.newest_first else 'up to'} {data[key]}" if data[key] else ''
+            logger.info(f"Progress: {self.processed}/{self.total} file(s){covered}")
+
+    def finish(self) -> None:
+        """Write the final checkpoint; complete if every queued file finished"""
+        self.write(complete=self.processed >= self.total)
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Deduplicating snapshot store for Lumina project backups
+
+Backs up aiDocs/, docs/, PROJECT.md and .lumina.state (the same set as
+the original go.sh backup) without copying unchanged files:
+- File contents are stored once as read-only blobs named by SHA-256, so
+  every snapshot that contains the same file shares one copy on disk
+- Each snapshot is a small JSON manifest (path -> hash, size, mtime)
+- Files whose size and mtime match the previous snapshot are not even
+  read; only new or modified files are hashed and stored
+- Restore rewrites only files that differ from the snapshot and removes
+  files the snapshot doesn't have
+- list and prune read manifests only; prune then drops unreferenced blobs
+
+Layout:
+    backups/
+    ├── objects/ab/cdef...   # Content blobs
+    └── snapshots/<id>.json  # One manifest per snapshot
+
+Legacy full-copy backups (backups/backup_YYYYMMDD_HHMMSS/) are imported
+into the store the first time it is used. The legacy directories are left
+in place (delete them once the imported snapshots look right); the names
+already imported are recorded in backups/legacy-imported.json so they are
+not imported again, even after prune.
+
+Usage:
+    python3 core/aiScripts/snapshots.py create
+    python3 core/aiScripts/snapshots.py list
+    python3 core/aiScripts/snapshots.py restore <number|id>
+    python3 core/aiScripts/snapshots.py prune --keep 10
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .logger import get_logger
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from logger import get_logger
+
+logger = get_logger('snapshots')
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Top-level paths included in every snapshot
+BACKUP_ROOTS = ('aiDocs', 'PROJECT.md', '.lumina.state', 'docs')
+
+LEGACY_PREFIX = 'backup_'
+# Names of the legacy directories already imported, under backups/
+LEGACY_RECORD = 'legacy-imported.json'
+ID_FORMAT = '%Y%m%d_%H%M%S'
+HASH_CHUNK = 1024 * 1024
+
+# Manifest file entry: [sha256, size, mtime_ns, mode]
+FileEntry = List
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _walk_files(base: Path, root: str) -> Dict[str, os.stat_result]:
+    """Map relative paths under base/root to their stat results"""
+    found: Dict[str, os.stat_result] = {}
+    top = base / root
+    try:
+        st = top.stat()
+    except FileNotFoundError:
+        return found
+
+    if not stat.S_ISDIR(st.st_mode):
+        found[root] = st
+        return found
+
+    stack = [top]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                elif entry.is_file(follow_symlinks=False):
+                    found[Path(entry.path).relative_to(base).as_posix()] = entry.stat()
+    return found
+
+
+class SnapshotStore:
+    """Content-addressed snapshots of the project documentation"""
+
+    def __init__(self, project_root: Path = PROJECT_ROOT, backups_dir: Optional[Path] = None):
+        """
+        Args:
+            project_root: Project directory to back up and restore
+            backups_dir: Store location (default: <project_root>/backups)
+        """
+        self.project_root = Path(project_root)
+        self.backups_dir = Path(backups_dir) if backups_dir else self.project_root / 'backups'
+        self.objects_dir = self.backups_dir / 'objects'
+        self.snapshots_dir = self.backups_dir / 'snapshots'
+
+    # Blobs
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _store_blob(self, source: Path, digest: str) -> bool:
+        """Copy a file into the store unless its content is already there"""
+        target = self._object_path(digest)
+        if target.exists():
+            return False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        shutil.copyfile(source, tmp_path)
+        os.chmod(tmp_path, 0o444)
+        os.replace(tmp_path, target)
+        return True
+
+    # Manifests
+
+    def _manifest_path(self, snapshot_id: str) -> Path:
+        return self.snapshots_dir / f"{snapshot_id}.json"
+
+    def load(self, snapshot_id: str) -> dict:
+        """Read one snapshot manifest"""
+        with open(self._manifest_path(snapshot_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: dict) -> None:
+        self.snapshots_dir.mkdir(parents=True, exist_ok=True)
+        path = self._manifest_path(manifest['id'])
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def snapshot_ids(self) -> List[str]:
+        """Snapshot ids, oldest first (ids sort chronologically)"""
+        if not self.snapshots_dir.is_dir():
+            return []
+        return sorted(p.stem for p in self.snapshots_dir.glob('*.json'))
+
+    def _new_id(self, when: Optional[datetime] = None) -> str:
+        base = (when or datetime.now()).strftime(ID_FORMAT)
+        snapshot_id, n = base, 1
+        while self._manifest_path(snapshot_id).exists():
+            n += 1
+            snapshot_id = f"{base}-{n}"
+        return snapshot_id
+
+    # Operations
+
+    def create(self, source: Optional[Path] = None, snapshot_id: Optional[str] = None) -> Tuple[dict, Dict[str, int]]:
+        """
+        Snapshot the backup roots
+
+        Files whose size and mtime match the latest snapshot reuse its hash
+        without being read.
+
+        Args:
+            source: Directory to snapshot (default: the project root)
+            snapshot_id: Explicit id (default: current timestamp)
+
+        Returns:
+            (manifest, stats) where stats counts 'files', 'hashed' and 'stored'
+        """
+        source = Path(source) if source else self.project_root
+        ids = self.snapshot_ids()
+        # The size/mtime shortcut only applies to the tree the snapshots came from
+        previous = self.load(ids[-1])['files'] if ids and source == self.project_root else {}
+
+        files: Dict[str, FileEntry] = {}
+        roots = []
+        stats = {'files': 0, 'hashed': 0, 'stored': 0}
+        for root in BACKUP_ROOTS:
+            if not (source / root).exists():
+                logger.debug(f"{root} not found (skipped)")
+                continue
+            roots.append(root)
+            for rel_path, st in sorted(_walk_files(source, root).items()):
+                known = previous.get(rel_path)
+                if known and known[1] == st.st_size and known[2] == st.st_mtime_ns:
+                    digest = known[0]
+                else:
+                    digest = hash_file(source / rel_path)
+                    stats['hashed'] += 1
+                    if self._store_blob(source / rel_path, digest):
+                        stats['stored'] += 1
+                files[rel_path] = [digest, st.st_size, st.st_mtime_ns, stat.S_IMODE(st.st_mode)]
+                stats['files'] += 1
+
+        manifest = {
+            'id': snapshot_id or self._new_id(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'roots': roots,
+            'files': files,
+            'bytes': sum(entry[1] for entry in files.values()),
+        }
+        self._write_manifest(manifest)
+        return manifest, stats
+
+    def restore(self, snapshot_id: str) -> Dict[str, int]:
+        """
+        Make the project match a snapshot
+
+        For each root in the snapshot, files that differ are rewritten and
+        files the snapshot doesn't contain are removed (like the old
+        rm -rf + cp). Roots missing from the snapshot are left untouched.
+
+        Returns:
+            Counts of 'written', 'unchanged' and 'removed' files
+        """
+        manifest = self.load(snapshot_id)
+        files = manifest['files']
+        stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+
+        for root in manifest['roots']:
+            target_root = self.project_root / root
+            wanted = {p: e for p, e in files.items() if p == root or p.startswith(f"{root}/")}
+
+            # Clear a root whose type changed (file <-> directory)
+            is_file_root = root in wanted
+            if is_file_root and target_root.is_dir():
+                shutil.rmtree(target_root)
+            elif not is_file_root and target_root.is_file():
+                target_root.unlink()
+
+            current = _walk_files(self.project_root, root)
+            for rel_path in current.keys() - wanted.keys():
+                (self.project_root / rel_path).unlink()
+                stats['removed'] += 1
+
+            for rel_path, (digest, size, mtime_ns, mode) in sorted(wanted.items()):
+                st = current.get(rel_path)
+                if st is not None and st.st_size == size and (
+                        st.st_mtime_ns == mtime_ns or hash_file(self.project_root / rel_path) == digest):
+                    stats['unchanged'] += 1
+                    continue
+                self._write_file(self.project_root / rel_path, digest, mtime_ns, mode)
+                stats['written'] += 1
+
+            if not is_file_root:
+                target_root.mkdir(exist_ok=True)
+                self._remove_empty_dirs(target_root)
+
+        return stats
+
+    def _write_file(self, target: Path, digest: str, mtime_ns: int, mode: int) -> None:
+        """Atomically replace target with a blob, keeping the original mtime"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.restore.tmp")
+        shutil.copyfile(self._object_path(digest), tmp_path)
+        os.chmod(tmp_path, mode)
+        os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp_path, target)
+
+    @staticmethod
+    def _remove_empty_dirs(top: Path) -> None:
+        """Remove directories left empty by restore (but not top itself)"""
+        if not top.is_dir():
+            return
+        for directory, subdirs, filenames in os.walk(top, topdown=False):
+            if Path(directory) != top and not subdirs and not filenames:
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass
+
+    def prune(self, keep: int) -> Tuple[List[str], int]:
+        """
+        Delete all but the newest ``keep`` snapshots and unreferenced blobs
+
+        Returns:
+            (removed snapshot ids, number of blobs deleted)
+        """
+        ids = self.snapshot_ids()
+        removed = ids[:max(0, len(ids) - keep)]
+        for snapshot_id in removed:
+            self._manifest_path(snapshot_id).unlink()
+
+        referenced = set()
+        for snapshot_id in self.snapshot_ids():
+            referenced.update(entry[0] for entry in self.load(snapshot_id)['files'].values())
+
+        deleted = 0
+        if self.objects_dir.is_dir():
+            for blob in self.objects_dir.glob('*/*'):
+                if blob.parent.name + blob.name not in referenced:
+                    blob.unlink()
+                    deleted += 1
+        return removed, deleted
+
+    def import_legacy(self) -> int:
+        """
+        Convert full-copy backup_<timestamp>/ directories into snapshots
+
+        The directories themselves are never modified or removed; each one
+        is imported once.
+
+        Returns:
+            Number of backups imported
+        """
+        if not self.backups_dir.is_dir():
+            return 0
+
+        record_path = self.backups_dir / LEGACY_RECORD
+        try:
+            with open(record_path, 'r', encoding='utf-8') as f:
+                done = set(json.load(f))
+        except (OSError, ValueError):
+            done = set()
+
+        imported = 0
+        for legacy in sorted(self.backups_dir.glob(f'{LEGACY_PREFIX}*')):
+            if not legacy.is_dir() or legacy.name in done:
+                continue
+            try:
+                when = datetime.strptime(legacy.name[len(LEGACY_PREFIX):], ID_FORMAT)
+            except ValueError:
+                continue
+            manifest, _ = self.create(source=legacy, snapshot_id=self._new_id(when))
+            manifest['created'] = when.isoformat(timespec='seconds')
+            self._write_manifest(manifest)
+            done.add(legacy.name)
+            imported += 1
+        if imported:
+            tmp_path = record_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(sorted(done), f, indent=1)
+            os.replace(tmp_path, record_path)
+            logger.info(f"Imported {imported} legacy backup(s) into the snapshot store; "
+                        f"the original {LEGACY_PREFIX}* directories were kept")
+        return imported
+
+    def resolve(self, selector: str) -> Optional[str]:
+        """Snapshot id from a list number (1 = oldest) or an id"""
+        ids = self.snapshot_ids()
+        if selector.isdigit() and 1 <= int(selector) <= len(ids):
+            return ids[int(selector) - 1]
+        return selector if selector in ids else None
+
+
+def _format_size(size: int) -> str:
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def main():
+    """Command-line entry point used by go.sh"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Deduplicating backups of Lumina project state')
+    parser.add_argument('--root', type=Path, default=PROJECT_ROOT, help='Project root')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('create', help='Create a snapshot')
+    commands.add_parser('list', help='List snapshots (oldest first)')
+    restore_parser = commands.add_parser('restore', help='Restore a snapshot')
+    restore_parser.add_argument('snapshot', help='List number or snapshot id')
+    prune_parser = commands.add_parser('prune', help='Delete old snapshots')
+    prune_parser.add_argument('--keep', type=int, required=True, help='Number of newest snapshots to keep')
+    args = parser.parse_args()
+
+    store = SnapshotStore(args.root)
+    store.import_legacy()
+
+    if args.command == 'create':
+        manifest, stats = store.create()
+        for root in BACKUP_ROOTS:
+            suffix = '/' if (args.root / root).is_dir() else ''
+            if root in manifest['roots']:
+                logger.info(f"✓ Backed up {root}{suffix}")
+            else:
+                logger.warning(f"{root} not found (skipped)")
+        logger.info(
+            f"✓ Backup created: {manifest['id']} "
+            f"({stats['files']} files, {stats['hashed']} changed, {stats['stored']} new blobs)"
+        )
+        return 0
+
+    if args.command == 'list':
+        ids = store.snapshot_ids()
+        if not ids:
+            print("No backups found")
+            return 1
+        print("Available backups:\n")
+        for index, snapshot_id in enumerate(ids, 1):
+            manifest = store.load(snapshot_id)
+            created = manifest['created'].replace('T', ' ')
+            print(f"  {index}. {created}  ({snapshot_id}, {len(manifest['files'])} files, "
+                  f"{_format_size(manifest['bytes'])})")
+        return 0
+
+    if args.command == 'restore':
+        snapshot_id = store.resolve(args.snapshot)
+        if snapshot_id is None:
+            logger.error(f"Invalid backup: {args.snapshot}")
+            return 1
+        stats = store.restore(snapshot_id)
+        for root in store.load(snapshot_id)['roots']:
+            logger.info(f"✓ Restored {root}{'/' if (args.root / root).is_dir() else ''}")
+        logger.info(
+            f"✓ Restore completed: {stats['written']} written, {stats['unchanged']} unchanged, "
+            f"{stats['removed']} removed"
+        )
+        return 0
+
+    removed, deleted = store.prune(args.keep)
+    logger.info(f"Pruned {len(removed)} snapshot(s) and {deleted} unreferenced blob(s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
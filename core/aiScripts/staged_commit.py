@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Staged commit phase for converter outputs
+
+Converters write Markdown into a staging directory next to the final
+output directory. Every N files (and at the end of the run) the staged
+outputs are renamed into place and the originals moved to processed/ in
+one tight loop, instead of interleaving each move with conversion work.
+
+Each batch is recorded in a journal before anything is renamed. If the
+run dies mid-batch, recover() replays the journal at the next start, so
+every file ends up either fully committed (output in ai/, original in
+processed/) or untouched in raw/ - the same guarantee as moving each file
+right after its conversion.
+
+A run holds an exclusive lock on the staging directory from recover()
+until the end of its with block. A second run on the same output
+directory waits for it instead of recovering (and discarding) outputs
+the first run has staged but not yet committed.
+
+Usage:
+    commit = StagedCommit(ai_dir)
+    commit.recover()
+    with commit:
+        staged = commit.stage_path('note.md')
+        staged.write_text(markdown)
+        commit.add(staged, ai_dir / 'note.md', raw_file, processed_dir / raw_file.name,
+                   on_done=callback)
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no cross-process lock; runs must not overlap
+    fcntl = None
+
+try:
+    from .logger import get_logger
+except ImportError:
+    from logger import get_logger
+
+logger = get_logger('staged_commit')
+
+STAGING_DIRNAME = '.staging'
+JOURNAL_NAME = 'commit-journal.json'
+DEFAULT_BATCH_SIZE = 50
+
+# Called once per file after its batch is committed: (success, error)
+DoneCallback = Callable[[bool, Optional[str]], None]
+
+
+def _move(src: Path, dst: Path) -> None:
+    """Rename, falling back to copy+delete across filesystems"""
+    try:
+        os.rename(src, dst)
+    except OSError:
+        shutil.move(str(src), str(dst))
+
+
+def _fsync_dir(directory: Path) -> None:
+    """Persist directory entries (renames) where the platform allows it"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class StagedCommit:
+    """Batches output renames and original moves behind a recovery journal"""
+
+    def __init__(self, output_dir: Path, batch_size: Optional[int] = None, metrics=None):
+        """
+        Args:
+            output_dir: Final directory for converted outputs (e.g. notes/ai)
+            batch_size: Files per commit batch (default: LUMINA_COMMIT_BATCH or 50)
+            metrics: Optional RunMetrics; each batch is timed as stage 'commit'
+        """
+        self.output_dir = Path(output_dir)
+        self.staging_dir = self.output_dir / STAGING_DIRNAME
+        self.journal_path = self.staging_dir / JOURNAL_NAME
+        if batch_size is None:
+            try:
+                batch_size = int(os.environ.get('LUMINA_COMMIT_BATCH', DEFAULT_BATCH_SIZE))
+            except ValueError:
+                batch_size = DEFAULT_BATCH_SIZE
+        self.batch_size = max(1, batch_size)
+        self.metrics = metrics
+        self._pending: List[Tuple[Path, Path, Path, Path, Optional[DoneCallback]]] = []
+        self._sequence = 0
+        self._lock_fd: Optional[int] = None
+
+    def __enter__(self) -> 'StagedCommit':
+        self.lock()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # Staged files are complete conversions, so commit them even on error
+        try:
+            self.flush()
+        finally:
+            self.unlock()
+
+    def lock(self) -> None:
+        """Take the staging directory's exclusive lock, waiting for another run to finish"""
+        if fcntl is None or self._lock_fd is not None:
+            return
+        # The staging directory comes and goes, so its parent carries the lock
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.output_dir, os.O_RDONLY)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                logger.info(f"Another run is converting into {self.output_dir}; waiting for it to finish")
+                fcntl.flock(fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._lock_fd = fd
+
+    def unlock(self) -> None:
+        """Release the lock taken by lock(), recover() or the with block"""
+        if self._lock_fd is None:
+            return
+        fd, self._lock_fd = self._lock_fd, None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def stage_path(self, filename: str) -> Path:
+        """Unique staging path for an output that will be named ``filename``."""
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        self._sequence += 1
+        return self.staging_dir / f"{os.getpid()}-{self._sequence}-{filename}"
+
+    def add(self, staged_output: Path, output: Path, original: Path, processed: Path,
+            on_done: Optional[DoneCallback] = None) -> None:
+        """
+        Queue a converted file for the next commit batch
+
+        Args:
+            staged_output: Output written to a stage_path()
+            output: Final output path (in output_dir)
+            original: Source file in raw/
+            processed: Destination for the source file
+            on_done: Called with (success, error) once the batch is committed
+        """
+        # A full batch is committed before queuing more, never during the
+        # caller's own add(), so callers can finish bookkeeping first
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        self._pending.append((Path(staged_output), Path(output), Path(original), Path(processed), on_done))
+
+    def flush(self) -> int:
+        """
+        Commit all queued files
+
+        Returns:
+            Number of files committed successfully
+        """
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, []
+        if self.metrics is not None:
+            with self.metrics.stage('commit'):
+                results = self._commit(batch)
+        else:
+            results = self._commit(batch)
+
+        # Callbacks run after the rename loop so it stays tight
+        for (*_, on_done), error in zip(batch, results):
+            if on_done:
+                on_done(error is None, error)
+        return sum(1 for error in results if error is None)
+
+    def _commit(self, batch) -> List[Optional[str]]:
+        """Journal, then apply, one batch; returns an error (or None) per file"""
+        ops = [
+            {
+                'staged': str(staged),
+                'output': str(output),
+                'original': str(original),
+                'processed': str(processed),
+            }
+            for staged, output, original, processed, _ in batch
+        ]
+        self._write_journal(ops)
+
+        results: List[Optional[str]] = []
+        for staged, output, original, processed, _ in batch:
+            try:
+                os.replace(staged, output)
+                _move(original, processed)
+            except OSError as e:
+                logger.error(f"Commit failed for {original.name}: {e}")
+                results.append(str(e))
+                continue
+            results.append(None)
+
+        _fsync_dir(self.output_dir)
+        self.journal_path.unlink()
+        self._remove_staging_dir()
+        logger.debug(f"Committed {results.count(None)}/{len(batch)} file(s)")
+        return results
+
+    def _write_journal(self, ops: List[dict]) -> None:
+        """Durably record a batch before any rename happens"""
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.journal_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'ops': ops}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+        _fsync_dir(self.staging_dir)
+
+    def recover(self) -> int:
+        """
+        Finish a batch interrupted by a crash and discard orphaned outputs
+
+        Journaled operations are rolled forward. Staged outputs without a
+        journal entry belong to files that were never committed; their
+        originals are still in raw/, so they are simply converted again.
+
+        Takes the staging lock first (held until unlock() or the end of the
+        with block), so a run still in progress is never recovered.
+
+        Returns:
+            Number of journaled files completed
+        """
+        self.lock()
+        if not self.staging_dir.is_dir():
+            return 0
+
+        replayed = 0
+        if self.journal_path.exists():
+            try:
+                with open(self.journal_path, 'r', encoding='utf-8') as f:
+                    ops = json.load(f)['ops']
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Unreadable commit journal {self.journal_path}: {e}")
+                ops = []
+
+            for op in ops:
+                staged, output = Path(op['staged']), Path(op['output'])
+                original, processed = Path(op['original']), Path(op['processed'])
+                try:
+                    if staged.exists():
+                        os.replace(staged, output)
+                    # Only retire the original once its output is in place
+                    if output.exists() and original.exists() and not processed.exists():
+                        _move(original, processed)
+                    replayed += 1
+                except OSError as e:
+                    logger.error(f"Could not recover {original.name}: {e}")
+            self.journal_path.unlink()
+            logger.info(f"Recovered {replayed} file(s) from interrupted commit")
+
+        for orphan in self.staging_dir.iterdir():
+            logger.debug(f"Discarding uncommitted output: {orphan.name}")
+            if orphan.is_dir():
+                shutil.rmtree(orphan)
+            else:
+                orphan.unlink()
+        self._remove_staging_dir()
+        return replayed
+
+    def _remove_staging_dir(self) -> None:
+        """Remove the staging directory once nothing is staged"""
+        try:
+            self.staging_dir.rmdir()
+        except OSError:
+            pass
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+state_db.py - SQLite processing journal for Lumina projects
+
+Optional backend used by state_manager when LUMINA_STATE_BACKEND=sqlite.
+Stores one row per processed input file (hash, size, duration, status,
+error) in .lumina.db next to .lumina.state. The database runs in WAL mode,
+so several converters can write while go.sh reads history.
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS journal (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL,
+    sha256 TEXT,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    duration_ms REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    error TEXT,
+    finished_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_journal_kind_time ON journal (kind, finished_at);
+CREATE INDEX IF NOT EXISTS idx_journal_sha256 ON journal (sha256);
+CREATE INDEX IF NOT EXISTS idx_journal_status ON journal (status, finished_at);
+"""
+
+JOURNAL_COLUMNS = ('kind', 'path', 'sha256', 'bytes', 'duration_ms', 'status', 'error', 'finished_at')
+
+
+def file_sha256(path: Path, chunk_size: int = 1024 * 1024) -> Optional[str]:
+    """
+    Compute SHA-256 of a file (or of every file under a directory bundle).
+
+    Returns:
+        Hex digest, or None if the path can't be read
+    """
+    digest = hashlib.sha256()
+    try:
+        files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+        for file_path in files:
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(chunk_size), b''):
+                    digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class StateDatabase:
+    """SQLite-backed per-file processing journal"""
+
+    def __init__(self, db_path: Path, timeout: float = 30.0):
+        """
+        Open (and create if needed) the journal database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            timeout: Seconds to wait for a competing writer's lock
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(str(db_path), timeout=timeout)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def __enter__(self) -> 'StateDatabase':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record(self, kind: str, path: str, status: str, duration_ms: float = 0.0,
+               size: int = 0, sha256: Optional[str] = None, error: Optional[str] = None,
+               finished_at: Optional[str] = None) -> None:
+        """
+        Record a single processed file.
+
+        Args:
+            kind: Input type ('email', 'notes', ...)
+            path: Path of the input file
+            status: 'success' or 'failed'
+            duration_ms: Processing time in milliseconds
+            size: Input size in bytes
+            sha256: Content hash of the input
+            error: Error message for failures
+            finished_at: ISO timestamp (defaults to now, UTC)
+        """
+        self.record_many([{
+            'kind': kind, 'path': path, 'sha256': sha256, 'bytes': size,
+            'duration_ms': duration_ms, 'status': status, 'error': error,
+            'finished_at': finished_at,
+        }])
+
+    def record_many(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Record several processed files in one write transaction."""
+        now = datetime.now(timezone.utc).isoformat()
+        values = [
+            tuple(row.get(col) if col != 'finished_at' else (row.get(col) or now)
+                  for col in JOURNAL_COLUMNS)
+            for row in rows
+        ]
+        placeholders = ', '.join('?' for _ in JOURNAL_COLUMNS)
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO journal ({', '.join(JOURNAL_COLUMNS)}) VALUES ({placeholders})",
+                values
+            )
+
+    def find_by_hash(self, sha256: str) -> List[Dict[str, Any]]:
+        """Return journal entries for inputs with the given content hash."""
+        rows = self.conn.execute(
+            "SELECT * FROM journal WHERE sha256 = ? ORDER BY finished_at DESC", (sha256,)
+        )
+        return [dict(row) for row in rows]
+
+    def recent(self, kind: Optional[str] = None, status: Optional[str] = None,
+               limit: int = 20) -> List[Dict[str, Any]]:
+        """Return the most recent journal entries, optionally filtered."""
+        query = "SELECT * FROM journal WHERE 1=1"
+        params: List[Any] = []
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY finished_at DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self.conn.execute(query, params)]
+
+    def throughput(self, days: int = 7) -> List[Dict[str, Any]]:
+        """
+        Summarize processing per day and kind.
+
+        Args:
+            days: How many days of history to include
+
+        Returns:
+            Rows with day, kind, files, failed, bytes, duration_ms and
+            files_per_sec (based on processing time, not wall-clock time)
+        """
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+        rows = self.conn.execute(
+            """
+            SELECT substr(finished_at, 1, 10) AS day, kind,
+                   COUNT(*) AS files,
+                   SUM(status != 'success') AS failed,
+                   SUM(bytes) AS bytes,
+                   SUM(duration_ms) AS duration_ms
+            FROM journal
+            WHERE finished_at >= ?
+            GROUP BY day, kind
+            ORDER BY day DESC, kind
+            """,
+            (since,)
+        )
+        history = []
+        for row in rows:
+            entry = dict(row)
+            seconds = (entry['duration_ms'] or 0) / 1000.0
+            entry['files_per_sec'] = entry['files'] / seconds if seconds > 0 else None
+            history.append(entry)
+        return history
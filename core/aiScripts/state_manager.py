@@ -3,13 +3,43 @@
 state_manager.py - Manages .lumina.state file for project tracking
 
 This module provides functions to create, read, and update the project state file.
+
+Writes are atomic (temp file + rename) and serialized with an exclusive lock
+on .lumina.state.lock, so parallel converters never lose counts or truncate
+the file. Group many updates into a single read/write with a transaction:
+
+    import state_manager as state
+
+    with state.transaction():
+        for eml in files:
+            ...
+            state.increment_email_count()
+
+Set LUMINA_STATE_BACKEND=sqlite to also keep a per-file processing journal
+(hash, size, duration, status, error) in .lumina.db; see state_db.py.
 """
 
 import json
 import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: fall back to atomic writes without cross-process locking
+    fcntl = None
+
+if TYPE_CHECKING:
+    from state_db import StateDatabase
+
+# Active transaction for the current thread (see transaction())
+_local = threading.local()
 
 
 def get_state_file_path() -> Path:
@@ -18,6 +48,220 @@ def get_state_file_path() -> Path:
     return Path(__file__).parent.parent.parent / ".lumina.state"
 
 
+def get_lock_file_path() -> Path:
+    """Get the path to the lock file guarding .lumina.state."""
+    state_file = get_state_file_path()
+    return state_file.with_name(state_file.name + ".lock")
+
+
+def get_db_path() -> Path:
+    """Get the path to the .lumina.db processing journal."""
+    return get_state_file_path().with_name(".lumina.db")
+
+
+def sqlite_enabled() -> bool:
+    """Whether the SQLite journal backend is enabled (LUMINA_STATE_BACKEND=sqlite)."""
+    return os.environ.get('LUMINA_STATE_BACKEND', '').lower() == 'sqlite'
+
+
+def _state_db():
+    """Import the SQLite journal module on first use (sqlite3/hashlib stay off the startup path)."""
+    try:
+        from . import state_db
+    except ImportError:
+        sys.path.insert(0, str(Path(__file__).parent))
+        import state_db
+    return state_db
+
+
+def _open_journal() -> 'StateDatabase':
+    """Return this thread's journal connection, opening it on first use."""
+    db = getattr(_local, 'journal', None)
+    if db is None or db.db_path != get_db_path():
+        db = _state_db().StateDatabase(get_db_path())
+        _local.journal = db
+    return db
+
+
+def record_processing(
+    kind: str,
+    path: Union[str, Path],
+    status: str,
+    duration: float = 0.0,
+    error: Optional[str] = None
+) -> bool:
+    """
+    Record one processed input file in the SQLite journal.
+
+    Does nothing unless the SQLite backend is enabled. The file's size and
+    content hash are read from ``path``, so pass its current location (e.g.
+    the processed/ path after a successful move).
+
+    Args:
+        kind: Input type ('email' or 'notes')
+        path: Current path of the input file
+        status: 'success' or 'failed'
+        duration: Processing time in seconds
+        error: Error message for failures
+
+    Returns:
+        True if the entry was recorded, False if disabled or on error
+    """
+    if not sqlite_enabled():
+        return False
+
+    import sqlite3
+
+    path = Path(path)
+    try:
+        size = path.stat().st_size if path.is_file() else sum(
+            p.stat().st_size for p in path.rglob('*') if p.is_file()
+        )
+    except OSError:
+        size = 0
+
+    try:
+        _open_journal().record(
+            kind=kind,
+            path=str(path),
+            status=status,
+            duration_ms=duration * 1000.0,
+            size=size,
+            sha256=_state_db().file_sha256(path),
+            error=error
+        )
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def get_throughput_history(days: int = 7) -> List[Dict[str, Any]]:
+    """
+    Per-day processing history from the SQLite journal.
+
+    Returns:
+        List of rows (see StateDatabase.throughput), or an empty list if the
+        journal doesn't exist
+    """
+    if not get_db_path().exists():
+        return []
+
+    import sqlite3
+
+    try:
+        return _open_journal().throughput(days)
+    except sqlite3.Error:
+        return []
+
+
+@contextmanager
+def _state_lock() -> Iterator[None]:
+    """Hold an exclusive inter-process lock on the state file."""
+    if fcntl is None:
+        yield
+        return
+
+    with open(get_lock_file_path(), 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _write_state(state: Dict[str, Any]) -> None:
+    """
+    Atomically replace the state file.
+
+    The new content is written to a temp file in the same directory, flushed
+    to disk, and renamed over .lumina.state, so readers see either the old
+    or the new state and never a partially written file.
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    state_file = get_state_file_path()
+    fd, tmp_path = tempfile.mkstemp(dir=state_file.parent, prefix=".lumina.state.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(state, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, state_file)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class _Transaction:
+    """In-memory state shared by nested updates until the outermost commit."""
+
+    def __init__(self, state: Optional[Dict[str, Any]]):
+        self.state = state
+        self.depth = 1
+        self.dirty = False
+
+
+@contextmanager
+def transaction() -> Iterator[Optional[Dict[str, Any]]]:
+    """
+    Batch state updates into a single locked read and atomic write.
+
+    The state file is locked and read once on entry. update_state() and the
+    increment helpers called inside the block modify the in-memory copy, and
+    the outermost transaction writes it back once on successful exit. If the
+    block raises, pending changes are discarded. Transactions nest.
+
+    Yields:
+        The mutable state dictionary, or None if the state file doesn't exist
+        or is malformed
+
+    Raises:
+        OSError: If the final write fails
+    """
+    active = getattr(_local, 'transaction', None)
+    if active is not None:
+        active.depth += 1
+        try:
+            yield active.state
+        finally:
+            active.depth -= 1
+        return
+
+    with _state_lock():
+        txn = _Transaction(read_state())
+        _local.transaction = txn
+        try:
+            yield txn.state
+            if txn.dirty and txn.state is not None:
+                _write_state(txn.state)
+        finally:
+            _local.transaction = None
+
+
+def _apply_updates(state: Dict[str, Any], updates: Dict[str, Any]) -> None:
+    """Apply dot-notation updates to a state dictionary in place."""
+    # Update last_updated timestamp
+    state["last_updated"] = datetime.now(timezone.utc).isoformat()
+
+    for key, value in updates.items():
+        if '.' in key:
+            # Handle nested keys like "operations.emails_processed_count"
+            parts = key.split('.')
+            target = state
+            for part in parts[:-1]:
+                if part not in target:
+                    target[part] = {}
+                target = target[part]
+            target[parts[-1]] = value
+        else:
+            # Top-level key
+            state[key] = value
+
+
 def create_state_file(
     project_name: str,
     customer_name: str,
@@ -64,9 +308,8 @@ def create_state_file(
         }
     }
 
-    state_file = get_state_file_path()
-    with open(state_file, 'w') as f:
-        json.dump(state, f, indent=2)
+    with _state_lock():
+        _write_state(state)
 
 
 def read_state() -> Optional[Dict[str, Any]]:
@@ -92,6 +335,9 @@ def update_state(updates: Dict[str, Any]) -> bool:
     """
     Update specific fields in the state file, preserving unknown keys.
 
+    Inside a transaction() the change is applied in memory and written when
+    the transaction commits; otherwise it is written immediately.
+
     Args:
         updates: Dictionary with keys to update (supports nested keys with dot notation)
                  Example: {"operations.emails_processed_count": 5}
@@ -99,58 +345,46 @@ def update_state(updates: Dict[str, Any]) -> bool:
     Returns:
         True if successful, False if state file doesn't exist or is malformed
     """
-    state = read_state()
-
-    if state is None:
+    try:
+        with transaction() as state:
+            if state is None:
+                return False
+            _apply_updates(state, updates)
+            _local.transaction.dirty = True
+        return True
+    except OSError:
         return False
 
-    # Update last_updated timestamp
-    state["last_updated"] = datetime.now(timezone.utc).isoformat()
 
-    # Apply updates
-    for key, value in updates.items():
-        if '.' in key:
-            # Handle nested keys like "operations.emails_processed_count"
-            parts = key.split('.')
-            target = state
-            for part in parts[:-1]:
-                if part not in target:
-                    target[part] = {}
-                target = target[part]
-            target[parts[-1]] = value
-        else:
-            # Top-level key
-            state[key] = value
-
-    # Write back to file
-    state_file = get_state_file_path()
+def _increment_count(count_key: str, timestamp_key: str, amount: int) -> bool:
+    """Increment an operations counter and stamp its timestamp under one lock."""
     try:
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
-        return True
-    except IOError:
+        with transaction() as state:
+            if state is None:
+                return False
+
+            now = datetime.now(timezone.utc).isoformat()
+            current_count = state.get("operations", {}).get(count_key, 0)
+
+            return update_state({
+                f"operations.{count_key}": current_count + amount,
+                f"operations.{timestamp_key}": now
+            })
+    except OSError:
         return False
 
 
-def increment_email_count() -> bool:
+def increment_email_count(amount: int = 1) -> bool:
     """
     Increment the emails_processed_count and update last_email_processed timestamp.
 
+    Args:
+        amount: Number of emails to add to the count
+
     Returns:
         True if successful, False otherwise
     """
-    state = read_state()
-
-    if state is None:
-        return False
-
-    now = datetime.now(timezone.utc).isoformat()
-    current_count = state.get("operations", {}).get("emails_processed_count", 0)
-
-    return update_state({
-        "operations.emails_processed_count": current_count + 1,
-        "operations.last_email_processed": now
-    })
+    return _increment_count("emails_processed_count", "last_email_processed", amount)
 
 
 def update_summary_timestamp() -> bool:
@@ -166,25 +400,17 @@ def update_summary_timestamp() -> bool:
     })
 
 
-def increment_notes_count() -> bool:
+def increment_notes_count(amount: int = 1) -> bool:
     """
     Increment the notes_processed_count and update last_notes_processed timestamp.
 
+    Args:
+        amount: Number of notes to add to the count
+
     Returns:
         True if successful, False otherwise
     """
-    state = read_state()
-
-    if state is None:
-        return False
-
-    now = datetime.now(timezone.utc).isoformat()
-    current_count = state.get("operations", {}).get("notes_processed_count", 0)
-
-    return update_state({
-        "operations.notes_processed_count": current_count + 1,
-        "operations.last_notes_processed": now
-    })
+    return _increment_count("notes_processed_count", "last_notes_processed", amount)
 
 
 def display_state() -> None:
@@ -249,6 +475,16 @@ def display_state() -> None:
         except ValueError:
             pass
 
+    # Display throughput history from the SQLite journal, if present
+    history = get_throughput_history()
+    if history:
+        print("   Throughput (last 7 days):")
+        for row in history:
+            rate = f", {row['files_per_sec']:.1f} files/s" if row['files_per_sec'] else ""
+            failed = f", {row['failed']} failed" if row['failed'] else ""
+            size_mb = (row['bytes'] or 0) / (1024 * 1024)
+            print(f"     {row['day']} {row['kind']}: {row['files']} file(s), {size_mb:.1f} MB{rate}{failed}")
+
     print()  # Empty line for spacing
 
 
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Supervised conversion worker with per-file time and memory limits
+
+A single malformed HTML email or decompression bomb can hang html2text
+or exhaust memory, stalling a serial conversion loop. Converters run
+their risky parsing steps through a Supervisor instead of calling them
+directly: the call executes in a long-lived worker process, and the
+parent kills the worker if the call exceeds a wall-clock timeout or the
+worker's resident memory exceeds a cap. The next call starts a fresh
+worker, so the rest of the batch carries on.
+
+Limits (environment):
+    LUMINA_FILE_TIMEOUT      Seconds per call (default 120; 0 runs calls
+                             in-process without supervision)
+    LUMINA_FILE_MAX_RSS_MB   Worker resident memory cap (default 1024)
+
+Memory is sampled from /proc on Linux, or with psutil if installed;
+elsewhere only the timeout applies.
+
+Offending inputs raise ResourceLimitExceeded; converters move them to a
+failed/ directory with quarantine() so they are not retried every run.
+
+Email attachment documents are converted in their own process pool (see
+emailToMd/attachment_text.py), which applies the same limits while
+waiting but drops a failing attachment rather than the whole message.
+
+Usage:
+    supervisor = get_supervisor()
+    try:
+        text = supervisor.call(parse_html, path)
+    except ResourceLimitExceeded as e:
+        quarantine(path, failed_dir, str(e))
+"""
+
+import atexit
+import multiprocessing
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+try:
+    from .logger import get_logger
+    from .checkDependencies import is_available, lazy_import
+    from . import metrics as metrics_module
+except ImportError:
+    from logger import get_logger
+    from checkDependencies import is_available, lazy_import
+    import metrics as metrics_module
+
+logger = get_logger('supervisor')
+
+DEFAULT_TIMEOUT = 120.0
+DEFAULT_MAX_RSS_MB = 1024
+# How often the parent checks the worker's memory while waiting
+POLL_INTERVAL = 0.1
+
+
+class ResourceLimitExceeded(Exception):
+    """A file exceeded a per-file resource limit and should be quarantined"""
+
+
+class FileTimeout(ResourceLimitExceeded):
+    """Conversion ran past the wall-clock timeout"""
+
+
+class FileMemoryExceeded(ResourceLimitExceeded):
+    """Conversion pushed the worker past the memory cap"""
+
+
+class WorkerCrashed(ResourceLimitExceeded):
+    """The worker process died during conversion (e.g. killed by the OS)"""
+
+
+class ArchiveLimitExceeded(ResourceLimitExceeded):
+    """An archive member is too large or too highly compressed to expand"""
+
+
+def _env_number(name: str, default, cast):
+    try:
+        return cast(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def file_limits() -> Tuple[float, int]:
+    """
+    Per-file limits from the environment
+
+    Returns:
+        (timeout in seconds, 0 or less for none; memory cap in bytes)
+    """
+    timeout = _env_number('LUMINA_FILE_TIMEOUT', DEFAULT_TIMEOUT, float)
+    max_rss = _env_number('LUMINA_FILE_MAX_RSS_MB', DEFAULT_MAX_RSS_MB, int) * 1024 * 1024
+    return timeout, max_rss
+
+
+def rss_bytes(pid: int) -> Optional[int]:
+    """Resident set size of a process, or None if it cannot be measured"""
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    if is_available('psutil'):
+        try:
+            return lazy_import('psutil').Process(pid).memory_info().rss
+        except Exception:
+            return None
+    return None
+
+
+def _worker_loop(conn) -> None:
+    """Worker: run calls until told to stop, returning results and metrics"""
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        func, args, kwargs = task
+        try:
+            outcome = ('ok', func(*args, **kwargs))
+        except Exception as e:
+            outcome = ('error', e)
+        taken = metrics_module.take_all()
+        try:
+            conn.send((outcome, taken))
+        except Exception as e:
+            # Unpicklable result or exception
+            conn.send((('error', RuntimeError(f"{type(e).__name__}: {e}")), taken))
+
+
+class Supervisor:
+    """Runs calls in a worker process under time and memory limits"""
+
+    def __init__(self, timeout: Optional[float] = None, max_rss_mb: Optional[int] = None):
+        """
+        Args:
+            timeout: Seconds per call (default: LUMINA_FILE_TIMEOUT or 120);
+                     0 or less disables supervision
+            max_rss_mb: Worker memory cap in MB (default: LUMINA_FILE_MAX_RSS_MB or 1024)
+        """
+        default_timeout, default_max_rss = file_limits()
+        self.timeout = timeout if timeout is not None else default_timeout
+        self.max_rss = max_rss_mb * 1024 * 1024 if max_rss_mb is not None else default_max_rss
+        self._process = None
+        self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.timeout > 0
+
+    def _start(self) -> None:
+        # Spawned, not forked: the parent's logger runs a queue thread
+        context = multiprocessing.get_context('spawn')
+        parent_conn, child_conn = context.Pipe()
+        self._process = context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+
+    def _kill(self) -> None:
+        if self._process is not None:
+            self._process.kill()
+            self._process.join()
+        if self._conn is not None:
+            self._conn.close()
+        self._process = None
+        self._conn = None
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) in the worker and return its result
+
+        func must be a module-level function; arguments and result must be
+        picklable. Exceptions raised by func are re-raised here.
+
+        Raises:
+            FileTimeout, FileMemoryExceeded, WorkerCrashed: The worker was
+                stopped; the next call starts a new one
+        """
+        if not self.enabled:
+            return func(*args, **kwargs)
+        if self._process is None or not self._process.is_alive():
+            self._kill()
+            self._start()
+
+        self._conn.send((func, args, kwargs))
+        deadline = time.monotonic() + self.timeout
+        while not self._conn.poll(POLL_INTERVAL):
+            if not self._process.is_alive():
+                code = self._process.exitcode
+                self._kill()
+                raise WorkerCrashed(f"Conversion worker exited with code {code}")
+            rss = rss_bytes(self._process.pid)
+            if rss is not None and rss > self.max_rss:
+                self._kill()
+                raise FileMemoryExceeded(
+                    f"Conversion exceeded the memory limit ({rss // (1024 * 1024)} MB > "
+                    f"{self.max_rss // (1024 * 1024)} MB)"
+                )
+            if time.monotonic() > deadline:
+                self._kill()
+                raise FileTimeout(f"Conversion exceeded the {self.timeout:g}s time limit")
+
+        try:
+            (status, value), taken = self._conn.recv()
+        except EOFError:
+            code = self._process.exitcode
+            self._kill()
+            raise WorkerCrashed(f"Conversion worker exited with code {code}")
+
+        for name, data in taken.items():
+            metrics_module.get_metrics(name).merge(data['timings'], data['counters'])
+        if status == 'error':
+            raise value
+        return value
+
+    def close(self) -> None:
+        """Stop the worker"""
+        if self._process is None:
+            return
+        try:
+            self._conn.send(None)
+            self._process.join(timeout=5)
+        except OSError:
+            pass
+        self._kill()
+
+
+_supervisor: Optional[Supervisor] = None
+
+
+def get_supervisor() -> Supervisor:
+    """Shared Supervisor for this process, stopped at exit"""
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = Supervisor()
+        atexit.register(_supervisor.close)
+    return _supervisor
+
+
+def quarantine(path: Path, failed_dir: Path, reason: str, raw_dir: Optional[Path] = None) -> Optional[Path]:
+    """
+    Move an offending input to failed_dir with a note of why
+
+    Args:
+        path: Input file or bundle directory
+        failed_dir: Quarantine directory (e.g. notes/failed/)
+        reason: Written to <name>.reason.txt next to it
+        raw_dir: Directory path was found under; a nested input keeps its
+                 folders under failed_dir, so same-named notes from
+                 different export folders don't overwrite each other
+
+    Returns:
+        New location, or None if the move failed
+    """
+    path = Path(path)
+    try:
+        relative = path.relative_to(raw_dir) if raw_dir is not None else Path(path.name)
+    except ValueError:
+        relative = Path(path.name)
+    destination = Path(failed_dir) / relative
+    try:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(path), str(destination))
+        destination.with_name(f"{path.name}.reason.txt").write_text(reason + '\n', encoding='utf-8')
+    except OSError as e:
+        logger.error(f"Could not quarantine {path.name}: {e}")
+        return None
+    logger.warning(f"Quarantined {relative.as_posix()} to {failed_dir}: {reason}")
+    return destination
@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+Watch daemon for Lumina raw/ directories
+
+Keeps one interpreter running and converts files as they are dropped into
+email/raw/ or notes/raw/, using the converters' own per-file functions
+(process_email_file, process_notes_file). Converter modules and their
+optional dependencies are loaded once, so each new file only pays for its
+own conversion.
+
+- Linux: inotify wakes the daemon as soon as a raw/ directory changes
+  (notes/raw/ is watched with its export subfolders, which are walked too)
+- Elsewhere (or with --poll): the directories are rescanned periodically
+- Bursts are debounced: a file is converted once its size and mtime have
+  been stable for --debounce seconds, and all ready files go as one batch
+- .lumina.state counts are updated once per batch
+- Each batch holds the output directory's StagedCommit lock, so a
+  converter run started from go.sh and the daemon never convert or move
+  the same raw files at the same time
+
+Usage:
+    python3 core/aiScripts/watch.py [--poll] [--interval 2] [--debounce 1]
+    python3 core/aiScripts/watch.py --once   # convert what's there and exit
+"""
+
+import os
+import select
+import signal
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+try:
+    from .logger import get_logger
+    from . import state_manager
+    from .discovery import EMAIL_FORMATS, NOTES_FORMATS, discover
+    from .staged_commit import StagedCommit
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent))
+    from logger import get_logger
+    import state_manager
+    from discovery import EMAIL_FORMATS, NOTES_FORMATS, discover
+    from staged_commit import StagedCommit
+
+logger = get_logger('watch')
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# inotify event masks (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+# Signature used to decide that a file has stopped changing
+Signature = Tuple[int, int]
+
+
+class PollingWatcher:
+    """Fallback watcher: wakes up every interval and lets the caller rescan"""
+
+    name = 'polling'
+
+    def __init__(self, directories: List[Path], interval: float = 2.0):
+        self.directories = directories
+        self.interval = interval
+
+    def wait(self, timeout: Optional[float]) -> None:
+        """Sleep until the next scan is due."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify watcher (via libc, no third-party packages)"""
+
+    name = 'inotify'
+
+    def __init__(self, directories: List[Path], recursive: Tuple[Path, ...] = ()):
+        """
+        Args:
+            directories: Directories to watch
+            recursive: Those of the directories whose subfolders are watched
+                       too (new subfolders are added as they appear)
+
+        Raises:
+            OSError: If inotify is unavailable on this system
+        """
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("inotify is not available")
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._libc = libc
+        self.recursive = tuple(recursive)
+        for directory in directories:
+            if libc.inotify_add_watch(self.fd, str(directory).encode(), WATCH_MASK) < 0:
+                errno = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(errno, f"Cannot watch {directory}")
+        self._watch_subfolders()
+
+    def _watch_subfolders(self) -> None:
+        """Add watches for the recursive directories' subfolders (re-adding is a no-op)"""
+        for root in self.recursive:
+            for current, subdirs, _ in os.walk(root):
+                # Hidden folders (.staging, caches) are not inputs
+                subdirs[:] = [name for name in subdirs if not name.startswith('.')]
+                for name in subdirs:
+                    # A folder that vanished or can't be watched is picked up by the next rescan
+                    self._libc.inotify_add_watch(self.fd, os.path.join(current, name).encode(), WATCH_MASK)
+
+    def wait(self, timeout: Optional[float]) -> None:
+        """Block until a watched directory changes or timeout expires."""
+        try:
+            readable, _, _ = select.select([self.fd], [], [], timeout)
+        except InterruptedError:
+            return
+        if readable:
+            # The caller rescans, so the events only need draining
+            try:
+                while os.read(self.fd, 65536):
+                    pass
+            except BlockingIOError:
+                pass
+            self._watch_subfolders()
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def create_watcher(directories: List[Path], poll: bool = False, interval: float = 2.0,
+                   recursive: Tuple[Path, ...] = ()):
+    """
+    Create an inotify watcher, falling back to polling
+
+    Args:
+        directories: Directories to watch
+        recursive: Those of the directories whose subfolders are watched too
+        poll: Force polling
+        interval: Polling interval in seconds
+
+    Returns:
+        InotifyWatcher or PollingWatcher
+    """
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directories, recursive)
+        except OSError as e:
+            logger.warning(f"inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(directories, interval)
+
+
+def _signature(path: Path) -> Optional[Signature]:
+    """Size and latest mtime of a file, or of all files in a bundle directory"""
+    try:
+        if path.is_dir():
+            stats = [p.stat() for p in path.rglob('*') if p.is_file()]
+            return (sum(s.st_size for s in stats), max((s.st_mtime_ns for s in stats), default=0))
+        stat = path.stat()
+        return (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        return None
+
+
+class Debouncer:
+    """Tracks candidate files until they have been unchanged long enough"""
+
+    def __init__(self, quiet_period: float = 1.0):
+        """
+        Args:
+            quiet_period: Seconds a file must stay unchanged before it's ready
+        """
+        self.quiet_period = quiet_period
+        self._seen: Dict[Path, Tuple[Signature, float]] = {}
+
+    def update(self, paths: List[Path], now: Optional[float] = None) -> List[Path]:
+        """
+        Record the current candidates and return the ones that are ready
+
+        Args:
+            paths: Files currently present in the raw/ directories
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Returns:
+            Paths whose signature hasn't changed for the quiet period
+        """
+        now = time.monotonic() if now is None else now
+        ready = []
+        current = {}
+        for path in paths:
+            signature = _signature(path)
+            if signature is None:
+                continue
+            previous = self._seen.get(path)
+            if previous is None or previous[0] != signature:
+                current[path] = (signature, now)
+            else:
+                current[path] = previous
+                if now - previous[1] >= self.quiet_period:
+                    ready.append(path)
+        self._seen = current
+        return ready
+
+    def next_deadline(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds until the next pending file could become ready, or None."""
+        if not self._seen:
+            return None
+        now = time.monotonic() if now is None else now
+        oldest_change = min(changed for _, changed in self._seen.values())
+        return max(0.0, oldest_change + self.quiet_period - now)
+
+    def forget(self, path: Path) -> None:
+        """Stop tracking a file (e.g. after it failed to convert)."""
+        self._seen.pop(path, None)
+
+
+class WatchDaemon:
+    """Converts files dropped into email/raw/ and notes/raw/"""
+
+    def __init__(self, project_root: Path = PROJECT_ROOT, poll: bool = False,
+                 interval: float = 2.0, debounce: float = 1.0,
+                 kinds: Tuple[str, ...] = ('email', 'notes')):
+        """
+        Args:
+            project_root: Lumina project root
+            poll: Use polling instead of inotify
+            interval: Polling interval in seconds
+            debounce: Quiet period before a file is converted
+            kinds: Which raw/ directories to watch ('email', 'notes')
+        """
+        self.project_root = project_root
+        self.poll = poll
+        self.interval = interval
+        self.debouncer = Debouncer(debounce)
+        self.handlers: Dict[str, Callable[[Path], bool]] = {}
+        self.raw_dirs: Dict[str, Path] = {}
+        self.formats: Dict[str, Dict[str, str]] = {}
+        # Raw directories whose export subfolders are scanned too
+        self.recursive: Dict[str, bool] = {}
+        # Output-directory locks shared with the converters' staged commits
+        self.commits: Dict[str, StagedCommit] = {}
+        # Worker pools etc. closed when the daemon stops
+        self._closers: List[Callable[[], None]] = []
+        # Files that failed: skipped until they change (signature differs)
+        self.failed: Dict[Path, Optional[Signature]] = {}
+        self._stop = False
+        self._waiting = False
+
+        for kind in kinds:
+            setup = getattr(self, f'_setup_{kind}')
+            try:
+                setup()
+            except SystemExit:
+                # eml_to_md_converter exits at import when html2text is missing
+                logger.error(f"Not watching {kind}: converter dependencies missing")
+
+    def _setup_email(self) -> None:
+        """Load the email converter and prepare its directories"""
+        sys.path.insert(0, str(Path(__file__).parent / 'emailToMd'))
+        import eml_to_md_converter as converter
+
+        base = self.project_root / 'email'
+        dirs = {name: base / name for name in ('raw', 'ai', 'processed', 'attachments')}
+        for directory in dirs.values():
+            directory.mkdir(parents=True, exist_ok=True)
+
+        # Compact mode keeps learning signatures/disclaimers while watching
+        compactor = None
+        if converter.compact_mode_enabled():
+            compactor = converter.BoilerplateLearner(base / converter.COMPACT_PROFILE_NAME)
+        # Workers are started on the first document and stopped at exit
+        attachment_text = None
+        if converter.attachment_text_enabled():
+            attachment_text = converter.AttachmentText(dirs['attachments'], dirs['ai'], metrics=converter.metrics)
+            self._closers.append(attachment_text.close)
+
+        def handle(path: Path) -> bool:
+            success, _ = converter.process_email_file(path, dirs['ai'], dirs['processed'], dirs['attachments'],
+                                                      compactor=compactor, attachment_text=attachment_text)
+            if compactor is not None:
+                compactor.save()
+            return success
+
+        self.raw_dirs['email'] = dirs['raw']
+        self.commits['email'] = StagedCommit(dirs['ai'])
+        self.formats['email'] = EMAIL_FORMATS
+        self.handlers['email'] = handle
+
+    def _setup_notes(self) -> None:
+        """Load the notes converter and prepare its directories"""
+        sys.path.insert(0, str(Path(__file__).parent / 'notesToMd'))
+        import notes_to_md_converter as converter
+
+        base = self.project_root / 'notes'
+        dirs = {name: base / name for name in ('raw', 'ai', 'processed')}
+        for directory in dirs.values():
+            directory.mkdir(parents=True, exist_ok=True)
+
+        def handle(path: Path) -> bool:
+            started = time.perf_counter()
+            # Nested notes keep their folders under processed/
+            processed_path = dirs['processed'] / converter.relative_location(path, dirs['raw'])
+            if converter.process_notes_file(path, dirs['raw'], dirs['ai'], dirs['processed']):
+                converter.metrics.file_done()
+                state_manager.record_processing('notes', processed_path, 'success',
+                                                time.perf_counter() - started)
+                return True
+            state_manager.record_processing('notes', path, 'failed', time.perf_counter() - started)
+            return False
+
+        self.raw_dirs['notes'] = dirs['raw']
+        self.commits['notes'] = StagedCommit(dirs['ai'])
+        self.formats['notes'] = NOTES_FORMATS
+        self.recursive['notes'] = True
+        self.handlers['notes'] = handle
+
+    def scan(self) -> List[Tuple[str, Path]]:
+        """List convertible files currently in the raw/ directories."""
+        found = []
+        for kind, raw_dir in self.raw_dirs.items():
+            recursive = self.recursive.get(kind, False)
+            found.extend((kind, item.path) for item in discover(raw_dir, self.formats[kind], recursive=recursive))
+        return found
+
+    def process_ready(self) -> Dict[str, int]:
+        """
+        Convert every file that has settled
+
+        Returns:
+            Number of successfully converted files per kind
+        """
+        candidates = []
+        for kind, path in self.scan():
+            if path in self.failed and self.failed[path] == _signature(path):
+                continue
+            self.failed.pop(path, None)
+            candidates.append((kind, path))
+
+        kinds = {path: kind for kind, path in candidates}
+        ready = self.debouncer.update([path for _, path in candidates])
+        counts = {kind: 0 for kind in self.handlers}
+        if not ready:
+            return counts
+
+        logger.info(f"Converting {len(ready)} new file(s)")
+        for kind in self.handlers:
+            batch = sorted(path for path in ready if kinds[path] == kind)
+            if not batch:
+                continue
+            # Waits for a converter run on the same directory, and finishes
+            # a commit batch it left interrupted
+            with self.commits[kind] as commit:
+                commit.recover()
+                for path in batch:
+                    self.debouncer.forget(path)
+                    if not path.exists():
+                        # Converted by the run we waited for
+                        continue
+                    try:
+                        success = self.handlers[kind](path)
+                    except Exception as e:
+                        logger.error(f"Unexpected error converting {path.name}: {e}", exc_info=True)
+                        success = False
+                    if success:
+                        counts[kind] += 1
+                    else:
+                        self.failed[path] = _signature(path)
+
+        self._update_state(counts)
+        return counts
+
+    def _update_state(self, counts: Dict[str, int]) -> None:
+        """Add a batch's counts to .lumina.state in a single write"""
+        if not any(counts.values()) or not state_manager.get_state_file_path().exists():
+            return
+        with state_manager.transaction():
+            if counts.get('email'):
+                state_manager.increment_email_count(counts['email'])
+            if counts.get('notes'):
+                state_manager.increment_notes_count(counts['notes'])
+
+    def close(self) -> None:
+        """Stop attachment workers and other resources held between batches"""
+        closers, self._closers = self._closers, []
+        for close in closers:
+            close()
+
+    def stop(self, *_args) -> None:
+        """Signal handler: exit now if idle, otherwise after the current batch."""
+        self._stop = True
+        if self._waiting:
+            raise KeyboardInterrupt
+
+    def run(self, once: bool = False) -> int:
+        """
+        Watch and convert until stopped
+
+        Args:
+            once: Convert the files already present and return
+
+        Returns:
+            Exit code
+        """
+        if not self.handlers:
+            logger.error("Nothing to watch")
+            return 1
+
+        if once:
+            # Files already present are complete; skip the quiet period
+            self.debouncer.quiet_period = 0.0
+            self.debouncer.update([path for _, path in self.scan()])
+            try:
+                self.process_ready()
+            finally:
+                self.close()
+            return 0
+
+        recursive = tuple(raw_dir for kind, raw_dir in self.raw_dirs.items() if self.recursive.get(kind))
+        watcher = create_watcher(list(self.raw_dirs.values()), self.poll, self.interval, recursive)
+        logger.info(f"Watching {', '.join(str(d) for d in self.raw_dirs.values())} ({watcher.name})")
+        logger.info("Press Ctrl+C to stop")
+
+        try:
+            while not self._stop:
+                self.process_ready()
+                self._waiting = True
+                try:
+                    watcher.wait(self.debouncer.next_deadline())
+                finally:
+                    self._waiting = False
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+            self.close()
+            logger.info("Watch stopped")
+        return 0
+
+
+def main():
+    """Run the watch daemon"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='Convert files as they are dropped into email/raw/ and notes/raw/',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Watch both raw/ directories (inotify on Linux, polling elsewhere)
+  python3 core/aiScripts/watch.py
+
+  # Only notes, polling every 5 seconds
+  python3 core/aiScripts/watch.py --only notes --poll --interval 5
+        """
+    )
+    parser.add_argument('--poll', action='store_true', help='Poll instead of using inotify')
+    parser.add_argument('--interval', type=float, default=2.0, help='Polling interval in seconds (default: 2)')
+    parser.add_argument('--debounce', type=float, default=1.0,
+                        help='Seconds a file must be unchanged before converting (default: 1)')
+    parser.add_argument('--only', choices=('email', 'notes'), help='Watch only one raw/ directory')
+    parser.add_argument('--once', action='store_true', help='Convert files already present and exit')
+    args = parser.parse_args()
+
+    daemon = WatchDaemon(
+        poll=args.poll,
+        interval=args.interval,
+        debounce=args.debounce,
+        kinds=(args.only,) if args.only else ('email', 'notes')
+    )
+    signal.signal(signal.SIGTERM, daemon.stop)
+    signal.signal(signal.SIGINT, daemon.stop)
+    return daemon.run(once=args.once)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -57,6 +57,21 @@ run_suite "Shell Script Tests" "bash '$SCRIPT_DIR/test_scripts.sh'"
 run_suite "Email Converter Tests" "python3 '$SCRIPT_DIR/test_email_converter.py'"
 run_suite "Notes Converter Tests" "python3 '$SCRIPT_DIR/test_notes_converter.py'"
 run_suite "Task Detector Tests" "python3 '$SCRIPT_DIR/test_task_detector.py'"
+run_suite "State Manager Tests" "python3 '$SCRIPT_DIR/test_state_manager.py'"
+run_suite "Metrics Tests" "python3 '$SCRIPT_DIR/test_metrics.py'"
+run_suite "Logger Tests" "python3 '$SCRIPT_DIR/test_logger.py'"
+run_suite "Watch Daemon Tests" "python3 '$SCRIPT_DIR/test_watch.py'"
+run_suite "Staged Commit Tests" "python3 '$SCRIPT_DIR/test_staged_commit.py'"
+run_suite "PDF Export Tests" "python3 '$SCRIPT_DIR/test_export_pdf.py'"
+run_suite "Snapshot Store Tests" "python3 '$SCRIPT_DIR/test_snapshots.py'"
+run_suite "Data URI Tests" "python3 '$SCRIPT_DIR/test_data_uris.py'"
+run_suite "Compact Body Tests" "python3 '$SCRIPT_DIR/test_compact_body.py'"
+run_suite "Attachment Text Tests" "python3 '$SCRIPT_DIR/test_attachment_text.py'"
+run_suite "Email Prescan Tests" "python3 '$SCRIPT_DIR/test_prescan.py'"
+run_suite "Scheduling Tests" "python3 '$SCRIPT_DIR/test_scheduling.py'"
+run_suite "Run Journal Tests" "python3 '$SCRIPT_DIR/test_run_journal.py'"
+run_suite "Supervisor Tests" "python3 '$SCRIPT_DIR/test_supervisor.py'"
+run_suite "Discovery Tests" "python3 '$SCRIPT_DIR/test_discovery.py'"
 
 # Extended tests (if requested)
 if [[ "$1" == "--extended" ]]; then
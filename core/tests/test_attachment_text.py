@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for attachment-to-text conversion
+Tests format detection, hash caching and pooled document conversion
+"""
+
+import unittest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+import time
+
+# Add email converter to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts' / 'emailToMd'))
+
+from attachment_text import AttachmentText, attachment_format, format_attachment_text
+
+
+def allocate_and_wait(megabytes):
+    """Worker function: hold a large buffer long enough to be sampled"""
+    buffer = bytearray(megabytes * 1024 * 1024)
+    time.sleep(10)
+    return len(buffer)
+
+
+class TestAttachmentText(unittest.TestCase):
+    """Test AttachmentText"""
+
+    def setUp(self):
+        """Create attachment and output directories"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.attachments_dir = self.temp_dir / 'attachments'
+        self.ai_dir = self.temp_dir / 'ai'
+        self.attachments_dir.mkdir()
+        self.ai_dir.mkdir()
+
+    def tearDown(self):
+        """Clean up temporary directories"""
+        shutil.rmtree(self.temp_dir)
+
+    def save(self, name, payload):
+        path = self.attachments_dir / name
+        path.write_bytes(payload)
+        return path
+
+    def test_supported_formats(self):
+        """Test that formats come from the extension, then the MIME type"""
+        self.assertEqual(attachment_format('Report.DOCX', 'application/octet-stream'), 'docx')
+        self.assertEqual(attachment_format('page.htm', 'application/octet-stream'), 'html')
+        self.assertEqual(attachment_format('attachment_1.plain', 'text/plain'), 'txt')
+        self.assertIsNone(attachment_format('photo.jpg', 'image/jpeg'))
+
+    def test_identical_attachments_converted_once(self):
+        """Test that a repeated attachment is served from the hash cache, also in a later run"""
+        payload = 'Minutes\n\nCafé budget approved\n'.encode('utf-8')
+        with AttachmentText(self.attachments_dir, self.ai_dir) as converter:
+            first = converter.submit(self.save('minutes.txt', payload), payload, 'text/plain')
+            again = converter.submit(self.save('minutes_1.txt', payload), payload, 'text/plain')
+            self.assertIsNone(converter.submit(self.save('logo.png', b'\x89PNG'), b'\x89PNG', 'image/png'))
+            self.assertEqual(first.result(), 'Minutes\n\nCafé budget approved')
+            self.assertEqual(again.result(), first.result())
+        self.assertEqual(len(list((self.attachments_dir / '.text-cache').iterdir())), 1)
+
+        # A later run reuses the cached text without the saved file
+        (self.attachments_dir / 'minutes.txt').unlink()
+        converter = AttachmentText(self.attachments_dir, self.ai_dir)
+        cached = converter.submit(self.attachments_dir / 'minutes.txt', payload, 'text/plain')
+        section = format_attachment_text([
+            {'original_name': 'minutes.txt', 'text': cached},
+            {'original_name': 'logo.png', 'text': None},
+        ])
+        self.assertIn('## Attachment: minutes.txt\n\nMinutes', section)
+        self.assertNotIn('logo.png', section)
+
+    def test_html_attachment_converted_in_worker(self):
+        """Test that HTML documents are converted by the notes parser in the pool"""
+        converter = AttachmentText(self.attachments_dir, self.ai_dir, workers=1)
+        if 'html' not in converter.available:
+            self.skipTest("html2text not installed")
+        payload = b'<html><body><h1>Plan</h1><p>Ship <b>Friday</b></p></body></html>'
+        with converter:
+            future = converter.submit(self.save('plan.html', payload), payload, 'text/html')
+            text = future.result(timeout=60)
+        self.assertIn('# Plan', text)
+        self.assertIn('**Friday**', text)
+
+    def test_hanging_conversion_times_out_and_pool_recovers(self):
+        """Test that a document past the time limit is dropped and the pool restarted"""
+        converter = AttachmentText(self.attachments_dir, self.ai_dir, workers=1, timeout=1)
+        with converter:
+            hung = converter._get_pool().submit(time.sleep, 30)
+            started = time.monotonic()
+            section = format_attachment_text([{'original_name': 'huge.docx', 'text': hung}], converter)
+            self.assertEqual(section, '')
+            self.assertLess(time.monotonic() - started, 10)
+            self.assertIsNone(converter._pool)
+
+            payload = b'still converting'
+            future = converter.submit(self.save('next.txt', payload), payload, 'text/plain')
+            self.assertEqual(converter.wait(future, 'next.txt'), 'still converting')
+            self.assertEqual(converter._get_pool().submit(len, 'abc').result(timeout=60), 3)
+
+    def test_worker_over_memory_cap_is_terminated(self):
+        """Test that a document pushing a worker past the memory cap is dropped"""
+        converter = AttachmentText(self.attachments_dir, self.ai_dir, workers=1, timeout=30, max_rss_mb=128)
+        with converter:
+            future = converter._get_pool().submit(allocate_and_wait, 512)
+            started = time.monotonic()
+            self.assertIsNone(converter.wait(future, 'bomb.docx'))
+            self.assertLess(time.monotonic() - started, 10)
+            self.assertIsNone(converter._pool)
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestAttachmentText))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for compact email bodies
+Tests link unwrapping, whitespace normalization and boilerplate stripping
+"""
+
+import unittest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+from unittest import mock
+
+# Add aiScripts and the email converter to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts' / 'emailToMd'))
+
+from compact_body import BoilerplateLearner, normalize_whitespace, unwrap_links
+from checkDependencies import is_available
+
+SIGNATURE = "Bob Smith\nDirector, Acme Corp\n+1 555 0100"
+DISCLAIMER = (
+    "CONFIDENTIALITY NOTICE: This e-mail and any attachments are confidential and "
+    "intended solely for the addressee. If you received it in error, notify the sender."
+)
+
+
+class TestCompactBody(unittest.TestCase):
+    """Test compact mode helpers"""
+
+    def setUp(self):
+        """Create a temporary directory for the learned profile"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_link_wrappers_unwrapped(self):
+        """Test that SafeLinks and URL Defense v2/v3 links become the original URL"""
+        text = (
+            "[site](https://nam02.safelinks.protection.outlook.com/?url=https%3A%2F%2Fexample.com%2Fa%3Fb%3D1"
+            "&data=05%7C01%7Cx&sdata=abc&reserved=0)\n"
+            "<https://urldefense.proofpoint.com/v2/url?u=https-3A__example.com_path-3Fq-3D1&d=DwMF&c=x&e=>\n"
+            "https://urldefense.com/v3/__https://example.com/x__;!!abc$ and "
+            "https://urldefense.com/v3/__https://example.com/a*b__;Jg!!abc$"
+        )
+        self.assertEqual(unwrap_links(text), (
+            "[site](https://example.com/a?b=1)\n"
+            "<https://example.com/path?q=1>\n"
+            "https://example.com/x and "
+            "https://urldefense.com/v3/__https://example.com/a*b__;Jg!!abc$"
+        ))
+
+    def test_whitespace_normalized(self):
+        """Test that zero-width characters go and non-breaking spaces become spaces"""
+        text = "Hello\u200b\u00a0world\ufeff\n\u00a0 \nNext"
+        self.assertEqual(normalize_whitespace(text), "Hello world\n\nNext")
+
+    def test_repeated_signature_and_disclaimer_stripped(self):
+        """Test that sign-off blocks are stripped after two earlier messages, and learned across runs"""
+        profile = self.temp_dir / 'profile.json'
+        learner = BoilerplateLearner(profile)
+        for n in (1, 2):
+            body = learner.compact(f"Hi,\n\nMessage {n}\n\nBest regards,\nBob\n\n{SIGNATURE}\n\n{DISCLAIMER}\n",
+                                   'Bob <bob@acme.com>')
+            self.assertIn(SIGNATURE, body, "Kept until seen in two earlier messages")
+        self.assertEqual(
+            learner.compact(f"Third message\n\nThanks,\nBob\n\n{SIGNATURE}\n\n{DISCLAIMER}", 'bob@ACME.com'),
+            "Third message\n\nThanks,\nBob"
+        )
+
+        # A colleague shares the disclaimer but not the signature
+        other = learner.compact(f"Hello\n\nCheers,\nAlice\n\nAlice Jones\nAcme Corp Sales\n\n{DISCLAIMER}",
+                                'alice@acme.com')
+        self.assertEqual(other, "Hello\n\nCheers,\nAlice\n\nAlice Jones\nAcme Corp Sales")
+        self.assertLess(learner.bytes_after, learner.bytes_before)
+
+        learner.save()
+        relearned = BoilerplateLearner(profile)
+        self.assertEqual(relearned.compact(f"Next run\n\n-- \n{SIGNATURE}", 'bob@acme.com'),
+                         f"Next run\n\n-- \n{SIGNATURE}")
+        self.assertEqual(relearned.compact(f"Next run\n\nRegards\n\n{SIGNATURE}", 'bob@acme.com'),
+                         "Next run\n\nRegards")
+
+    def test_repeated_content_and_uncommitted_messages_kept(self):
+        """Test that body text, quotes and re-sent or failed messages are never stripped"""
+        learner = BoilerplateLearner()
+        status = "Status: all three services are green and the deploy window is unchanged."
+        quote = "> " + DISCLAIMER
+        for n in range(3):
+            body = f"Update {n}\n\n{status}\n\nBest,\nBob\n\nOn Monday Bob wrote:\n\n{quote}"
+            self.assertEqual(learner.compact(body, 'bob@acme.com'), body)
+
+        # The same message re-sent counts as one message
+        resent = f"Same\n\nThanks,\nCarol\n\n{SIGNATURE}"
+        for _ in range(3):
+            self.assertEqual(learner.compact(resent, 'carol@acme.com'), resent)
+
+        # Failed attempts are rolled back, so the retry is not compared against itself
+        failing = f"Retry me\n\nThanks,\nDan\n\n{SIGNATURE}"
+        self.assertEqual(learner.compact(failing, 'dan@acme.com', message='retry.eml'), failing)
+        learner.discard('retry.eml')  # conversion failed
+        self.assertEqual(learner.compact(failing, 'dan@acme.com', message='retry.eml'), failing)
+        learner.learn('retry.eml')
+        learner.discard('retry.eml')  # staged, then the commit failed
+        learner.compact(f"Sent 0\n\nThanks,\nDan\n\n{SIGNATURE}", 'dan@acme.com', message='0.eml')
+        learner.learn('0.eml')
+        learner.confirm('0.eml')
+        self.assertEqual(learner.compact(failing, 'dan@acme.com', message='retry.eml'), failing)
+        learner.discard('retry.eml')
+        learner.compact(f"Sent 1\n\nThanks,\nDan\n\n{SIGNATURE}", 'dan@acme.com', message='1.eml')
+        learner.learn('1.eml')
+        self.assertEqual(learner.compact(failing, 'dan@acme.com', message='retry.eml'), "Retry me\n\nThanks,\nDan")
+
+    @unittest.skipUnless(is_available('html2text'), "html2text not installed")
+    def test_single_batch_strips_repeated_signature(self):
+        """Test that messages staged in one commit batch already teach later ones"""
+        import eml_to_md_converter as converter
+        from staged_commit import StagedCommit
+
+        dirs = {name: self.temp_dir / name for name in ('raw', 'ai', 'processed', 'attachments')}
+        for directory in dirs.values():
+            directory.mkdir()
+        compactor = BoilerplateLearner(self.temp_dir / 'profile.json')
+        commit = StagedCommit(dirs['ai'])
+        with mock.patch.object(converter, 'record_processing'), commit:
+            for n in range(3):
+                eml = dirs['raw'] / f'm{n}.eml'
+                eml.write_text(
+                    f"From: Bob <bob@acme.com>\nTo: team@acme.com\nSubject: Update {n}\n"
+                    f"Content-Type: text/plain\n\nUpdate {n}\n\nBest regards,\nBob\n\n{SIGNATURE}\n"
+                )
+                success, _ = converter.process_email_file(eml, dirs['ai'], dirs['processed'], dirs['attachments'],
+                                                          commit=commit, compactor=compactor)
+                self.assertTrue(success)
+            self.assertEqual(list(dirs['ai'].glob('*.md')), [], "Still one uncommitted batch")
+
+        outputs = [(dirs['ai'] / f'm{n}.md').read_text() for n in range(3)]
+        self.assertIn('Director, Acme Corp', outputs[1])
+        self.assertNotIn('Director, Acme Corp', outputs[2])
+        self.assertIn('Best regards', outputs[2])
+        self.assertEqual(compactor.unconfirmed, {})
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestCompactBody))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
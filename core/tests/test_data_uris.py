@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for data: URI image externalization
+Tests that embedded base64 images are written to files and replaced by links
+"""
+
+import unittest
+import sys
+import base64
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+
+import data_uris
+from data_uris import externalize_data_uris
+
+
+class TestDataUris(unittest.TestCase):
+    """Test externalize_data_uris"""
+
+    def setUp(self):
+        """Create a temporary output directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.image_dir = self.temp_dir / 'inline-images'
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_images_replaced_with_relative_links(self):
+        """Test that identical images share one content-addressed file"""
+        png = b'\x89PNG\r\n\x1a\n' + bytes(range(256)) * 40
+        payload = base64.b64encode(png).decode('ascii')
+        folded = '\r\n'.join(payload[i:i + 76] for i in range(0, len(payload), 76))
+        html = (
+            f'<p>Logo <img src="data:image/png;base64,{payload}"></p>'
+            f'<img src=\'data:image/PNG;name=logo.png;base64,{folded}\' alt="again">'
+            '<a href="data:text/plain;base64,aGk=">text</a>'
+        )
+
+        # Small chunks exercise the carry-over between decode chunks
+        original_chunk = data_uris.DECODE_CHUNK
+        data_uris.DECODE_CHUNK = 1022
+        try:
+            result, images = externalize_data_uris(html, self.image_dir, self.temp_dir)
+        finally:
+            data_uris.DECODE_CHUNK = original_chunk
+
+        self.assertEqual(len(images), 2)
+        self.assertEqual(images[0], images[1])
+        self.assertEqual(images[0].read_bytes(), png)
+        self.assertEqual(images[0].suffix, '.png')
+        link = f'inline-images/{images[0].name}'
+        self.assertIn(f'<img src="{link}">', result)
+        self.assertIn(f"<img src='{link}' alt=\"again\">", result)
+        self.assertIn('data:text/plain;base64,aGk=', result, "Non-image URIs are left alone")
+        self.assertEqual([p.name for p in self.image_dir.iterdir()], [images[0].name])
+
+    def test_invalid_payload_left_inline(self):
+        """Test that a truncated payload is kept and no file is left behind"""
+        html = '<img src="data:image/gif;base64,R0lGOD">'
+        result, images = externalize_data_uris(html, self.image_dir, self.temp_dir)
+        self.assertEqual(result, html)
+        self.assertEqual(images, [])
+        self.assertEqual(list(self.image_dir.iterdir()), [])
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestDataUris))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for single-pass input discovery
+Tests format dispatch, bundles, recursion and include/exclude patterns
+"""
+
+import unittest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add aiScripts and the notes converter to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts' / 'notesToMd'))
+
+from discovery import NOTES_FORMATS, discover
+
+
+class TestDiscovery(unittest.TestCase):
+    """Test discover() on a nested notes export"""
+
+    def setUp(self):
+        """Create a raw/ tree shaped like OneNote and Apple Notes exports"""
+        self.raw = Path(tempfile.mkdtemp())
+        for relative in ('top.txt', 'image.png', '.hidden.md',
+                         'Work/Projects/Plan.docx', 'Work/Meeting.html',
+                         'Archive/Old.md', 'Bear.textbundle/text.md', '.staging/x.md'):
+            path = self.raw / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text('note', encoding='utf-8')
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.raw)
+
+    def found(self, **kwargs):
+        return {item.relative: item.format for item in discover(self.raw, NOTES_FORMATS, **kwargs)}
+
+    def test_top_level_dispatch_and_bundles(self):
+        """Test that only registered formats are found and bundles are yielded whole"""
+        self.assertEqual(self.found(), {'top.txt': 'txt', 'Bear.textbundle': 'textbundle'})
+        item = next(discover(self.raw, NOTES_FORMATS, include=['top.txt']))
+        self.assertEqual(item.path, self.raw / 'top.txt')
+        self.assertIsNotNone(item.mtime)
+        self.assertEqual(list(discover(self.raw / 'missing', NOTES_FORMATS)), [])
+
+    def test_recursion_with_patterns(self):
+        """Test recursive walks, include patterns and pruned excluded folders"""
+        self.assertEqual(self.found(recursive=True), {
+            'top.txt': 'txt', 'Bear.textbundle': 'textbundle', 'Work/Projects/Plan.docx': 'docx',
+            'Work/Meeting.html': 'html', 'Archive/Old.md': 'md',
+        })
+        self.assertEqual(set(self.found(recursive=True, exclude=['Archive', '*.html'])),
+                         {'top.txt', 'Bear.textbundle', 'Work/Projects/Plan.docx'})
+        self.assertEqual(set(self.found(recursive=True, include=['Work/*'])),
+                         {'Work/Projects/Plan.docx', 'Work/Meeting.html'})
+
+    def test_nested_notes_are_flattened_without_collisions(self):
+        """Test that nested notes get folder-prefixed output names"""
+        import notes_to_md_converter as notes
+        self.assertEqual(notes.output_filename_for(self.raw / 'top.txt', self.raw), 'top.md')
+        self.assertEqual(notes.output_filename_for(self.raw / 'Work/Projects/Plan.docx', self.raw),
+                         'Work - Projects - Plan.md')
+        self.assertEqual(notes.detect_format(self.raw / 'Bear.textbundle'), 'textbundle')
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestDiscovery))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
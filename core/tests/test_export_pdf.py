@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the PDF export driver
+Tests section collection, fragment caching and unchanged-input skipping
+(Pandoc and XeLaTeX are simulated), and the HTML preview renderer
+"""
+
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+import tempfile
+import shutil
+
+# Add aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts' / 'exportPdf'))
+
+import export_pdf
+from markdown_html import MarkdownRenderer
+
+
+class FakeTools:
+    """Stands in for pandoc and xelatex, recording what was run"""
+
+    def __init__(self):
+        self.fragments = []
+        self.wrappers = 0
+        self.latex_passes = 0
+
+    def __call__(self, command, input_text=None, cwd=None):
+        if command[0] == 'pandoc':
+            if '--version' in command:
+                return 'pandoc 3.1\n'
+            if '--standalone' in command:
+                self.wrappers += 1
+                return f"\\begin{{document}}\n{export_pdf.BODY_PLACEHOLDER}\n\\end{{document}}\n"
+            self.fragments.append(input_text.splitlines()[0])
+            return f"% {input_text.splitlines()[0]}\n"
+
+        # xelatex: outline (headings) goes to the aux file
+        self.latex_passes += 1
+        tex = (Path(cwd) / command[-1]).read_text()
+        Path(cwd, 'document.aux').write_text(''.join(l for l in tex.splitlines(True) if l.startswith('% ')))
+        Path(cwd, 'document.pdf').write_bytes(b'%PDF-1.5\n' + tex.encode())
+        return ''
+
+
+class TestExportPdf(unittest.TestCase):
+    """Test incremental PDF export"""
+
+    def setUp(self):
+        """Create a project with a template and a few documents"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / 'core' / 'templates').mkdir(parents=True)
+        (self.temp_dir / 'core' / 'templates' / 'lumina.latex').write_text('$body$\n')
+        (self.temp_dir / 'docs').mkdir()
+        (self.temp_dir / 'aiDocs').mkdir()
+        (self.temp_dir / 'PROJECT.md').write_text(
+            "# Acme Rollout\n\n*This document was originally created by AI*\n"
+            "Customer: **Acme Corp**\n"
+        )
+        (self.temp_dir / 'docs' / 'TASKS.md').write_text("# Tasks\n\n- [ ] Ship it\n")
+        (self.temp_dir / 'aiDocs' / 'AI.md').write_text("# AI\n\nContext\n")
+
+        self.tools = FakeTools()
+        patcher = mock.patch.object(export_pdf, '_run', self.tools)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.exporter = export_pdf.PdfExporter(self.temp_dir)
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_collect_sections(self):
+        """Test section order, skipped lines and missing files"""
+        sections = export_pdf.collect_sections(self.temp_dir)
+        self.assertEqual(
+            [heading for heading, _ in sections],
+            ['# Executive Summary', '# Quick Reference', '## Tasks',
+             '# Complete Project Context', '## AI Agent Context']
+        )
+        self.assertEqual(sections[0][1], "# Executive Summary\n\nCustomer: **Acme Corp**\n\n\\newpage\n\n")
+        self.assertNotIn('\\newpage', sections[-1][1])
+
+        metadata = export_pdf.get_project_metadata(self.temp_dir)
+        self.assertEqual(metadata['project_name'], 'Acme Rollout')
+        self.assertEqual(metadata['customer'], 'Acme Corp')
+
+    def test_unchanged_inputs_skip_rebuild(self):
+        """Test that a second export with the same inputs does no work"""
+        output, rebuilt = self.exporter.export()
+        self.assertTrue(rebuilt)
+        self.assertTrue(output.exists())
+        self.assertTrue(output.name.startswith('acme-rollout-'))
+        self.assertEqual(len(self.tools.fragments), 5)
+
+        output, rebuilt = self.exporter.export()
+        self.assertFalse(rebuilt)
+        self.assertEqual(len(self.tools.fragments), 5)
+        self.assertEqual(self.tools.wrappers, 1)
+        self.assertEqual(self.tools.latex_passes, 2)
+
+    def test_only_changed_sections_rerendered(self):
+        """Test that editing one document re-renders only its section"""
+        self.exporter.export()
+        self.tools.fragments.clear()
+        self.tools.latex_passes = 0
+
+        (self.temp_dir / 'aiDocs' / 'AI.md').write_text("# AI\n\nUpdated context\n")
+        output, rebuilt = self.exporter.export()
+
+        self.assertTrue(rebuilt)
+        self.assertEqual(self.tools.fragments, ['## AI Agent Context'])
+        self.assertEqual(self.tools.wrappers, 1, "Template wrapper is cached")
+        self.assertEqual(self.tools.latex_passes, 1, "Unchanged outline needs one pass")
+        self.assertIn(b'% ## AI Agent Context', output.read_bytes())
+        self.assertEqual(len(list(self.exporter.fragment_dir.glob('*.tex'))), 5)
+
+
+class TestHtmlPreview(unittest.TestCase):
+    """Test the Pandoc-free HTML preview"""
+
+    def test_renders_template_markdown(self):
+        """Test task lists, nested lists, tables and escaping"""
+        renderer = MarkdownRenderer()
+        html = renderer.render(
+            "## Tasks\n\n"
+            "- [ ] **[TASK-001] Ship <it>**  \n"
+            "  - **Owner:** Sam\n"
+            "- [x] Done\n\n"
+            "| Date | Decision |\n|------|:--------:|\n| TBD | Use `a|b` |\n\n"
+            "\\newpage\n"
+        )
+        self.assertIn('<h2 id="tasks">Tasks</h2>', html)
+        self.assertIn('<li class="task"><input type="checkbox" disabled> '
+                      '<strong>[TASK-001] Ship &lt;it&gt;</strong>', html)
+        self.assertIn('<ul>\n<li><strong>Owner:</strong> Sam</li>\n</ul>', html)
+        self.assertIn('<input type="checkbox" disabled checked> Done', html)
+        self.assertIn('<th style="text-align: center">Decision</th>', html)
+        self.assertIn('<div class="page-break"></div>', html)
+
+        renderer.render("## Tasks\n")
+        self.assertEqual([anchor for _, anchor, _ in renderer.headings], ['tasks', 'tasks-1'])
+
+    def test_export_html_is_self_contained(self):
+        """Test that the preview embeds images and needs no external tools"""
+        temp_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, temp_dir)
+        (temp_dir / 'docs').mkdir()
+        (temp_dir / 'PROJECT.md').write_text("# Acme\n\n\n![Diagram](arch.png)\n")
+        (temp_dir / 'arch.png').write_bytes(b'\x89PNG')
+        (temp_dir / 'docs' / 'TASKS.md').write_text("# Tasks\n\n- [ ] Ship it\n")
+
+        with mock.patch.object(export_pdf, '_run', side_effect=AssertionError('no tools')):
+            output = export_pdf.export_html(temp_dir)
+
+        html = output.read_text()
+        self.assertEqual(output.suffix, '.html')
+        self.assertIn('<img src="data:image/png;base64,iVBORw==" alt="Diagram">', html)
+        self.assertIn('<a href="#tasks">Tasks</a>', html)
+        self.assertIn('<h1>Acme</h1>', html)
+        self.assertNotIn('\\newpage', html)
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestExportPdf))
+    suite.addTests(loader.loadTestsFromTestCase(TestHtmlPreview))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
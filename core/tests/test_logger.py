@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the shared logger
+Tests queued (non-blocking) writes, the JSON-lines log and forked workers
+"""
+
+import unittest
+import sys
+import io
+import os
+import json
+import logging
+from pathlib import Path
+import tempfile
+import shutil
+from unittest import mock
+
+# Add aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+
+import logger as lumina_logger
+
+
+class TestLogger(unittest.TestCase):
+    """Test logger configuration and background writing"""
+
+    def setUp(self):
+        """Write logs to a temporary directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        patchers = [
+            mock.patch.object(lumina_logger, 'LOG_DIR', self.temp_dir),
+            mock.patch.dict(os.environ, {'LUMINA_LOG_JSON': '1', 'LUMINA_LOG_SYNC': ''}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.name = f'test_logger_{self.id().rsplit(".", 1)[-1]}'
+
+    def tearDown(self):
+        """Detach handlers and clean up temporary directory"""
+        lumina_logger.flush_logs()
+        log = logging.getLogger(self.name)
+        for handler in list(log.handlers):
+            log.removeHandler(handler)
+            handler.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_records_are_queued_and_flushed(self):
+        """Test that the caller only enqueues and the listener writes the files"""
+        log = lumina_logger.get_logger(self.name)
+        self.assertIsInstance(log.handlers[0], lumina_logger.LazyQueueHandler)
+        self.assertIs(lumina_logger.get_logger(self.name), log)
+
+        log.debug("processed %d files", 3)
+        lumina_logger.flush_logs()
+
+        text = (self.temp_dir / f'{self.name}.log').read_text()
+        self.assertIn('DEBUG - processed 3 files', text)
+
+        entry = json.loads((self.temp_dir / f'{self.name}.jsonl').read_text().splitlines()[0])
+        self.assertEqual(entry['message'], 'processed 3 files')
+        self.assertEqual(entry['level'], 'DEBUG')
+
+    def test_wait_for_logs_writes_queued_records_and_keeps_queueing(self):
+        """Test that wait_for_logs() empties the queue without stopping the listener"""
+        log = lumina_logger.get_logger(self.name)
+        log.info("before banner")
+        lumina_logger.wait_for_logs()
+        self.assertIn('before banner', (self.temp_dir / f'{self.name}.log').read_text())
+
+        self.assertIsInstance(log.handlers[0], lumina_logger.LazyQueueHandler)
+        log.info("after banner")
+        lumina_logger.wait_for_logs()
+        self.assertIn('after banner', (self.temp_dir / f'{self.name}.log').read_text())
+
+    def test_loggers_share_one_ordered_queue(self):
+        """Test that lines from different loggers reach the console in call order"""
+        console = io.StringIO()
+        with mock.patch('sys.stderr', console):
+            logs = [lumina_logger.get_logger(f'{self.name}_{n}') for n in (1, 2)]
+        for log in logs:
+            self.addCleanup(lambda log=log: [log.removeHandler(h) for h in list(log.handlers)])
+        self.assertIs(logs[0].handlers[0].queue, logs[1].handlers[0].queue)
+
+        for i in range(200):
+            logs[i % 2].info("line %d", i)
+        lumina_logger.wait_for_logs()
+        self.assertEqual(console.getvalue().splitlines(), [f'INFO: line {i}' for i in range(200)])
+
+    def test_forked_child_writes_directly(self):
+        """Test that a forked worker's records reach the log file"""
+        if not hasattr(os, 'fork'):
+            self.skipTest("fork not available")
+
+        log = lumina_logger.get_logger(self.name)
+        pid = os.fork()
+        if pid == 0:
+            log.info("from child")
+            os._exit(0 if not isinstance(log.handlers[0], logging.handlers.QueueHandler) else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+
+        lumina_logger.flush_logs()
+        self.assertIn('from child', (self.temp_dir / f'{self.name}.log').read_text())
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestLogger))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for run metrics and profiling
+Tests stage timers, percentiles, the JSON metrics file and LUMINA_PROFILE
+"""
+
+import unittest
+import sys
+import json
+import logging
+import time
+from pathlib import Path
+import tempfile
+import shutil
+import os
+from unittest import mock
+
+# Add aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+
+from metrics import RunMetrics, get_metrics, percentile
+import profiling
+
+
+class TestRunMetrics(unittest.TestCase):
+    """Test per-stage timing and throughput statistics"""
+
+    def setUp(self):
+        """Create temporary directory for metrics files"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual(percentile(values, 0.50), 50.0)
+        self.assertEqual(percentile(values, 0.95), 95.0)
+        self.assertEqual(percentile([], 0.95), 0.0)
+
+    def test_stages_counters_and_output(self):
+        """Test that stages, counters and throughput end up in the JSON file"""
+        metrics = RunMetrics('test_run')
+        for _ in range(3):
+            with metrics.stage('parse'):
+                pass
+            metrics.file_done(size=100)
+        metrics.record('file_move', 0.25)
+        metrics.count('attachments', 2)
+
+        with self.assertRaises(ValueError):
+            with metrics.stage('parse'):
+                raise ValueError("still timed")
+
+        output = metrics.write(self.temp_dir / 'metrics.json')
+        data = json.loads(output.read_text())
+
+        self.assertEqual(data['files'], 3)
+        self.assertEqual(data['bytes'], 300)
+        self.assertEqual(data['counters'], {'attachments': 2})
+        self.assertEqual(data['stages']['parse']['count'], 4)
+        self.assertEqual(data['stages']['file_move']['p95'], 0.25)
+        self.assertGreater(data['files_per_sec'], 0)
+
+        with self.assertLogs('test_metrics', level=logging.INFO) as logs:
+            metrics.log_summary(logging.getLogger('test_metrics'))
+        self.assertIn('3 file(s)', logs.output[0])
+
+        metrics.reset()
+        self.assertEqual(metrics.summary()['stages'], {})
+
+    def test_get_metrics_is_shared(self):
+        """Test that the registry returns one instance per name"""
+        self.assertIs(get_metrics('shared'), get_metrics('shared'))
+
+
+class TestProfiling(unittest.TestCase):
+    """Test the LUMINA_PROFILE entry point wrapper"""
+
+    def setUp(self):
+        """Send profile outputs to a temporary directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        patcher = mock.patch.object(profiling, '_output_stem', return_value=self.temp_dir / 'run')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def _work(self):
+        return sum(i * i for i in range(20000))
+
+    def test_disabled_by_default(self):
+        """Test that main() runs unprofiled without LUMINA_PROFILE"""
+        with mock.patch.dict(os.environ, {'LUMINA_PROFILE': ''}):
+            self.assertEqual(profiling.run_main(lambda: 3, 'test'), 3)
+        self.assertEqual(list(self.temp_dir.iterdir()), [])
+
+    def test_cprofile_writes_dump_and_summary(self):
+        """Test that cProfile mode writes a .prof file and hot-function summary"""
+        with mock.patch.dict(os.environ, {'LUMINA_PROFILE': '1'}):
+            self.assertEqual(profiling.run_main(self._work, 'test'), self._work())
+        self.assertTrue((self.temp_dir / 'run.prof').exists())
+        self.assertIn('_work', (self.temp_dir / 'run_profile.txt').read_text())
+
+    def test_sampling_writes_folded_stacks(self):
+        """Test that sampling mode writes collapsed stacks"""
+        def slow():
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+
+        env = {'LUMINA_PROFILE': 'sample', 'LUMINA_PROFILE_INTERVAL': '0.001'}
+        with mock.patch.dict(os.environ, env):
+            profiling.run_main(slow, 'test')
+        self.assertIn('slow', (self.temp_dir / 'run.folded').read_text())
+        self.assertIn('samples', (self.temp_dir / 'run_profile.txt').read_text())
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestRunMetrics))
+    suite.addTests(loader.loadTestsFromTestCase(TestProfiling))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
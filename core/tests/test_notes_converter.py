@@ -125,6 +125,20 @@ class TestNotesConverterDependencies(unittest.TestCase):
         # We don't fail if missing - just note availability
         self.assertIsInstance(has_html2text, bool, "html2text availability check should be boolean")
 
+    def test_optional_libraries_not_imported_at_startup(self):
+        """Test that importing the converter doesn't load optional packages"""
+        import subprocess
+        script_dir = Path(__file__).parent.parent / 'aiScripts' / 'notesToMd'
+        code = (
+            f"import sys; sys.path.insert(0, {str(script_dir)!r}); "
+            "import notes_to_md_converter as c; "
+            "loaded = [m for m in ('docx', 'html2text', 'zipfile', 'sqlite3') if m in sys.modules]; "
+            "print(','.join(loaded))"
+        )
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "", "Optional packages should load on first use")
+
 
 class TestNotesConverterParsers(unittest.TestCase):
     """Test individual parser functions"""
@@ -147,6 +161,33 @@ class TestNotesConverterParsers(unittest.TestCase):
         except Exception as e:
             self.fail(f"Failed to read text file: {e}")
 
+    def test_encoding_detected_from_prefix(self):
+        """Test that UTF-8, latin-1 and large mapped files are decoded correctly"""
+        sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+        import mapped_io
+
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            utf8_file = temp_dir / 'utf8.txt'
+            utf8_file.write_text('Grüße from the café', encoding='utf-8')
+            self.assertEqual(mapped_io.read_text(utf8_file), ('Grüße from the café', 'utf-8'))
+
+            latin1_file = temp_dir / 'latin1.txt'
+            latin1_file.write_bytes('Grüße from the café'.encode('latin-1'))
+            self.assertEqual(mapped_io.read_text(latin1_file), ('Grüße from the café', 'latin-1'))
+
+            # Large enough to be mapped; invalid UTF-8 only after the prefix
+            large_file = temp_dir / 'large.txt'
+            large_file.write_bytes(b'a' * mapped_io.MMAP_THRESHOLD + 'café'.encode('latin-1'))
+            content, encoding = mapped_io.read_text(large_file)
+            self.assertEqual(encoding, 'latin-1')
+            self.assertTrue(content.endswith('café'))
+
+            with mapped_io.map_file(large_file) as buffer:
+                self.assertNotIsInstance(buffer, bytes, "Large files should be memory-mapped")
+        finally:
+            shutil.rmtree(temp_dir)
+
     def test_markdown_can_be_read(self):
         """Test that markdown files can be read"""
         md_file = self.test_data / 'technical-architecture.md'
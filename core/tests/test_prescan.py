@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the header-only email pre-scan
+Tests header block reading, filters and date ordering
+"""
+
+import unittest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add email converter and aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts' / 'emailToMd'))
+
+import mapped_io
+from mapped_io import read_header_block
+from prescan import build_filter, prescan
+
+
+class TestPrescan(unittest.TestCase):
+    """Test prescan and HeaderFilter"""
+
+    def setUp(self):
+        """Create raw messages with different dates, senders and subjects"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.write('invoice.eml', b"From: Billing <billing@eu.acme.com>\r\n"
+                                  b"Subject: =?utf-8?q?Invoice_42?=\r\n"
+                                  b"Date: Tue, 05 Nov 2024 23:30:00 -0500\r\n\r\n" + b"x" * 200000)
+        self.write('old.eml', b"From: a@acme.com\nSubject: Kickoff\nDate: Mon, 01 Jan 2024 10:00:00 +0000\n\nbody\n")
+        self.write('other.eml', b"From: b@other.org\nSubject: Invoice 7\nDate: Fri, 01 Nov 2024 09:00:00 +0000\n\nbody\n")
+        self.write('undated.eml', b"From: c@acme.com\nSubject: Notes\n\nbody\n")
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def write(self, name, data):
+        (self.temp_dir / name).write_bytes(data)
+
+    def names(self, header_filter=None):
+        selected, skipped = prescan(sorted(self.temp_dir.glob('*.eml')), header_filter)
+        return [headers.path.name for headers in selected], skipped
+
+    def test_header_block_read_without_body(self):
+        """Test that only the header block is read, even when the blank line spans reads"""
+        original = mapped_io.HEADER_READ_SIZE
+        mapped_io.HEADER_READ_SIZE = 16
+        try:
+            block = read_header_block(self.temp_dir / 'invoice.eml')
+        finally:
+            mapped_io.HEADER_READ_SIZE = original
+        self.assertTrue(block.startswith(b'From: Billing'))
+        self.assertTrue(block.endswith(b'-0500'))
+
+    def test_messages_ordered_by_date(self):
+        """Test that messages are ordered by date either way, undated last"""
+        self.assertEqual(self.names(), (['old.eml', 'other.eml', 'invoice.eml', 'undated.eml'], 0))
+        selected, _ = prescan(self.temp_dir.glob('*.eml'), newest_first=True)
+        self.assertEqual([h.path.name for h in selected], ['invoice.eml', 'other.eml', 'old.eml', 'undated.eml'])
+
+    def test_filters_combine(self):
+        """Test date range, sender domain and subject filters"""
+        # 23:30 -0500 on Nov 5 is Nov 6 UTC, outside an --until of Nov 5
+        self.assertEqual(self.names(build_filter(since='2024-10-01', until='2024-11-05')), (['other.eml'], 3))
+        self.assertEqual(self.names(build_filter(since='2024-10-01')), (['other.eml', 'invoice.eml'], 2))
+        self.assertEqual(self.names(build_filter(from_domains=['@ACME.com'])),
+                         (['old.eml', 'invoice.eml', 'undated.eml'], 1))
+        self.assertEqual(self.names(build_filter(from_domains=['x.org,acme.com'], subject_regex=r'^invoice')),
+                         (['invoice.eml'], 3))
+        with self.assertRaises(ValueError):
+            build_filter(since='last week')
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestPrescan))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
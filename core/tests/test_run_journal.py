@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the resumable run journal
+Tests resuming, option changes and interrupted-file detection
+"""
+
+import unittest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+
+from run_journal import RunJournal, STARTED, CONVERTED, COMMITTED, FAILED
+
+OPTIONS = {'since': '2024-10-01', 'from_domains': ['acme.com']}
+
+
+class TestRunJournal(unittest.TestCase):
+    """Test RunJournal"""
+
+    def setUp(self):
+        """Create a temporary journal location"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / '.run-journal.jsonl'
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def interrupted_run(self):
+        """A run killed while converting c.eml, with a torn last line"""
+        journal = RunJournal(self.path)
+        self.assertFalse(journal.open(OPTIONS))
+        for name in ('a.eml', 'b.eml', 'c.eml'):
+            journal.record(name, STARTED)
+        journal.record('a.eml', CONVERTED)
+        journal.record('a.eml', COMMITTED)
+        journal.record('b.eml', FAILED, 'Validation: Email has no content')
+        journal.close(complete=False)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"file": "c.eml", "sta')
+
+    def test_resume_keeps_finished_files(self):
+        """Test that a rerun with the same options resumes with cumulative results"""
+        self.interrupted_run()
+        journal = RunJournal(self.path)
+        self.assertTrue(journal.open(dict(OPTIONS)))
+        self.assertEqual(journal.interrupted, ['c.eml'])
+        self.assertEqual(journal.finished(COMMITTED), [('a.eml', None)])
+        self.assertEqual(journal.finished(FAILED), [('b.eml', 'Validation: Email has no content')])
+
+        journal.record('c.eml', COMMITTED)
+        journal.close(complete=False)
+        resumed = RunJournal(self.path)
+        resumed.open(OPTIONS)
+        self.assertEqual(resumed.interrupted, [])
+        self.assertEqual(resumed.stage('c.eml'), COMMITTED)
+
+        resumed.close()
+        self.assertFalse(self.path.exists(), "A completed run removes its journal")
+
+    def test_changed_options_start_new_run(self):
+        """Test that different options start fresh but still report interrupted files"""
+        self.interrupted_run()
+        journal = RunJournal(self.path)
+        self.assertFalse(journal.open({'since': None}))
+        self.assertEqual(journal.interrupted, ['c.eml'])
+        self.assertIsNone(journal.stage('a.eml'))
+        self.assertEqual(journal.finished(FAILED), [])
+        journal.close(complete=False)
+
+        # The new run's journal replaced the old one
+        again = RunJournal(self.path)
+        self.assertTrue(again.open({'since': None}))
+        self.assertEqual(again.interrupted, [])
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestRunJournal))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
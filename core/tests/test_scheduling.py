@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for recency-first scheduling
+Tests queue ordering and progress checkpoints
+"""
+
+import unittest
+import sys
+import json
+import os
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+
+from scheduling import PROGRESS_FILENAME, ProgressCheckpoint, by_mtime, order_by_recency
+
+DAY = 86400
+JAN_1_2024 = 1704067200
+
+
+class TestScheduling(unittest.TestCase):
+    """Test recency ordering and ProgressCheckpoint"""
+
+    def setUp(self):
+        """Create a temporary output directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_newest_first_with_undated_last(self):
+        """Test that files are queued newest first by mtime, undated ones last"""
+        for day, name in enumerate(['old.txt', 'mid.txt', 'new.txt']):
+            path = self.temp_dir / name
+            path.write_text(name)
+            os.utime(path, (JAN_1_2024 + day * DAY, JAN_1_2024 + day * DAY))
+        queue = by_mtime(sorted(self.temp_dir.iterdir()) + [self.temp_dir / 'missing.txt'])
+        self.assertEqual([p.name for p, _ in queue], ['new.txt', 'mid.txt', 'old.txt', 'missing.txt'])
+
+        oldest = order_by_recency(queue, newest_first=False)
+        self.assertEqual([p.name for p, _ in oldest], ['old.txt', 'mid.txt', 'new.txt', 'missing.txt'])
+
+    def test_checkpoint_covers_unbroken_head(self):
+        """Test that the boundary only advances over files finished from the queue head"""
+        queue = [(Path(f'{i}.eml'), JAN_1_2024 - i * DAY) for i in range(5)]
+        progress = ProgressCheckpoint(self.temp_dir, queue, every=2)
+        checkpoint = self.temp_dir / PROGRESS_FILENAME
+
+        # Position 2 failed validation before 0 and 1 were committed
+        progress.record(2, False)
+        progress.record(0, True)
+        data = json.loads(checkpoint.read_text())
+        self.assertEqual((data['processed'], data['failed']), (2, 1))
+        self.assertEqual(data['covered_since'], '2024-01-01T00:00:00+00:00')
+        self.assertFalse(data['complete'])
+
+        progress.record(1, True)
+        progress.record(3, True)
+        self.assertEqual(json.loads(checkpoint.read_text())['covered_since'], '2023-12-29T00:00:00+00:00')
+
+        progress.finish()
+        self.assertFalse(json.loads(checkpoint.read_text())['complete'], "One file never finished")
+        progress.record(4, True)
+        progress.finish()
+        data = json.loads(checkpoint.read_text())
+        self.assertTrue(data['complete'])
+        self.assertEqual(data['covered_since'], '2023-12-28T00:00:00+00:00')
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestScheduling))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
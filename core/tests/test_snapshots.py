@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the snapshot store
+Tests deduplicated backups, incremental restore, pruning and legacy import
+"""
+
+import unittest
+import sys
+import os
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+
+from snapshots import SnapshotStore
+
+
+class TestSnapshotStore(unittest.TestCase):
+    """Test content-addressed project snapshots"""
+
+    def setUp(self):
+        """Create a small project in a temporary directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        (self.temp_dir / 'aiDocs' / 'notes').mkdir(parents=True)
+        (self.temp_dir / 'docs').mkdir()
+        (self.temp_dir / 'aiDocs' / 'SUMMARY.md').write_text('# Summary\n')
+        (self.temp_dir / 'aiDocs' / 'notes' / 'a.md').write_text('note a\n')
+        (self.temp_dir / 'docs' / 'TASKS.md').write_text('# Tasks\n')
+        (self.temp_dir / 'PROJECT.md').write_text('# Project\n')
+        self.store = SnapshotStore(self.temp_dir)
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def _blobs(self):
+        return list(self.store.objects_dir.glob('*/*'))
+
+    def test_unchanged_files_are_not_stored_again(self):
+        """Test that a second snapshot only hashes and stores modified files"""
+        manifest, stats = self.store.create()
+        self.assertEqual(manifest['roots'], ['aiDocs', 'PROJECT.md', 'docs'])
+        self.assertEqual(stats, {'files': 4, 'hashed': 4, 'stored': 4})
+
+        _, stats = self.store.create()
+        self.assertEqual(stats, {'files': 4, 'hashed': 0, 'stored': 0})
+
+        (self.temp_dir / 'docs' / 'TASKS.md').write_text('# Tasks\n- [ ] New task\n')
+        (self.temp_dir / 'docs' / 'COPY.md').write_text('# Summary\n')
+        _, stats = self.store.create()
+        self.assertEqual(stats, {'files': 5, 'hashed': 2, 'stored': 1}, "Identical content shares a blob")
+        self.assertEqual(len(self._blobs()), 5)
+        self.assertEqual(len(self.store.snapshot_ids()), 3)
+
+    def test_restore_rewrites_only_differences(self):
+        """Test that restore writes changed files and removes added ones"""
+        manifest, _ = self.store.create()
+        summary = self.temp_dir / 'aiDocs' / 'SUMMARY.md'
+        summary.write_text('# Regenerated summary\n')
+        (self.temp_dir / 'aiDocs' / 'notes' / 'a.md').unlink()
+        (self.temp_dir / 'aiDocs' / 'extra.md').write_text('extra\n')
+        project_inode = os.stat(self.temp_dir / 'PROJECT.md').st_ino
+
+        stats = self.store.restore(manifest['id'])
+
+        self.assertEqual(stats, {'written': 2, 'unchanged': 2, 'removed': 1})
+        self.assertEqual(summary.read_text(), '# Summary\n')
+        self.assertEqual((self.temp_dir / 'aiDocs' / 'notes' / 'a.md').read_text(), 'note a\n')
+        self.assertFalse((self.temp_dir / 'aiDocs' / 'extra.md').exists())
+        self.assertEqual(os.stat(self.temp_dir / 'PROJECT.md').st_ino, project_inode,
+                         "Unchanged files are left in place")
+
+    def test_prune_and_legacy_import(self):
+        """Test legacy backup import and pruning of unreferenced blobs"""
+        legacy = self.temp_dir / 'backups' / 'backup_20240101_090000'
+        (legacy / 'docs').mkdir(parents=True)
+        (legacy / 'docs' / 'TASKS.md').write_text('# Old tasks\n')
+
+        self.assertEqual(self.store.import_legacy(), 1)
+        self.assertEqual((legacy / 'docs' / 'TASKS.md').read_text(), '# Old tasks\n',
+                         "Legacy backups are kept after import")
+        self.assertEqual(self.store.import_legacy(), 0)
+        self.store.create()
+        self.assertEqual(self.store.snapshot_ids()[0], '20240101_090000')
+        self.assertEqual(self.store.resolve('1'), '20240101_090000')
+
+        removed, deleted = self.store.prune(keep=1)
+        self.assertEqual(removed, ['20240101_090000'])
+        self.assertEqual(deleted, 1)
+        self.assertEqual(len(self._blobs()), 4)
+        self.assertEqual(self.store.import_legacy(), 0, "Pruned imports are not imported again")
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestSnapshotStore))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
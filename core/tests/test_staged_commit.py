@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for staged commits
+Tests batched output renames, original moves and crash recovery
+"""
+
+import unittest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+import threading
+
+# Add aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+
+from staged_commit import StagedCommit
+
+
+class TestStagedCommit(unittest.TestCase):
+    """Test the batched commit phase"""
+
+    def setUp(self):
+        """Create raw/, ai/ and processed/ in a temporary directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.raw_dir = self.temp_dir / 'raw'
+        self.ai_dir = self.temp_dir / 'ai'
+        self.processed_dir = self.temp_dir / 'processed'
+        for directory in (self.raw_dir, self.ai_dir, self.processed_dir):
+            directory.mkdir()
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def _stage(self, commit, name, on_done=None):
+        """Create a raw file, stage its output and queue it"""
+        original = self.raw_dir / f'{name}.txt'
+        original.write_text(name)
+        staged = commit.stage_path(f'{name}.md')
+        staged.write_text(f'# {name}')
+        commit.add(staged, self.ai_dir / f'{name}.md', original, self.processed_dir / original.name, on_done)
+        return original
+
+    def test_batches_commit_outputs_and_originals(self):
+        """Test that nothing moves until a batch is committed"""
+        results = []
+        commit = StagedCommit(self.ai_dir, batch_size=2)
+        with commit:
+            for name in ('a', 'b'):
+                self._stage(commit, name, lambda ok, error, n=name: results.append((n, ok)))
+            self.assertEqual(list(self.ai_dir.glob('*.md')), [], "Outputs stay staged until commit")
+            self._stage(commit, 'c')
+            self.assertEqual(results, [('a', True), ('b', True)])
+
+        self.assertEqual(sorted(p.name for p in self.ai_dir.iterdir()), ['a.md', 'b.md', 'c.md'])
+        self.assertEqual(sorted(p.name for p in self.processed_dir.iterdir()), ['a.txt', 'b.txt', 'c.txt'])
+        self.assertEqual(list(self.raw_dir.iterdir()), [])
+
+    def test_recover_replays_journal_and_discards_orphans(self):
+        """Test that an interrupted batch is completed and unjournaled outputs dropped"""
+        commit = StagedCommit(self.ai_dir)
+        self._stage(commit, 'done')
+        self._stage(commit, 'orphan')
+
+        # Simulate a crash after the journal for 'done' was written
+        staged, output, original, processed, _ = commit._pending[0]
+        commit._write_journal([{
+            'staged': str(staged), 'output': str(output),
+            'original': str(original), 'processed': str(processed),
+        }])
+
+        self.assertEqual(StagedCommit(self.ai_dir).recover(), 1)
+        self.assertEqual([p.name for p in self.ai_dir.iterdir()], ['done.md'])
+        self.assertEqual([p.name for p in self.processed_dir.iterdir()], ['done.txt'])
+        self.assertEqual([p.name for p in self.raw_dir.iterdir()], ['orphan.txt'])
+
+    @unittest.skipIf(sys.platform == 'win32', "No staging lock on Windows")
+    def test_second_run_waits_instead_of_discarding_staged_outputs(self):
+        """Test that recover() in another run waits for the run holding the staging lock"""
+        recovered = threading.Event()
+        with StagedCommit(self.ai_dir) as running:
+            self._stage(running, 'live')
+            other = threading.Thread(target=lambda: (StagedCommit(self.ai_dir).recover(), recovered.set()))
+            other.start()
+            self.assertFalse(recovered.wait(0.3), "recover() must wait for the running batch")
+            self.assertEqual(len(list(running.staging_dir.iterdir())), 1)
+
+        other.join(5)
+        self.assertTrue(recovered.is_set())
+        self.assertEqual([p.name for p in self.ai_dir.glob('*.md')], ['live.md'])
+        self.assertEqual([p.name for p in self.processed_dir.iterdir()], ['live.txt'])
+
+    def test_failed_commit_keeps_original(self):
+        """Test that a failed move reports the error and leaves the original in raw/"""
+        results = []
+        commit = StagedCommit(self.ai_dir)
+        original = self._stage(commit, 'note', lambda ok, error: results.append(ok))
+        self.processed_dir.rmdir()
+
+        commit.flush()
+        self.assertEqual(results, [False])
+        self.assertTrue(original.exists())
+        self.assertFalse(commit.journal_path.exists())
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestStagedCommit))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for state manager
+Tests locking, atomic writes and batched transactions on .lumina.state,
+and the optional SQLite processing journal
+"""
+
+import unittest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+import multiprocessing
+import os
+from unittest import mock
+
+# Add aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+
+import state_manager
+
+
+def _increment_many(state_file, count):
+    """Worker: increment the email count without a transaction"""
+    with mock.patch.object(state_manager, 'get_state_file_path', return_value=Path(state_file)):
+        for _ in range(count):
+            state_manager.increment_email_count()
+
+
+class TestStateManager(unittest.TestCase):
+    """Test state file updates"""
+
+    def setUp(self):
+        """Point the state manager at a temporary state file"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.state_file = self.temp_dir / '.lumina.state'
+        patcher = mock.patch.object(state_manager, 'get_state_file_path', return_value=self.state_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        state_manager.create_state_file('Project', 'Customer', 'Tester')
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_update_without_state_file_fails(self):
+        """Test that updates report failure when no state file exists"""
+        self.state_file.unlink()
+        self.assertFalse(state_manager.update_state({'operations.emails_processed_count': 1}))
+
+    def test_transaction_writes_once(self):
+        """Test that a transaction batches many increments into one write"""
+        with mock.patch.object(state_manager, '_write_state', wraps=state_manager._write_state) as write:
+            with state_manager.transaction():
+                for _ in range(100):
+                    state_manager.increment_email_count()
+                state_manager.increment_notes_count(5)
+
+        self.assertEqual(write.call_count, 1)
+        ops = state_manager.read_state()['operations']
+        self.assertEqual(ops['emails_processed_count'], 100)
+        self.assertEqual(ops['notes_processed_count'], 5)
+
+    def test_transaction_discards_changes_on_error(self):
+        """Test that an exception inside a transaction leaves the file untouched"""
+        with self.assertRaises(RuntimeError):
+            with state_manager.transaction():
+                state_manager.increment_email_count()
+                raise RuntimeError("boom")
+
+        self.assertEqual(state_manager.read_state()['operations']['emails_processed_count'], 0)
+
+    def test_parallel_increments_are_not_lost(self):
+        """Test that concurrent processes don't lose counts"""
+        processes = [
+            multiprocessing.Process(target=_increment_many, args=(str(self.state_file), 25))
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        self.assertEqual(state_manager.read_state()['operations']['emails_processed_count'], 100)
+        leftovers = [p.name for p in self.temp_dir.iterdir() if p.suffix == '.tmp']
+        self.assertEqual(leftovers, [], "Temp files should be renamed or removed")
+
+
+class TestProcessingJournal(unittest.TestCase):
+    """Test the optional SQLite processing journal"""
+
+    def setUp(self):
+        """Point the state manager at a temporary project with SQLite enabled"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        patchers = [
+            mock.patch.object(state_manager, 'get_state_file_path',
+                              return_value=self.temp_dir / '.lumina.state'),
+            mock.patch.dict(os.environ, {'LUMINA_STATE_BACKEND': 'sqlite'}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Close journal connection and clean up"""
+        journal = getattr(state_manager._local, 'journal', None)
+        if journal is not None:
+            journal.close()
+            state_manager._local.journal = None
+        shutil.rmtree(self.temp_dir)
+
+    def test_record_and_query_journal(self):
+        """Test that processed files are journaled with hash and throughput"""
+        from state_db import file_sha256
+
+        source = self.temp_dir / 'message.eml'
+        source.write_text('Subject: hi\n\nbody')
+
+        self.assertTrue(state_manager.record_processing('email', source, 'success', 0.5))
+        self.assertTrue(state_manager.record_processing('email', source, 'failed', 0.1, 'bad header'))
+
+        journal = state_manager._open_journal()
+        entries = journal.find_by_hash(file_sha256(source))
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(journal.recent(status='failed')[0]['error'], 'bad header')
+
+        history = state_manager.get_throughput_history()
+        self.assertEqual(history[0]['files'], 2)
+        self.assertEqual(history[0]['failed'], 1)
+
+    def test_journal_disabled_by_default(self):
+        """Test that nothing is recorded without LUMINA_STATE_BACKEND=sqlite"""
+        with mock.patch.dict(os.environ, {'LUMINA_STATE_BACKEND': ''}):
+            self.assertFalse(state_manager.record_processing('email', self.temp_dir, 'success'))
+        self.assertFalse(state_manager.get_db_path().exists())
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestStateManager))
+    suite.addTests(loader.loadTestsFromTestCase(TestProcessingJournal))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for supervised conversion workers
+Tests time and memory limits, metrics hand-back and zip bomb quarantine
+"""
+
+import unittest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+import time
+import zipfile
+
+# Add aiScripts and the notes converter to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts' / 'notesToMd'))
+
+from metrics import get_metrics
+from supervisor import (Supervisor, ArchiveLimitExceeded, FileMemoryExceeded, FileTimeout, quarantine)
+
+
+def double_and_count(value):
+    """Worker function: records a metric so the parent can merge it"""
+    get_metrics('supervisor_test').count('calls')
+    return value * 2
+
+
+def allocate_and_wait(megabytes):
+    """Worker function: hold a large buffer long enough to be sampled"""
+    buffer = bytearray(megabytes * 1024 * 1024)
+    time.sleep(10)
+    return len(buffer)
+
+
+class TestSupervisor(unittest.TestCase):
+    """Test Supervisor limits"""
+
+    def setUp(self):
+        self.supervisor = Supervisor(timeout=5, max_rss_mb=128)
+
+    def tearDown(self):
+        self.supervisor.close()
+
+    def test_call_returns_result_and_metrics(self):
+        """Test that results, exceptions and worker metrics reach the parent"""
+        metrics = get_metrics('supervisor_test')
+        metrics.reset()
+        self.assertEqual(self.supervisor.call(double_and_count, 21), 42)
+        self.assertEqual(metrics.counters, {'calls': 1})
+        with self.assertRaises(ValueError):
+            self.supervisor.call(int, 'not a number')
+
+    def test_limits_kill_worker_and_next_call_recovers(self):
+        """Test that timeouts and memory caps stop the call, not the batch"""
+        self.supervisor.timeout = 0.5
+        with self.assertRaises(FileTimeout):
+            self.supervisor.call(time.sleep, 10)
+        self.supervisor.timeout = 5
+        with self.assertRaises(FileMemoryExceeded):
+            self.supervisor.call(allocate_and_wait, 512)
+        self.assertEqual(self.supervisor.call(double_and_count, 2), 4)
+
+
+class TestZipBombQuarantine(unittest.TestCase):
+    """Test archive limits in the notes converter"""
+
+    def setUp(self):
+        """Create a notes tree with a highly compressed .textbundle"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for name in ('raw', 'ai', 'processed'):
+            (self.temp_dir / name).mkdir()
+        self.bundle = self.temp_dir / 'raw' / 'bomb.textbundle'
+        with zipfile.ZipFile(self.bundle, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('text.md', b'\0' * (20 * 1024 * 1024))
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_zip_bomb_is_quarantined(self):
+        """Test that an over-compressed bundle is refused and moved to failed/"""
+        import notes_to_md_converter as notes
+        with self.assertRaises(ArchiveLimitExceeded):
+            notes.parse_textbundle(self.bundle)
+
+        ok = notes.process_notes_file(self.bundle, self.temp_dir / 'raw', self.temp_dir / 'ai',
+                                      self.temp_dir / 'processed')
+        self.assertFalse(ok)
+        failed_dir = self.temp_dir / 'failed'
+        self.assertTrue((failed_dir / 'bomb.textbundle').exists())
+        self.assertIn('expands', (failed_dir / 'bomb.textbundle.reason.txt').read_text())
+        self.assertFalse(self.bundle.exists())
+
+    def test_nested_inputs_keep_their_folders_in_quarantine(self):
+        """Test that same-named notes from different folders don't overwrite each other"""
+        raw_dir = self.temp_dir / 'raw'
+        failed_dir = self.temp_dir / 'failed'
+        for folder in ('Work', 'Home'):
+            note = raw_dir / folder / 'Plan.html'
+            note.parent.mkdir(parents=True)
+            note.write_text(folder)
+            self.assertEqual(quarantine(note, failed_dir, f'{folder} too slow', raw_dir),
+                             failed_dir / folder / 'Plan.html')
+
+        for folder in ('Work', 'Home'):
+            self.assertEqual((failed_dir / folder / 'Plan.html').read_text(), folder)
+            self.assertEqual((failed_dir / folder / 'Plan.html.reason.txt').read_text(), f'{folder} too slow\n')
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestSupervisor))
+    suite.addTests(loader.loadTestsFromTestCase(TestZipBombQuarantine))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
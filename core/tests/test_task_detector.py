@@ -8,6 +8,7 @@ import unittest
 import sys
 from pathlib import Path
 import tempfile
+from unittest import mock
 
 # Add task detector to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts' / 'detectTaskDependencies'))
@@ -86,6 +87,265 @@ class TestTaskDetectorErrorHandling(unittest.TestCase):
             temp_path.unlink()
 
 
+class TestTaskGraphScheduling(unittest.TestCase):
+    """Test critical path and wave scheduling"""
+
+    def test_critical_path_uses_effort(self):
+        """Test that the longest effort-weighted chain is reported"""
+        from task_graph import TaskGraph
+
+        graph = TaskGraph.from_edges(
+            ['TASK-001', 'TASK-002', 'TASK-003', 'TASK-004'],
+            [('TASK-001', 'TASK-002'), ('TASK-001', 'TASK-003'),
+             ('TASK-002', 'TASK-004'), ('TASK-003', 'TASK-004')],
+            durations=[1.0, 5.0, 2.0, 1.0]
+        )
+        schedule = graph.schedule()
+
+        self.assertEqual(schedule.critical_path, ['TASK-001', 'TASK-002', 'TASK-004'])
+        self.assertEqual(schedule.critical_length, 7.0)
+        self.assertEqual(schedule.earliest_start['TASK-004'], 6.0)
+        self.assertEqual(schedule.waves, [['TASK-001'], ['TASK-002', 'TASK-003'], ['TASK-004']])
+
+    def test_cycle_leaves_tasks_unscheduled(self):
+        """Test that tasks on a cycle are reported as unscheduled"""
+        from task_graph import TaskGraph
+
+        graph = TaskGraph.from_edges(
+            ['TASK-001', 'TASK-002', 'TASK-003'],
+            [('TASK-002', 'TASK-003'), ('TASK-003', 'TASK-002')]
+        )
+        schedule = graph.schedule()
+
+        self.assertEqual(schedule.order, ['TASK-001'])
+        self.assertEqual(sorted(schedule.unscheduled), ['TASK-002', 'TASK-003'])
+
+    def test_parse_effort_units(self):
+        """Test effort estimates are normalized to days"""
+        from task_graph import parse_effort
+
+        self.assertEqual(parse_effort('3d'), 3.0)
+        self.assertEqual(parse_effort('4h'), 0.5)
+        self.assertEqual(parse_effort('1w'), 5.0)
+        self.assertIsNone(parse_effort('TBD'))
+
+    def test_report_lists_tasks_with_completed_blockers_as_ready(self):
+        """Test that readiness follows blocker status, not graph position"""
+        from detectTaskDependencies import TaskDependencyDetector
+
+        content = (
+            "#### TASK-001: **Setup**\nStatus: Completed\nBlocks: TASK-003\n"
+            "#### TASK-002: **Design**\nStatus: In Progress\nBlocks: TASK-004\n"
+            "#### TASK-003: **Build**\nStatus: Not Started\n"
+            "#### TASK-004: **Ship**\nStatus: Not Started\n"
+        )
+        temp_dir = Path(tempfile.mkdtemp())
+        try:
+            tasks_path = temp_dir / 'TASKS.md'
+            tasks_path.write_text(content)
+            detector = TaskDependencyDetector(tasks_path)
+            detector.load_tasks()
+            self.assertEqual(detector.ready_tasks(), ['TASK-003'])
+
+            report_path = temp_dir / 'REPORT.md'
+            detector.generate_report(report_path)
+            ready_section = report_path.read_text().split('Tasks ready to start')[1].split('###')[0]
+            self.assertIn('TASK-003: Build', ready_section)
+            self.assertNotIn('TASK-004', ready_section)
+        finally:
+            import shutil
+            shutil.rmtree(temp_dir)
+
+
+class TestTaskSimilarity(unittest.TestCase):
+    """Test TF-IDF resolution of placeholder dependencies"""
+
+    def test_index_ranks_best_match_first(self):
+        """Test that the most similar task is returned first"""
+        from task_similarity import TaskSimilarityIndex
+
+        index = TaskSimilarityIndex(
+            ['TASK-001', 'TASK-002', 'TASK-003'],
+            ['Install postgres database', 'Build reporting API', 'Write user guide']
+        )
+        matches = index.query(['depends on the database'], top_k=2)
+
+        self.assertEqual(matches[0][0][0], 'TASK-001')
+        self.assertEqual(len(matches[0]), 1, "Unrelated tasks should fall below threshold")
+
+    def test_detector_resolves_unknown_target(self):
+        """Test that keyword dependencies resolve to a concrete task ID"""
+        from detectTaskDependencies import TaskDependencyDetector
+
+        content = (
+            "#### TASK-001: **Install database server**\n"
+            "Context: postgres database cluster\n"
+            "#### TASK-002: **Build reporting API**\n"
+            "Context: depends on database cluster being ready\n"
+        )
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
+            temp_path = Path(f.name)
+            f.write(content)
+
+        try:
+            detector = TaskDependencyDetector(temp_path)
+            detector.load_tasks()
+            pairs = {(d.from_task, d.to_task) for d in detector.detect_dependencies()}
+            self.assertIn(('TASK-002', 'TASK-001'), pairs)
+            self.assertNotIn(('TASK-002', 'UNKNOWN'), pairs)
+        finally:
+            temp_path.unlink()
+
+
+class TestTaskStore(unittest.TestCase):
+    """Test compact columnar task store"""
+
+    def test_forward_references_are_interned(self):
+        """Test that Blocks may reference tasks defined later or not at all"""
+        from task_store import TaskStore
+
+        store = TaskStore("first task body")
+        store.add('TASK-001', 'First', 'Ann', 'Not Started', ['TASK-002', 'TASK-099'], [], '', '',
+                  span=(0, 10))
+        store.add('TASK-002', 'Second', 'Ann', 'Completed', [], ['TASK-001'], '', '')
+        store.freeze()
+
+        self.assertEqual(len(store), 2)
+        self.assertEqual(store['TASK-001'].blocks, ['TASK-002', 'TASK-099'])
+        self.assertEqual(store['TASK-002'].related, ['TASK-001'])
+        self.assertEqual(store['TASK-001'].description, 'first task')
+        self.assertNotIn('TASK-099', store)
+        self.assertIsNone(store['TASK-001'].effort)
+
+    def test_detector_cycles_use_store(self):
+        """Test that circular Blocks chains are reported from the store"""
+        from detectTaskDependencies import TaskDependencyDetector
+
+        content = (
+            "#### TASK-001: **One**\nBlocks: TASK-002\n"
+            "#### TASK-002: **Two**\nBlocks: TASK-001\n"
+        )
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as f:
+            temp_path = Path(f.name)
+            f.write(content)
+
+        try:
+            detector = TaskDependencyDetector(temp_path)
+            detector.load_tasks()
+            self.assertEqual(detector.detect_circular_dependencies(),
+                             [['TASK-001', 'TASK-002', 'TASK-001']])
+        finally:
+            temp_path.unlink()
+
+
+class TestGraphRenderer(unittest.TestCase):
+    """Test dependency graph simplification and output formats"""
+
+    def _store(self):
+        from task_store import TaskStore
+
+        store = TaskStore()
+        store.add('TASK-001', 'Setup', 'Ann', 'Completed', ['TASK-002', 'TASK-003'], [], '', '')
+        store.add('TASK-002', 'Build', 'Bob', 'Completed', ['TASK-003'], [], '', '')
+        store.add('TASK-003', 'Ship', 'Ann', 'Not Started', [], [], '', '')
+        return store.freeze()
+
+    def test_transitive_reduction_drops_implied_edges(self):
+        """Test that A -> C is removed when A -> B -> C exists"""
+        from graph_renderer import GraphRenderer
+
+        _, edges, _ = GraphRenderer(self._store(), reduce=True).layout()
+        self.assertEqual(sorted(edges), [('TASK-001', 'TASK-002'), ('TASK-002', 'TASK-003')])
+
+    def test_completed_subtree_collapses(self):
+        """Test that finished upstream work becomes one summary node"""
+        import json
+        from graph_renderer import GraphRenderer, COLLAPSED_NODE
+
+        renderer = GraphRenderer(self._store(), collapse_completed=True, cluster_by='owner')
+        data = json.loads(renderer.to_json())
+
+        self.assertEqual([node['id'] for node in data['nodes']], ['TASK-003'])
+        self.assertEqual(data['edges'], [[COLLAPSED_NODE, 'TASK-003']])
+        self.assertEqual(data['collapsed_completed'], 2)
+        self.assertIn('subgraph cluster_0', renderer.to_dot())
+
+
+    def test_labels_and_clusters_are_escaped(self):
+        """Test that quotes and brackets in titles and owners can't break Mermaid or DOT"""
+        from task_store import TaskStore
+        from graph_renderer import GraphRenderer
+
+        store = TaskStore()
+        store.add('TASK-001', 'Fix "login" [SSO] #2', 'Ann "QA" [EU]', 'Not Started', [], [], '', '')
+        renderer = GraphRenderer(store.freeze(), cluster_by='owner')
+
+        mermaid = renderer.to_mermaid()
+        self.assertIn('subgraph cluster0["Ann #quot;QA#quot; #91;EU#93;"]', mermaid)
+        self.assertIn('TASK-001["○ TASK-001: Fix #quot;login#quot; #91;SSO#93; #35;2"]', mermaid)
+
+        dot = renderer.to_dot()
+        self.assertIn('label="Ann \\"QA\\" [EU]";', dot)
+        self.assertIn('[label="○ TASK-001: Fix \\"login\\" [SSO] #2"];', dot)
+
+
+class TestBatchAnalysis(unittest.TestCase):
+    """Test multi-project batch analysis"""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for name, blocks in (('alpha', 'TASK-002'), ('beta', 'None')):
+            project = self.temp_dir / name
+            project.mkdir()
+            (project / 'TASKS.md').write_text(
+                "#### TASK-001: **One**\nStatus: Not Started\n"
+                f"Blocks: {blocks}\n"
+                "#### TASK-002: **Two**\nStatus: Not Started\n"
+            )
+
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir)
+
+    def test_batch_aggregates_and_caches(self):
+        """Test that projects are summarized and unchanged ones are skipped"""
+        from batch_analysis import run_batch, generate_batch_report
+
+        pattern = str(self.temp_dir / '*' / 'TASKS.md')
+        results = run_batch([pattern], workers=1)
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['blocked'], ['TASK-002'])
+        self.assertFalse(any(r['cached'] for r in results))
+
+        rerun = run_batch([pattern], workers=1)
+        self.assertTrue(all(r['cached'] for r in rerun))
+
+        # A missing graph output is regenerated even though TASKS.md is unchanged
+        (self.temp_dir / 'alpha' / 'TASK_DEPENDENCY_GRAPH.md').unlink()
+        partial = run_batch([pattern], workers=1)
+        self.assertEqual([r['cached'] for r in partial], [False, True])
+        self.assertTrue((self.temp_dir / 'alpha' / 'TASK_DEPENDENCY_GRAPH.md').exists())
+
+        report = self.temp_dir / 'REPORT.md'
+        generate_batch_report(rerun, report)
+        self.assertIn('Total tasks: 4', report.read_text())
+
+    def test_project_analysis_detects_once(self):
+        """Test that the report reuses the project's detections and cycles"""
+        from batch_analysis import analyze_project
+        from detectTaskDependencies import TaskDependencyDetector
+
+        with mock.patch.object(TaskDependencyDetector, 'detect_dependencies',
+                               autospec=True, return_value=[]) as detect, \
+                mock.patch.object(TaskDependencyDetector, 'detect_circular_dependencies',
+                                  autospec=True, return_value=[]) as cycles:
+            summary = analyze_project(str(self.temp_dir / 'alpha' / 'TASKS.md'), {'formats': ['dot']})
+        self.assertEqual((detect.call_count, cycles.call_count), (1, 1))
+        self.assertEqual(summary['tasks'], 2)
+        self.assertTrue((self.temp_dir / 'alpha' / 'TASK_DEPENDENCY_GRAPH.dot').exists())
+
+
 def run_tests():
     """Run all tests and return exit code"""
     loader = unittest.TestLoader()
@@ -93,6 +353,11 @@ def run_tests():
 
     suite.addTests(loader.loadTestsFromTestCase(TestTaskDetector))
     suite.addTests(loader.loadTestsFromTestCase(TestTaskDetectorErrorHandling))
+    suite.addTests(loader.loadTestsFromTestCase(TestTaskGraphScheduling))
+    suite.addTests(loader.loadTestsFromTestCase(TestTaskSimilarity))
+    suite.addTests(loader.loadTestsFromTestCase(TestTaskStore))
+    suite.addTests(loader.loadTestsFromTestCase(TestGraphRenderer))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchAnalysis))
 
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Smoke tests for the watch daemon
+Tests debouncing and one-shot conversion of notes dropped into notes/raw/
+"""
+
+import unittest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+import threading
+import time
+from unittest import mock
+
+# Add aiScripts to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'aiScripts'))
+
+import watch
+import state_manager
+
+
+class TestDebouncer(unittest.TestCase):
+    """Test that files are only converted once they stop changing"""
+
+    def setUp(self):
+        """Create temporary directory"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_file_ready_after_quiet_period(self):
+        """Test that a file is ready once unchanged for the quiet period"""
+        note = self.temp_dir / 'note.txt'
+        note.write_text('partial')
+        debouncer = watch.Debouncer(quiet_period=1.0)
+
+        self.assertEqual(debouncer.update([note], now=0.0), [])
+        self.assertEqual(debouncer.next_deadline(now=0.5), 0.5)
+
+        # Still being written: the quiet period restarts
+        note.write_text('partial, now complete')
+        self.assertEqual(debouncer.update([note], now=0.8), [])
+        self.assertEqual(debouncer.update([note], now=1.5), [])
+        self.assertEqual(debouncer.update([note], now=1.8), [note])
+
+    def test_removed_files_are_dropped(self):
+        """Test that files that disappear stop being tracked"""
+        note = self.temp_dir / 'note.txt'
+        note.write_text('text')
+        debouncer = watch.Debouncer(quiet_period=1.0)
+        debouncer.update([note], now=0.0)
+        note.unlink()
+        self.assertEqual(debouncer.update([note], now=5.0), [])
+        self.assertIsNone(debouncer.next_deadline())
+
+
+class TestWatchDaemon(unittest.TestCase):
+    """Test converting notes through the daemon"""
+
+    def setUp(self):
+        """Create a temporary project with a state file"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        patcher = mock.patch.object(state_manager, 'get_state_file_path',
+                                    return_value=self.temp_dir / '.lumina.state')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        state_manager.create_state_file('Project', 'Customer', 'Tester')
+
+    def tearDown(self):
+        """Clean up temporary directory"""
+        shutil.rmtree(self.temp_dir)
+
+    def test_once_converts_notes_and_updates_state(self):
+        """Test that --once converts present notes and counts them in .lumina.state"""
+        daemon = watch.WatchDaemon(project_root=self.temp_dir, kinds=('notes',))
+        raw_dir = self.temp_dir / 'notes' / 'raw'
+        (raw_dir / 'meeting.txt').write_text('Meeting notes\nDecided to ship on Friday')
+        (raw_dir / 'ideas.md').write_text('# Ideas\n- faster imports')
+        (raw_dir / 'ignored.pdf').write_text('not a note')
+
+        self.assertEqual(daemon.run(once=True), 0)
+
+        processed = sorted(p.name for p in (self.temp_dir / 'notes' / 'processed').iterdir())
+        self.assertEqual(processed, ['ideas.md', 'meeting.txt'])
+        self.assertEqual(len(list((self.temp_dir / 'notes' / 'ai').glob('*.md'))), 2)
+        self.assertTrue((raw_dir / 'ignored.pdf').exists())
+        self.assertEqual(state_manager.read_state()['operations']['notes_processed_count'], 2)
+
+    def test_nested_notes_are_converted_and_watched(self):
+        """Test that notes in export subfolders are found, keep their folders and wake inotify"""
+        daemon = watch.WatchDaemon(project_root=self.temp_dir, kinds=('notes',))
+        raw_dir = self.temp_dir / 'notes' / 'raw'
+        (raw_dir / 'Work' / 'Projects').mkdir(parents=True)
+        (raw_dir / 'Work' / 'Projects' / 'plan.txt').write_text('Plan\nShip on Friday')
+
+        with mock.patch.object(state_manager, 'record_processing') as record:
+            self.assertEqual(daemon.run(once=True), 0)
+
+        processed = self.temp_dir / 'notes' / 'processed' / 'Work' / 'Projects' / 'plan.txt'
+        self.assertTrue(processed.exists())
+        self.assertEqual(record.call_args[0][:3], ('notes', processed, 'success'))
+        self.assertTrue((self.temp_dir / 'notes' / 'ai' / 'Work - Projects - plan.md').exists())
+
+        if not sys.platform.startswith('linux'):
+            return
+        watcher = watch.create_watcher([raw_dir], recursive=(raw_dir,))
+        self.addCleanup(watcher.close)
+        (raw_dir / 'Work' / 'Projects' / 'next.txt').write_text('Next steps')
+        started = time.monotonic()
+        watcher.wait(5.0)
+        self.assertLess(time.monotonic() - started, 4.0, "A drop into a subfolder wakes the watcher")
+
+    @unittest.skipIf(sys.platform == 'win32', "No staging lock on Windows")
+    def test_batch_waits_for_converter_run_holding_the_lock(self):
+        """Test that the daemon waits for a converter run and skips files it converted"""
+        from staged_commit import StagedCommit
+
+        daemon = watch.WatchDaemon(project_root=self.temp_dir, debounce=0.0, kinds=('notes',))
+        note = self.temp_dir / 'notes' / 'raw' / 'race.txt'
+        note.write_text('Converted by whoever gets the lock first')
+        daemon.debouncer.update([note])
+
+        counts = {}
+        with mock.patch.dict(daemon.handlers, {'notes': mock.Mock(return_value=True)}) as handlers:
+            with StagedCommit(self.temp_dir / 'notes' / 'ai'):
+                batch = threading.Thread(target=lambda: counts.update(daemon.process_ready()))
+                batch.start()
+                batch.join(0.3)
+                self.assertTrue(batch.is_alive(), "The daemon waits for the converter run")
+                note.rename(self.temp_dir / 'notes' / 'processed' / note.name)
+            batch.join(5)
+            handlers['notes'].assert_not_called()
+        self.assertEqual(counts, {'notes': 0})
+
+    def test_failed_files_wait_for_changes(self):
+        """Test that a file that failed isn't retried until it changes"""
+        daemon = watch.WatchDaemon(project_root=self.temp_dir, debounce=0.0, kinds=('notes',))
+        empty = self.temp_dir / 'notes' / 'raw' / 'empty.txt'
+        empty.write_text('   ')
+
+        daemon.debouncer.update([empty])
+        self.assertEqual(daemon.process_ready(), {'notes': 0})
+        self.assertIn(empty, daemon.failed)
+
+        with mock.patch.dict(daemon.handlers, {'notes': mock.Mock(return_value=True)}) as handlers:
+            daemon.process_ready()
+            handlers['notes'].assert_not_called()
+
+
+def run_tests():
+    """Run all tests and return exit code"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite()
+
+    suite.addTests(loader.loadTestsFromTestCase(TestDebouncer))
+    suite.addTests(loader.loadTestsFromTestCase(TestWatchDaemon))
+
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_tests())
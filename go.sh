@@ -39,11 +39,13 @@ declare -a MENU_OPTIONS=(
     "Lumina Prompts"
     "Process Emails"
     "Process Notes"
+    "Watch Raw Folders"
     "Manage Dependencies"
     "Backup Project State"
     "Restore from Backup"
     "List Backups"
     "Export to PDF"
+    "Export HTML Preview"
     "Reset Project"
     "Quit"
 )
@@ -204,6 +206,20 @@ process_notes() {
     fi
 }
 
+# Watch raw folders function
+watch_raw_folders() {
+    echo -e "${BLUE}Watching email/raw/ and notes/raw/...${NC}"
+    echo ""
+    echo "New files are converted as soon as they finish copying."
+    echo "Press Ctrl+C to stop and return to the menu."
+    echo ""
+
+    # Run in the foreground; Ctrl+C stops the watcher, not go.sh
+    trap ':' INT
+    python3 "$PROJECT_ROOT/core/aiScripts/watch.py" || true
+    trap - INT
+}
+
 # Manage dependencies function
 manage_dependencies() {
     echo -e "${BLUE}Checking project dependencies...${NC}"
@@ -238,8 +254,8 @@ export_pdf() {
         return 1
     fi
 
-    # Run the export script
-    "$PROJECT_ROOT/core/scripts/export-pdf.sh"
+    # Run the export script (--html: fast preview without Pandoc/LaTeX)
+    "$PROJECT_ROOT/core/scripts/export-pdf.sh" "$@"
 }
 
 # Function to display menu
@@ -277,84 +293,26 @@ display_state() {
     }
 }
 
+# Snapshot store (deduplicated backups in backups/)
+SNAPSHOTS_SCRIPT="$PROJECT_ROOT/core/aiScripts/snapshots.py"
+
 # Backup function
 backup_project() {
-    local timestamp=$(date +%Y%m%d_%H%M%S)
-    local backup_dir="$PROJECT_ROOT/backups/backup_${timestamp}"
-
     echo -e "${BLUE}Creating backup...${NC}"
     echo ""
 
-    # Create backup directory
-    mkdir -p "$backup_dir"
-
-    # Backup aiDocs/
-    if [ -d "$PROJECT_ROOT/aiDocs" ]; then
-        cp -r "$PROJECT_ROOT/aiDocs" "$backup_dir/"
-        echo -e "${GREEN}✓${NC} Backed up aiDocs/"
-    else
-        echo -e "${YELLOW}⚠${NC} aiDocs/ not found (skipped)"
-    fi
-
-    # Backup PROJECT.md
-    if [ -f "$PROJECT_ROOT/PROJECT.md" ]; then
-        cp "$PROJECT_ROOT/PROJECT.md" "$backup_dir/"
-        echo -e "${GREEN}✓${NC} Backed up PROJECT.md"
-    else
-        echo -e "${YELLOW}⚠${NC} PROJECT.md not found (skipped)"
-    fi
-
-    # Backup .lumina.state
-    if [ -f "$PROJECT_ROOT/.lumina.state" ]; then
-        cp "$PROJECT_ROOT/.lumina.state" "$backup_dir/"
-        echo -e "${GREEN}✓${NC} Backed up .lumina.state"
-    else
-        echo -e "${YELLOW}⚠${NC} .lumina.state not found (skipped)"
-    fi
-
-    # Backup docs/
-    if [ -d "$PROJECT_ROOT/docs" ]; then
-        cp -r "$PROJECT_ROOT/docs" "$backup_dir/"
-        echo -e "${GREEN}✓${NC} Backed up docs/"
-    else
-        echo -e "${YELLOW}⚠${NC} docs/ not found (skipped)"
-    fi
-
-    echo ""
-    echo -e "${GREEN}✓ Backup created: backups/backup_${timestamp}${NC}"
+    # Only new or modified files are copied; unchanged ones share stored content
+    python3 "$SNAPSHOTS_SCRIPT" create
 }
 
 # List backups function
 list_backups() {
-    local backups_dir="$PROJECT_ROOT/backups"
-
-    if [ ! -d "$backups_dir" ] || [ -z "$(ls -A "$backups_dir" 2>/dev/null)" ]; then
-        echo -e "${YELLOW}No backups found${NC}"
-        return 1
-    fi
-
-    echo -e "${BLUE}Available backups:${NC}"
-    echo ""
-
-    local index=1
-    for backup in "$backups_dir"/backup_*; do
-        if [ -d "$backup" ]; then
-            local backup_name=$(basename "$backup")
-            local backup_date=${backup_name#backup_}
-            # Format: YYYYMMDD_HHMMSS -> YYYY-MM-DD HH:MM:SS
-            local formatted_date=$(echo "$backup_date" | sed 's/\([0-9]\{4\}\)\([0-9]\{2\}\)\([0-9]\{2\}\)_\([0-9]\{2\}\)\([0-9]\{2\}\)\([0-9]\{2\}\)/\1-\2-\3 \4:\5:\6/')
-            echo -e "  ${GREEN}$index.${NC} $formatted_date  (${backup_name})"
-            ((index++))
-        fi
-    done
-
-    return 0
+    # Reads snapshot manifests only
+    python3 "$SNAPSHOTS_SCRIPT" list
 }
 
 # Restore function
 restore_project() {
-    local backups_dir="$PROJECT_ROOT/backups"
-
     if ! list_backups; then
         return 1
     fi
@@ -373,28 +331,9 @@ restore_project() {
         return 1
     fi
 
-    # Get selected backup
-    local index=1
-    local selected_backup=""
-    for backup in "$backups_dir"/backup_*; do
-        if [ -d "$backup" ]; then
-            if [ "$index" -eq "$choice" ]; then
-                selected_backup="$backup"
-                break
-            fi
-            ((index++))
-        fi
-    done
-
-    if [ -z "$selected_backup" ]; then
-        echo -e "${RED}Invalid backup number${NC}"
-        return 1
-    fi
-
-    local backup_name=$(basename "$selected_backup")
     echo ""
     echo -e "${YELLOW}WARNING: This will overwrite your current project state!${NC}"
-    echo -e "Restoring from: ${backup_name}"
+    echo -e "Restoring from backup ${choice}"
     echo ""
     read -p "Are you sure? (yes/no): " confirm
 
@@ -407,34 +346,14 @@ restore_project() {
     echo -e "${BLUE}Restoring from backup...${NC}"
     echo ""
 
-    # Restore aiDocs/
-    if [ -d "$selected_backup/aiDocs" ]; then
-        rm -rf "$PROJECT_ROOT/aiDocs"
-        cp -r "$selected_backup/aiDocs" "$PROJECT_ROOT/"
-        echo -e "${GREEN}✓${NC} Restored aiDocs/"
-    fi
-
-    # Restore PROJECT.md
-    if [ -f "$selected_backup/PROJECT.md" ]; then
-        cp "$selected_backup/PROJECT.md" "$PROJECT_ROOT/"
-        echo -e "${GREEN}✓${NC} Restored PROJECT.md"
-    fi
-
-    # Restore .lumina.state
-    if [ -f "$selected_backup/.lumina.state" ]; then
-        cp "$selected_backup/.lumina.state" "$PROJECT_ROOT/"
-        echo -e "${GREEN}✓${NC} Restored .lumina.state"
-    fi
-
-    # Restore docs/
-    if [ -d "$selected_backup/docs" ]; then
-        rm -rf "$PROJECT_ROOT/docs"
-        cp -r "$selected_backup/docs" "$PROJECT_ROOT/"
-        echo -e "${GREEN}✓${NC} Restored docs/"
+    # Only files that differ from the snapshot are rewritten
+    if python3 "$SNAPSHOTS_SCRIPT" restore "$choice"; then
+        echo ""
+        echo -e "${GREEN}✓ Restore completed successfully${NC}"
+    else
+        echo -e "${RED}Restore failed${NC}"
+        return 1
     fi
-
-    echo ""
-    echo -e "${GREEN}✓ Restore completed successfully${NC}"
 }
 
 # Function to execute selected option
@@ -474,6 +393,11 @@ execute_option() {
             echo ""
             read -p "Press any key to continue..." -n 1 -s
             ;;
+        "Watch Raw Folders")
+            watch_raw_folders
+            echo ""
+            read -p "Press any key to continue..." -n 1 -s
+            ;;
         "Manage Dependencies")
             manage_dependencies
             echo ""
@@ -518,6 +442,11 @@ execute_option() {
             echo ""
             read -p "Press any key to continue..." -n 1 -s
             ;;
+        "Export HTML Preview")
+            export_pdf --html
+            echo ""
+            read -p "Press any key to continue..." -n 1 -s
+            ;;
         "Quit")
             clear
             echo -e "${GREEN}Goodbye!${NC}"